@@ -6,3 +6,12 @@ class AppConfig(AppConfig):
     de Django "app"."""
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        """ready: Registra los hooks de la base de datos, la caché y la búsqueda
+        y los chequeos de la configuración"""
+        from app import caching, checks, database, search
+        database.connect_signals()
+        caching.connect_signals()
+        search.connect_signals()
+        checks.register_checks()
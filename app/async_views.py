@@ -0,0 +1,87 @@
+# Versiones async de las vistas de solo lectura (listados e historial). Con
+# VETSOFT_ASYNC_VIEWS, app/urls.py usa estas en lugar de las de app/views.py;
+# servidas por ASGI (vetsoft/asgi.py), mientras esperan a la base de datos el
+# worker sigue atendiendo otras conexiones en lugar de bloquear un thread.
+#
+# Los templates reciben la página ya cargada: no deben disparar consultas
+# (por ejemplo acceder a una relación que no esté en select_related).
+from django.shortcuts import aget_object_or_404, render
+
+from app.caching import acached_page
+from app.conditional import conditional_page, history_state, listing_state
+from app.filters import filter_listing
+from app.models import Client, Medicine, Pet, Product, Provider, Vet
+from app.pagination import apaginate
+from app.routers import read_replica
+
+
+async def _repository(request, entity, queryset, template):
+    rows = filter_listing(entity, request.GET, queryset)
+    page = await acached_page(entity, request, lambda: apaginate(request, rows))
+    return render(request, template, {entity: page, "page": page})
+
+
+@read_replica
+@conditional_page(listing_state("clients"))
+async def clients_repository(request):
+    return await _repository(
+        request, "clients", Client.objects.for_repository(), "clients/repository.html",
+    )
+
+
+@read_replica
+@conditional_page(listing_state("medicines"))
+async def medicines_repository(request):
+    return await _repository(
+        request, "medicines", Medicine.objects.for_repository(), "medicines/repository.html",
+    )
+
+
+@read_replica
+@conditional_page(listing_state("pets"))
+async def pets_repository(request):
+    return await _repository(
+        request, "pets", Pet.objects.for_repository(), "pets/repository.html",
+    )
+
+
+@read_replica
+@conditional_page(listing_state("products"))
+async def products_repository(request):
+    return await _repository(
+        request, "products", Product.objects.for_repository(), "products/repository.html",
+    )
+
+
+@read_replica
+@conditional_page(listing_state("providers"))
+async def providers_repository(request):
+    return await _repository(
+        request, "providers", Provider.objects.for_repository(), "providers/repository.html",
+    )
+
+
+@read_replica
+@conditional_page(listing_state("vets"))
+async def vets_repository(request):
+    return await _repository(
+        request, "vets", Vet.objects.for_repository(), "vets/repository.html",
+    )
+
+
+@read_replica
+@conditional_page(history_state)
+async def pets_history(request, id):
+    pet = await aget_object_or_404(Pet.objects.for_history(), id=id)
+    records = (
+        pet.medical_records.select_related("vet", "medicine")
+        .only("id", "pet", "timestamp", "dose", "notes", "vet__name", "medicine__name")
+    )
+    page = await apaginate(request, records, ordering=("-timestamp", "-id"))
+
+    context = {
+        "pet": pet,
+        "records": page,
+        "page": page,
+    }
+    return render(request, "pets/history.html", context)
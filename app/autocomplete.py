@@ -0,0 +1,105 @@
+#Importaciones de Django
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.functions import Lower
+
+from app.models import Client, Provider
+
+# Campos en los que busca cada selector. Cada uno tiene un índice sobre
+# LOWER(campo) (o sobre el campo, si no tiene letras) en app.models.
+AUTOCOMPLETE = {
+    "clients": (Client, ["name", "email", "phone"]),
+    "providers": (Provider, ["name", "email"]),
+}
+
+# Campos sin letras, que se comparan tal cual en lugar de con LOWER()
+CASELESS_FIELDS = {"phone"}
+
+# Largo mínimo del término para buscar también dentro del texto (LIKE '%x%'),
+# que no puede usar índices y recorre la tabla hasta completar el límite
+MIN_SUBSTRING_LENGTH = 3
+
+# Columnas que se leen de cada fila para armar la opción
+COLUMNS = ("id", "name", "email")
+
+
+def get_limit(params):
+    """get_limit: Lee `limit` de la URL, acotado por VETSOFT_AUTOCOMPLETE_LIMIT"""
+    try:
+        limit = int(params.get("limit", ""))
+    except ValueError:
+        return settings.VETSOFT_AUTOCOMPLETE_LIMIT
+    return max(1, min(limit, settings.VETSOFT_AUTOCOMPLETE_LIMIT))
+
+
+def prefix_range_end(term):
+    """prefix_range_end: Menor texto mayor que todos los que empiezan con `term`
+    ("ju" -> "jv"), para buscar el prefijo como un rango del índice
+    """
+    return term[:-1] + chr(ord(term[-1]) + 1)
+
+
+def prefix_matches(model, field, term, limit):
+    """prefix_matches: Filas cuyo campo empieza con `term`, sin distinguir mayúsculas.
+    Se busca por rango (>= "ju" y < "jv") sobre LOWER(campo) para que la consulta
+    use el índice de la expresión tanto en SQLite como en PostgreSQL; startswith
+    descarta lo que una collation lingüística pueda dejar dentro del rango.
+    """
+    value = F(field) if field in CASELESS_FIELDS else Lower(field)
+    return list(
+        model.objects.only(*COLUMNS)
+        .alias(search=value)
+        .filter(search__gte=term, search__lt=prefix_range_end(term), search__startswith=term)
+        .order_by("search", "id")[:limit],
+    )
+
+
+def substring_matches(model, fields, term, exclude, limit):
+    """substring_matches: Filas que contienen `term` en alguno de los campos"""
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f"{field}__icontains": term})
+    # Por id (el orden físico de la tabla): ordenar por nombre obligaría a
+    # recorrer el índice de nombre entero cuando hay pocas coincidencias
+    rows = model.objects.only(*COLUMNS).filter(condition).exclude(id__in=exclude)
+    return sorted(rows.order_by("id")[:limit], key=lambda row: (row.name.lower(), row.id))
+
+
+def search(entity, term, limit):
+    """search: Retorna hasta `limit` filas de la entidad que coinciden con `term`.
+    Primero las que empiezan con el término en alguno de los campos (con índice)
+    y, si faltan y el término es largo, las que lo contienen.
+    """
+    model, fields = AUTOCOMPLETE[entity]
+    term = term.strip().lower()
+    if not term:
+        return list(model.objects.only(*COLUMNS).order_by("name", "id")[:limit])
+
+    found = {}
+    for field in fields:
+        for row in prefix_matches(model, field, term, limit):
+            found.setdefault(row.id, row)
+    results = sorted(found.values(), key=lambda row: (row.name.lower(), row.id))[:limit]
+
+    if len(results) < limit and len(term) >= MIN_SUBSTRING_LENGTH:
+        exclude = [row.id for row in results]
+        results += substring_matches(model, fields, term, exclude, limit - len(results))
+    return results
+
+
+def search_results(entity, params):
+    """search_results: Resultado de la búsqueda de la URL (`q`, `limit`) para JSON"""
+    rows = search(entity, params.get("q", ""), get_limit(params))
+    return {
+        "results": [
+            {"id": row.id, "text": row.name, "detail": row.email} for row in rows
+        ],
+    }
+
+
+def get_selected(entity, value):
+    """get_selected: Retorna la fila elegida en el formulario (id) o None"""
+    model, fields = AUTOCOMPLETE[entity]
+    if not str(value or "").isdigit():
+        return None
+    return model.objects.only(*COLUMNS).filter(id=value).first()
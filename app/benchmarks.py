@@ -0,0 +1,367 @@
+#Importaciones de Python
+import math
+import multiprocessing
+import shutil
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from urllib.parse import urlencode
+
+#Importaciones de Django
+from django.conf import settings
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.test import Client as HttpClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from app import urls
+from app.filters import LISTING_FILTERS
+from app.models import Client, Medicine, Pet, Product, Provider, Vet
+
+# Modelo de cada prefijo de nombre de URL ("pets_edit" -> Pet)
+URL_MODELS = {
+    "clients": Client,
+    "medicines": Medicine,
+    "pets": Pet,
+    "products": Product,
+    "providers": Provider,
+    "vets": Vet,
+}
+
+# Métricas que se comparan contra la línea base
+COMPARED_METRICS = ("p95_ms", "queries", "peak_memory_kb")
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """rolled_back: Ejecuta el bloque en una transacción que siempre se revierte"""
+    try:
+        with transaction.atomic():
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def percentile(samples, fraction):
+    """percentile: Percentil por rango más cercano de una lista de muestras"""
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def measure(action, iterations, warmup=1):
+    """measure: Mide latencia, consultas y memoria pico de `action`.
+    Cada ejecución corre en una transacción revertida para no alterar los datos.
+    """
+    for _ in range(warmup):
+        with rolled_back():
+            action()
+
+    timings = []
+    for _ in range(iterations):
+        with rolled_back():
+            start = time.perf_counter()
+            action()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    # Consultas y memoria se miden aparte para no distorsionar los tiempos
+    with rolled_back(), CaptureQueriesContext(connection) as queries:
+        tracemalloc.start()
+        try:
+            action()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "max_ms": round(max(timings), 3),
+        "queries": len(queries),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def _url_cases(http):
+    """_url_cases: Arma una acción por cada URL de app/urls.py"""
+    cases = {}
+    for pattern in urls.urlpatterns:
+        if not isinstance(pattern, URLPattern) or not pattern.name:
+            continue
+        name = pattern.name
+        model = URL_MODELS.get(name.split("_")[0])
+        converters = pattern.pattern.converters
+
+        kwargs = {}
+        if converters:
+            if set(converters) != {"id"} or model is None:
+                continue
+            instance = model.objects.order_by("id").first()
+            if instance is None:
+                continue
+            kwargs = {"id": instance.id}
+        url = reverse(name, kwargs=kwargs)
+
+        if name.endswith("_delete") or name.endswith("_delete_history"):
+            instance = model.objects.order_by("-id").first() if model else None
+            if instance is None:
+                continue
+            field = f"{model._meta.model_name}_id"
+            data = {field: instance.id}
+            cases[f"POST {name}"] = lambda url=url, data=data: http.post(url, data)
+        else:
+            cases[f"GET {name}"] = lambda url=url: http.get(url)
+    return cases
+
+
+def _filter_cases(http):
+    """_filter_cases: Arma una acción por cada filtro de los listados, con el
+    valor de la primera fila (el nombre recortado para la búsqueda por texto)
+    """
+    cases = {}
+    for entity, filters in LISTING_FILTERS.items():
+        model = URL_MODELS[entity]
+        for param, lookup in filters.items():
+            value = model.objects.order_by("id").values_list(lookup.split("__")[0], flat=True).first()
+            if value is None:
+                continue
+            value = str(value)[:3] if param == "q" else str(value)
+            url = f"{reverse(f'{entity}_repo')}?{urlencode({param: value})}"
+            cases[f"GET {entity}_repo?{param}"] = lambda url=url: http.get(url)
+    return cases
+
+
+def _save_cases():
+    """_save_cases: Arma una acción por cada método save_*/update_* de los modelos"""
+    client_data = {
+        "name": "Juan Sebastian Veron",
+        "phone": "54221555232",
+        "email": "brujita75@vetsoft.com",
+        "address": "13 y 44",
+    }
+    # Las altas con relación guardan el dueño y el proveedor en el mismo INSERT
+    owner = Client.objects.order_by("id").values_list("id", flat=True).first()
+    supplier = Provider.objects.order_by("id").values_list("id", flat=True).first()
+    pet_data = {
+        "name": "Roma",
+        "breed": "labrador",
+        "birthday": date(2020, 1, 1).isoformat(),
+        "weight": "10.5",
+        "client": owner or "",
+    }
+    medicine_data = {"name": "Meloxicam", "description": "Antiinflamatorio", "dose": "3"}
+    product_data = {"name": "Alimento", "type": "Comida", "price": "1500", "provider": supplier or ""}
+    provider_data = {"name": "Distribuidora", "email": "d@d.com", "address": "Calle 1"}
+    vet_data = {"name": "Ana", "email": "ana@vetsoft.com", "phone": "54221555232"}
+
+    cases = {
+        "Client.save_client": lambda: Client.save_client(client_data),
+        "Medicine.save_medicine": lambda: Medicine.save_medicine(medicine_data),
+        "Pet.save_pet": lambda: Pet.save_pet(pet_data),
+        "Product.save_product": lambda: Product.save_product(product_data),
+        "Provider.save_provider": lambda: Provider.save_provider(provider_data),
+        "Vet.save_vet": lambda: Vet.save_vet(vet_data),
+    }
+    updates = [
+        (Client, "update_client", client_data),
+        (Medicine, "update_medicine", medicine_data),
+        (Pet, "update_pet", pet_data),
+        (Product, "update_product", product_data),
+        (Provider, "update_provider", provider_data),
+        (Vet, "update_vet", vet_data),
+    ]
+    for model, method, data in updates:
+        instance = model.objects.order_by("id").first()
+        if instance is not None:
+            cases[f"{model.__name__}.{method}"] = (
+                lambda instance=instance, method=method, data=data:
+                getattr(instance, method)(data)
+            )
+    return cases
+
+
+def run_benchmarks(iterations, warmup=1, only=None):
+    """run_benchmarks: Mide todas las URLs y métodos de guardado, de a uno.
+    `only` filtra los casos cuyo nombre contenga alguno de los textos dados.
+    Un caso que falla se reporta con su error en lugar de cortar la corrida.
+    """
+    http = HttpClient(raise_request_exception=True)
+    cases = {**_url_cases(http), **_filter_cases(http), **_save_cases()}
+    for name, action in cases.items():
+        if only and not any(text in name for text in only):
+            continue
+        try:
+            result = measure(action, iterations, warmup)
+        except Exception as error:
+            result = {"error": f"{type(error).__name__}: {error}"}
+        yield name, result
+
+
+def compare(results, baseline, tolerance):
+    """compare: Retorna las regresiones respecto de la línea base.
+    Una métrica regresiona si supera el valor base en más de `tolerance` (0.2 = 20%).
+    La cantidad de consultas no admite tolerancia: cualquier aumento es regresión.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or "error" in current:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in previous:
+                continue
+            limit = previous[metric]
+            if metric != "queries":
+                limit = previous[metric] * (1 + tolerance)
+            if current[metric] > limit:
+                regressions.append(
+                    {
+                        "benchmark": name,
+                        "metric": metric,
+                        "baseline": previous[metric],
+                        "current": current[metric],
+                    },
+                )
+    return regressions
+
+
+# Benchmark de concurrencia: procesos lectores y escritores en paralelo, como
+# los workers de gunicorn, contra una copia de trabajo de una base SQLite.
+CONCURRENCY_ALIAS = "concurrency"
+
+
+
+def concurrency_modes():
+    """concurrency_modes: Retorna {modo: (CONN_MAX_AGE, PRAGMAS)} a comparar.
+    "default" es SQLite como lo deja Django (journal DELETE, synchronous FULL,
+    una conexión por request) y "tuned" la configuración de DATABASES["default"].
+    """
+    tuned = settings.DATABASES["default"]
+    return {
+        "default": (0, {"journal_mode": "delete", "synchronous": "full"}),
+        "tuned": (tuned.get("CONN_MAX_AGE", 0), settings.VETSOFT_SQLITE_PRAGMAS),
+    }
+
+
+def _use_database(path, conn_max_age=0, pragmas=None):
+    if CONCURRENCY_ALIAS in connections.settings:
+        connections[CONCURRENCY_ALIAS].close()
+        del connections[CONCURRENCY_ALIAS]
+    connections.settings[CONCURRENCY_ALIAS] = {
+        **connections.settings["default"],
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": str(path),
+        "OPTIONS": {},
+        "CONN_MAX_AGE": conn_max_age,
+        "PRAGMAS": pragmas or {},
+    }
+
+
+def _create_concurrency_database(path, rows):
+    _use_database(path)
+    call_command("migrate", database=CONCURRENCY_ALIAS, verbosity=0)
+    clients = Client.objects.using(CONCURRENCY_ALIAS).bulk_create(
+        Client(name=f"Cliente {i}", phone="54221555232", email=f"c{i}@vetsoft.com")
+        for i in range(rows)
+    )
+    Pet.objects.using(CONCURRENCY_ALIAS).bulk_create(
+        Pet(name=f"Mascota {i}", breed="labrador", birthday=date(2020, 1, 1),
+            weight=10, client=clients[i % len(clients)])
+        for i in range(rows)
+    )
+    connections[CONCURRENCY_ALIAS].close()
+
+
+def _read():
+    # La página de un listado: la consulta de pets_repository
+    list(Pet.objects.using(CONCURRENCY_ALIAS).for_repository().order_by("name", "id")[:50])
+
+
+def _write():
+    Client.objects.using(CONCURRENCY_ALIAS).create(
+        name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com",
+    )
+
+
+def _concurrency_worker(role, seconds, conn_max_age, queue):
+    action = _read if role == "read" else _write
+    timings = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            action()
+        except OperationalError:
+            errors += 1
+        else:
+            timings.append((time.perf_counter() - start) * 1000)
+        if conn_max_age == 0:
+            # Lo que hace Django al terminar cada request sin conexiones persistentes
+            connections[CONCURRENCY_ALIAS].close()
+    queue.put((role, timings, errors))
+
+
+def run_concurrency(readers, writers, seconds, rows):
+    """run_concurrency: Mide lecturas y escrituras por segundo con `readers` y
+    `writers` procesos en paralelo, para cada modo de concurrency_modes().
+    Cada modo usa su propia copia de una base SQLite temporal con `rows` clientes
+    y mascotas, de modo que la base configurada no se modifica.
+    """
+    context = multiprocessing.get_context("fork")
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        template = Path(directory) / "template.sqlite3"
+        _create_concurrency_database(template, rows)
+        try:
+            for mode, (conn_max_age, pragmas) in concurrency_modes().items():
+                path = Path(directory) / f"{mode}.sqlite3"
+                shutil.copy(template, path)
+                _use_database(path, conn_max_age, pragmas)
+                # Aplica journal_mode a la copia antes de lanzar los procesos
+                connections[CONCURRENCY_ALIAS].ensure_connection()
+                connections[CONCURRENCY_ALIAS].close()
+
+                queue = context.Queue()
+                roles = ["read"] * readers + ["write"] * writers
+                processes = [
+                    context.Process(
+                        target=_concurrency_worker, args=(role, seconds, conn_max_age, queue),
+                    )
+                    for role in roles
+                ]
+                for process in processes:
+                    process.start()
+                collected = [queue.get() for _ in processes]
+                for process in processes:
+                    process.join()
+                results[mode] = _summarize(collected, seconds)
+        finally:
+            connections[CONCURRENCY_ALIAS].close()
+            del connections[CONCURRENCY_ALIAS]
+            del connections.settings[CONCURRENCY_ALIAS]
+    return results
+
+
+def _summarize(collected, seconds):
+    summary = {}
+    for role in ("read", "write"):
+        timings = [ms for kind, samples, _ in collected if kind == role for ms in samples]
+        errors = sum(count for kind, _, count in collected if kind == role)
+        summary[role] = {
+            "ops_per_s": round(len(timings) / seconds, 1),
+            "p95_ms": round(percentile(timings, 0.95), 3) if timings else None,
+            "errors": errors,
+        }
+    return summary
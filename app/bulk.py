@@ -0,0 +1,138 @@
+#Importaciones de Python
+from decimal import Decimal, InvalidOperation
+
+#Importaciones de Django
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from app.caching import bump_version
+from app.models import Client, Medicine, Pet, Product, Provider, Vet
+
+# Acciones masivas de los listados. Cada una es un UPDATE por tabla sobre las
+# filas elegidas dentro de una transacción, en lugar de cargar y guardar objeto
+# por objeto; los borrados son lógicos (completan deleted_at). update() no envía post_save ni completa los campos
+# auto_now, así que updated_at (el ETag de app.conditional) y la versión de la
+# caché de los listados se actualizan a mano.
+
+BULK_MODELS = {
+    "clients": Client,
+    "medicines": Medicine,
+    "pets": Pet,
+    "products": Product,
+    "providers": Provider,
+    "vets": Vet,
+}
+
+# Filas que se borran junto con las elegidas (on_delete=CASCADE): entidad y
+# campo que apunta a la elegida
+DEPENDENTS = {
+    "clients": ("pets", "client"),
+    "providers": ("products", "provider"),
+}
+
+
+def selected_ids(data):
+    """selected_ids: Ids de las filas marcadas en el listado (campo ids)"""
+    return [int(value) for value in data.getlist("ids") if value.isdigit()]
+
+
+def _bump_on_commit(entity):
+    # Antes del commit otra request podría cachear los datos viejos con la
+    # versión nueva
+    transaction.on_commit(lambda: bump_version(entity))
+
+
+def delete_rows(entity, ids):
+    """delete_rows: Borrado lógico de las filas elegidas y de las que dependen de
+    ellas, un UPDATE por tabla en una transacción; purge_vetsoft las borra de
+    verdad más tarde. Retorna la cantidad de filas de `entity` borradas.
+    """
+    model = BULK_MODELS[entity]
+    now = timezone.now()
+    with transaction.atomic():
+        deleted = model.objects.filter(id__in=ids).update(deleted_at=now, updated_at=now)
+        _bump_on_commit(entity)
+        if entity in DEPENDENTS:
+            dependent, field = DEPENDENTS[entity]
+            BULK_MODELS[dependent].objects.filter(**{f"{field}_id__in": ids}).update(
+                deleted_at=now, updated_at=now,
+            )
+            _bump_on_commit(dependent)
+    return deleted
+
+
+def validate_reassign(data):
+    """validate_reassign: Valida el dueño nuevo de las mascotas elegidas"""
+    errors = {}
+    client = data.get("client", "")
+
+    if not selected_ids(data):
+        errors["ids"] = "Por favor seleccione al menos una mascota"
+
+    if client == "":
+        errors["client"] = "Por favor seleccione un cliente"
+    elif not client.isdigit() or not Client.objects.filter(id=client).exists():
+        errors["client"] = "El cliente seleccionado no existe"
+
+    return errors
+
+
+def reassign_pets(ids, client_id):
+    """reassign_pets: Asigna el mismo dueño a todas las mascotas con un UPDATE.
+    Retorna la cantidad de mascotas actualizadas.
+    """
+    with transaction.atomic():
+        updated = Pet.objects.filter(id__in=ids).update(
+            client_id=client_id, updated_at=timezone.now(),
+        )
+        _bump_on_commit("pets")
+    return updated
+
+
+# Aumento máximo de una actualización de precios, en por ciento
+MAX_PRICE_CHANGE_PERCENT = 1000
+
+
+def validate_price_change(data):
+    """validate_price_change: Valida el proveedor y el porcentaje de la actualización de precios"""
+    errors = {}
+    provider = data.get("provider", "")
+    percent = data.get("percent", "")
+
+    if provider == "":
+        errors["provider"] = "Por favor seleccione un proveedor"
+    elif not provider.isdigit() or not Provider.objects.filter(id=provider).exists():
+        errors["provider"] = "El proveedor seleccionado no existe"
+
+    if percent == "":
+        errors["percent"] = "Por favor ingrese un porcentaje"
+    else:
+        try:
+            value = Decimal(percent)
+            # Infinity o 1e400 pasan las comparaciones y dejarían precios infinitos
+            if not value.is_finite():
+                errors["percent"] = "El porcentaje debe ser un número válido"
+            elif value <= -100:
+                errors["percent"] = "El porcentaje debe ser mayor que -100"
+            elif value > MAX_PRICE_CHANGE_PERCENT:
+                errors["percent"] = f"El porcentaje no puede superar {MAX_PRICE_CHANGE_PERCENT}"
+        except InvalidOperation:
+            errors["percent"] = "El porcentaje debe ser un número válido"
+
+    return errors
+
+
+def change_prices(provider_id, percent):
+    """change_prices: Aplica un cambio de `percent` por ciento al precio de todos
+    los productos del proveedor, redondeado a centavos, con un solo UPDATE.
+    Retorna la cantidad de productos actualizados.
+    """
+    factor = 1 + float(Decimal(percent)) / 100
+    with transaction.atomic():
+        updated = Product.objects.filter(provider_id=provider_id).update(
+            price=Round(F("price") * factor, 2), updated_at=timezone.now(),
+        )
+        _bump_on_commit("products")
+    return updated
@@ -0,0 +1,267 @@
+#Importaciones de Python
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+
+#Importaciones de Django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+
+from app.metrics import CACHE_REQUESTS
+from app.models import Client, Medicine, Pet, Product, Provider, Vet
+
+# Caché de las páginas de los listados. Cada entidad tiene un contador de
+# versión guardado en la caché; la clave de una página incluye las versiones
+# de las entidades que muestra, así que al guardar o borrar una fila basta con
+# incrementar su contador para que las páginas viejas dejen de usarse (y
+# expiren solas). Se cachean las filas de la página, no el HTML: el template
+# lleva el token CSRF de cada usuario.
+
+VERSIONED_MODELS = {
+    Client: "clients",
+    Medicine: "medicines",
+    Pet: "pets",
+    Product: "products",
+    Provider: "providers",
+    Vet: "vets",
+}
+
+# Cada cuánto mira la caché una request que espera a que otra arme la página
+WAIT_INTERVAL_SECONDS = 0.05
+
+logger = logging.getLogger("vetsoft.cache")
+
+_refresh_tasks = set()
+
+# Entidades cuyos datos aparecen en el listado de cada entidad
+PAGE_DEPENDENCIES = {
+    "clients": ["clients"],
+    "medicines": ["medicines"],
+    "pets": ["pets", "clients"],
+    "products": ["products", "providers"],
+    "providers": ["providers"],
+    "vets": ["vets"],
+}
+
+
+def get_cache():
+    """get_cache: Caché donde se guardan versiones y páginas"""
+    return caches[settings.VETSOFT_CACHE_ALIAS]
+
+
+def version_key(entity):
+    """version_key: Clave del contador de versión de la entidad"""
+    return f"version:{entity}"
+
+
+def bump_version(entity):
+    """bump_version: Invalida las páginas que muestran la entidad"""
+    cache = get_cache()
+    try:
+        cache.incr(version_key(entity))
+    except ValueError:
+        # Sin contador (nunca leído o desalojado) la próxima lectura crea uno nuevo
+        pass
+
+
+def _initial_version():
+    # Un contador desalojado no debe volver a un número ya usado por páginas
+    # que siguen en la caché
+    return time.time_ns()
+
+
+def page_key(entity, request, versions):
+    """page_key: Clave de la página del listado para la URL y las versiones dadas"""
+    query = request.GET.urlencode()
+    digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+    tag = ".".join(str(version) for version in versions)
+    return f"page:{entity}:{tag}:{digest}"
+
+
+def get_versions(entities):
+    """get_versions: Versión actual de cada entidad, en el mismo orden"""
+    cache = get_cache()
+    keys = [version_key(entity) for entity in entities]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial_version(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _lock_key(key):
+    return f"lock:{key}"
+
+
+def _store(cache, entity, key, page):
+    # Se guarda junto con el instante hasta el que está fresca; las entidades
+    # de VETSOFT_CACHE_REVALIDATE la conservan VETSOFT_CACHE_STALE_SECONDS más
+    # para servirla vencida mientras se rearma
+    timeout = settings.VETSOFT_CACHE_TIMEOUT
+    stale = settings.VETSOFT_CACHE_STALE_SECONDS if entity in settings.VETSOFT_CACHE_REVALIDATE else 0
+    cache.set(key, (time.time() + timeout, page), timeout + stale)
+
+
+def start_refresh(task):
+    """start_refresh: Corre `task` en un thread aparte, después de responder"""
+    threading.Thread(target=_run_refresh, args=(task,), daemon=True).start()
+
+
+def _run_refresh(task):
+    try:
+        task()
+    except Exception:
+        logger.exception("No se pudo rearmar una página de la caché")
+    finally:
+        # El thread tiene sus propias conexiones y nadie más las va a cerrar
+        connections.close_all()
+
+
+def _refresh(cache, entity, key, build):
+    try:
+        _store(cache, entity, key, build())
+    finally:
+        cache.delete(_lock_key(key))
+
+
+def _wait_for(cache, key):
+    deadline = time.monotonic() + settings.VETSOFT_CACHE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def cached_page(entity, request, build):
+    """cached_page: Retorna la página del listado desde la caché o la arma con
+    `build()` y la guarda. Con VETSOFT_CACHE_PAGES desactivado llama a build.
+    Para las entidades de VETSOFT_CACHE_REVALIDATE una sola request arma cada
+    página: si está vencida las demás reciben la copia vieja mientras se
+    rearma en segundo plano, y si no existe esperan a que esté lista.
+    """
+    if not settings.VETSOFT_CACHE_PAGES:
+        return build()
+    cache = get_cache()
+    key = page_key(entity, request, get_versions(PAGE_DEPENDENCIES[entity]))
+    entry = cache.get(key)
+    if entry is not None:
+        fresh_until, page = entry
+        if time.time() < fresh_until:
+            CACHE_REQUESTS.labels(entity, "hit").inc()
+            return page
+        CACHE_REQUESTS.labels(entity, "stale").inc()
+        if cache.add(_lock_key(key), 1, settings.VETSOFT_CACHE_LOCK_SECONDS):
+            start_refresh(lambda: _refresh(cache, entity, key, build))
+        return page
+
+    CACHE_REQUESTS.labels(entity, "miss").inc()
+    if entity not in settings.VETSOFT_CACHE_REVALIDATE:
+        page = build()
+        _store(cache, entity, key, page)
+        return page
+    if cache.add(_lock_key(key), 1, settings.VETSOFT_CACHE_LOCK_SECONDS):
+        # Si build falla el lock se libera igual y la próxima request reintenta
+        try:
+            page = build()
+            _store(cache, entity, key, page)
+        finally:
+            cache.delete(_lock_key(key))
+        return page
+    entry = _wait_for(cache, key)
+    # Si quien la armaba tardó demasiado (o falló) se arma acá
+    return entry[1] if entry is not None else build()
+
+
+async def aget_versions(entities):
+    """aget_versions: Versión asíncrona de get_versions"""
+    cache = get_cache()
+    keys = [version_key(entity) for entity in entities]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, _initial_version(), timeout=None)
+            found[key] = await cache.aget(key)
+    return [found[key] for key in keys]
+
+
+async def _arefresh(cache, entity, key, build):
+    try:
+        page = await build()
+        await sync_to_async(_store)(cache, entity, key, page)
+    except Exception:
+        logger.exception("No se pudo rearmar una página de la caché")
+    finally:
+        await cache.adelete(_lock_key(key))
+
+
+def _start_arefresh(task):
+    # El event loop solo guarda una referencia débil a las tareas
+    refresh = asyncio.create_task(task)
+    _refresh_tasks.add(refresh)
+    refresh.add_done_callback(_refresh_tasks.discard)
+
+
+async def _await_for(cache, key):
+    deadline = time.monotonic() + settings.VETSOFT_CACHE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_INTERVAL_SECONDS)
+        entry = await cache.aget(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+async def acached_page(entity, request, build):
+    """acached_page: Versión asíncrona de cached_page; `build` es una corrutina"""
+    if not settings.VETSOFT_CACHE_PAGES:
+        return await build()
+    cache = get_cache()
+    key = page_key(entity, request, await aget_versions(PAGE_DEPENDENCIES[entity]))
+    entry = await cache.aget(key)
+    if entry is not None:
+        fresh_until, page = entry
+        if time.time() < fresh_until:
+            CACHE_REQUESTS.labels(entity, "hit").inc()
+            return page
+        CACHE_REQUESTS.labels(entity, "stale").inc()
+        if await cache.aadd(_lock_key(key), 1, settings.VETSOFT_CACHE_LOCK_SECONDS):
+            _start_arefresh(_arefresh(cache, entity, key, build))
+        return page
+
+    CACHE_REQUESTS.labels(entity, "miss").inc()
+    if entity not in settings.VETSOFT_CACHE_REVALIDATE:
+        page = await build()
+        await sync_to_async(_store)(cache, entity, key, page)
+        return page
+    if await cache.aadd(_lock_key(key), 1, settings.VETSOFT_CACHE_LOCK_SECONDS):
+        try:
+            page = await build()
+            await sync_to_async(_store)(cache, entity, key, page)
+        finally:
+            await cache.adelete(_lock_key(key))
+        return page
+    entry = await _await_for(cache, key)
+    return entry[1] if entry is not None else await build()
+
+
+def invalidate(sender, **kwargs):
+    """invalidate: Incrementa la versión del modelo cuando se confirma la transacción"""
+    entity = VERSIONED_MODELS[sender]
+    # Antes del commit otra request podría cachear los datos viejos con la
+    # versión nueva
+    transaction.on_commit(lambda: bump_version(entity), using=kwargs.get("using"))
+
+
+def connect_signals():
+    """connect_signals: Invalida las páginas al guardar o borrar cada modelo"""
+    for model, entity in VERSIONED_MODELS.items():
+        post_save.connect(invalidate, sender=model, dispatch_uid=f"vetsoft_cache_{entity}_save")
+        post_delete.connect(invalidate, sender=model, dispatch_uid=f"vetsoft_cache_{entity}_delete")
@@ -0,0 +1,41 @@
+#Importaciones de Django
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+LOCMEM_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+
+
+def _uses_locmem():
+    return settings.CACHES[settings.VETSOFT_CACHE_ALIAS]["BACKEND"] == LOCMEM_BACKEND
+
+
+def check_page_cache(app_configs, **kwargs):
+    """check_page_cache: Rechaza la caché de páginas sobre locmem, donde cada
+    proceso tiene su copia: las invalidaciones y el lock de las entidades de
+    VETSOFT_CACHE_REVALIDATE no llegan a los demás workers
+    """
+    if not settings.VETSOFT_CACHE_PAGES or not _uses_locmem():
+        return []
+    errors = [
+        Error(
+            "VETSOFT_CACHE_PAGES necesita una caché compartida entre procesos",
+            hint="Usar CACHE_BACKEND=file o redis, o VETSOFT_CACHE_PAGES=false",
+            id="vetsoft.E001",
+        ),
+    ]
+    if settings.VETSOFT_CACHE_REVALIDATE:
+        # El lock que elige quién rearma la página está en la misma caché
+        errors.append(
+            Error(
+                "VETSOFT_CACHE_REVALIDATE necesita una caché compartida: con locmem "
+                "cada worker rearma la página por su cuenta",
+                hint="Usar CACHE_BACKEND=file o redis, o VETSOFT_CACHE_REVALIDATE=",
+                id="vetsoft.E002",
+            ),
+        )
+    return errors
+
+
+def register_checks():
+    """register_checks: Agrega los chequeos de vetsoft a manage.py check"""
+    register(check_page_cache, Tags.caches)
@@ -0,0 +1,157 @@
+#Importaciones de Python
+import hashlib
+from functools import wraps
+
+#Importaciones de Django
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db import connections, router
+from django.db.models import Count, Max, Subquery
+from django.db.models.expressions import Col
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from app.models import Client, Medicine, Pet, Product, Provider, Vet
+
+# GET condicional de los listados y del historial: el ETag sale de la fecha de
+# la última modificación y la cantidad de filas de cada tabla que muestra la
+# página (la cantidad detecta los borrados), así que revalidar cuesta una
+# consulta indexada por tabla en lugar de armar y renderizar la página.
+
+LISTING_MODELS = {
+    "clients": [Client],
+    "medicines": [Medicine],
+    "pets": [Pet, Client],
+    "products": [Product, Provider],
+    "providers": [Provider],
+    "vets": [Vet],
+}
+
+
+def _tables_state(models):
+    # Una sola consulta con subconsultas separadas: juntas (max y count en el
+    # mismo SELECT) SQLite recorre la tabla en lugar de usar el índice de
+    # updated_at para el máximo
+    columns = ", ".join(
+        f"(SELECT max(updated_at) FROM {model._meta.db_table}), "
+        f"(SELECT count(*) FROM {model._meta.db_table})"
+        for model in models
+    )
+    connection = connections[router.db_for_read(models[0])]
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {columns}")
+        row = cursor.fetchone()
+    field = models[0]._meta.get_field("updated_at")
+    converters = connection.ops.get_db_converters(Col(models[0]._meta.db_table, field))
+    states = []
+    for last, total in zip(row[::2], row[1::2]):
+        for converter in converters:
+            last = converter(last, None, connection)
+        states.append({"last": last, "total": total})
+    return states
+
+
+def _etag(*parts):
+    digest = hashlib.md5("|".join(map(str, parts)).encode(), usedforsecurity=False).hexdigest()
+    # Débil: el HTML cambia en cada request (token CSRF) aunque los datos no
+    return f'W/"{digest}"'
+
+
+def listing_state(entity):
+    """listing_state: Retorna la función (ETag, Last-Modified) del listado de `entity`.
+    Los listados no mandan Last-Modified: un borrado de verdad (purge_vetsoft,
+    delete_vetsoft) no mueve el máximo de updated_at, y quien revalidara solo con
+    If-Modified-Since recibiría un 304 con filas que ya no existen. La cantidad
+    de filas del ETag sí lo detecta.
+    """
+    def state(request, *args, **kwargs):
+        tables = _tables_state(LISTING_MODELS[entity])
+        etag = _etag(
+            entity, request.GET.urlencode(),
+            *((table["last"], table["total"]) for table in tables),
+        )
+        return etag, None
+
+    return state
+
+
+def history_state(request, id):
+    """history_state: (ETag, Last-Modified) del historial de una mascota o None si no existe"""
+    def last_change(model):
+        return Subquery(model.objects.order_by("-updated_at").values("updated_at")[:1])
+
+    # El historial solo crece, así que el último id y la cantidad alcanzan para
+    # el ETag; la fecha del último registro entra en el Last-Modified
+    state = (
+        Pet.objects.filter(id=id)
+        .annotate(
+            records_last=Max("medical_records__id"),
+            records_total=Count("medical_records"),
+            records_timestamp=Max("medical_records__timestamp"),
+            vets_last=last_change(Vet),
+            medicines_last=last_change(Medicine),
+        )
+        .values_list(
+            "updated_at", "records_last", "records_total", "records_timestamp", "vets_last", "medicines_last",
+        )
+        .first()
+    )
+    if state is None:
+        return None
+    etag = _etag(id, request.GET.urlencode(), *state)
+    updated_at, _, _, records_timestamp, vets_last, medicines_last = state
+    return etag, max(filter(None, [updated_at, records_timestamp, vets_last, medicines_last]))
+
+
+def _not_modified(request, state):
+    if state is None:
+        return None
+    etag, last_modified = state
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def _add_headers(request, response, state):
+    if state is None or request.method not in ("GET", "HEAD"):
+        return response
+    etag, last_modified = state
+    if response.status_code in (200, 304):
+        response.headers.setdefault("ETag", etag)
+        if last_modified:
+            response.headers.setdefault("Last-Modified", http_date(last_modified.timestamp()))
+        # Que navegadores y proxies revaliden siempre en lugar de reusar la copia
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def conditional_page(get_state):
+    """conditional_page: Como django.views.decorators.http.condition, pero
+    calcula ETag y Last-Modified con una sola función y acepta vistas async.
+    `get_state` recibe los argumentos de la vista y retorna (ETag, Last-Modified)
+    o None si la página no existe.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                state = await sync_to_async(get_state)(request, *args, **kwargs)
+                response = _not_modified(request, state)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _add_headers(request, response, state)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            state = get_state(request, *args, **kwargs)
+            response = _not_modified(request, state)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _add_headers(request, response, state)
+
+        return wrapper
+
+    return decorator
@@ -8,6 +8,7 @@ links = [
     {"label": "Productos", "href": reverse("products_repo"), "icon": "bi bi-box"},
     {"label": "Proveedores", "href": reverse("providers_repo"), "icon": "bi bi-briefcase"},
     {"label": "Veterinarios", "href": reverse("vets_repo"), "icon": "bi bi-hospital"},
+    {"label": "Importar", "href": reverse("imports_form"), "icon": "bi bi-upload"},
 
 ]
 
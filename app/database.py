@@ -0,0 +1,35 @@
+#Importaciones de Django
+from django.db.backends.signals import connection_created
+
+# PRAGMAs que acepta la clave "PRAGMAS" de una base SQLite en DATABASES, en
+# el orden en que se aplican (journal_mode primero: los demás dependen de él)
+SQLITE_PRAGMAS = (
+    "journal_mode",
+    "synchronous",
+    "busy_timeout",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+)
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """apply_sqlite_pragmas: Configura cada conexión SQLite nueva con los PRAGMAs
+    de su entrada en DATABASES (clave "PRAGMAS"). Se conecta a connection_created
+    en AppConfig.ready, así vale también para las conexiones de los tests.
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = connection.settings_dict.get("PRAGMAS") or {}
+    unknown = set(pragmas) - set(SQLITE_PRAGMAS)
+    if unknown:
+        raise ValueError(f"PRAGMAs de SQLite no soportados: {', '.join(sorted(unknown))}")
+    with connection.cursor() as cursor:
+        for name in SQLITE_PRAGMAS:
+            if name in pragmas:
+                cursor.execute(f"PRAGMA {name} = {pragmas[name]}")
+
+
+def connect_signals():
+    """connect_signals: Registra los hooks de conexión de la base de datos"""
+    connection_created.connect(apply_sqlite_pragmas, dispatch_uid="vetsoft_sqlite_pragmas")
@@ -0,0 +1,260 @@
+#Importaciones de Python
+import logging
+import threading
+import time
+import uuid
+from functools import partial
+
+#Importaciones de Django
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from app.bulk import delete_rows
+from app.caching import bump_version, get_cache
+from app.models import Client, MedicalRecord, Medicine, Pet, Product, Provider, Vet
+
+# Borrado por bloques de clientes y proveedores con muchas filas dependientes.
+# Model.delete() junta en memoria todas las mascotas o productos (y envía sus
+# señales de a una) antes de borrar, en una sola transacción que bloquea la
+# escritura de SQLite hasta el final. Acá las dependientes se borran de a
+# VETSOFT_DELETE_BATCH_SIZE con un DELETE por tabla, sin cargarlas, cada bloque
+# en su propia transacción, y la fila principal al final.
+#
+# Desde la app los borrados son lógicos (app.bulk.delete_rows). Un cliente o
+# proveedor con más dependientes que un bloque se marca en segundo plano, de a
+# bloques y mostrando el progreso (start_job), y purge_deleted borra de verdad
+# las filas con deleted_at, también por bloques, fuera del horario de uso.
+
+
+class Cascade:
+    """ Esta clase describe qué se borra junto con una fila
+    Contiene los siguientes atributos:
+    - model: modelo de la fila que se borra
+    - dependent: modelo que la referencia con on_delete=CASCADE
+    - field: campo de dependent que apunta a model
+    - children: (modelo, campo) que a su vez referencian a dependent, incluidas
+      las tablas intermedias de sus relaciones muchos a muchos
+    - entities: entidades de la caché de listados que cambian
+    """
+
+    def __init__(self, model, dependent, field, children, entities):
+        self.model = model
+        self.dependent = dependent
+        self.field = field
+        self.children = children
+        self.entities = entities
+
+    def dependents(self, id):
+        """dependents: Filas dependientes de la fila `id`"""
+        # Incluye las filas con borrado lógico
+        return self.dependent.all_objects.filter(**{f"{self.field}_id": id})
+
+    def delete_batch(self, ids):
+        """delete_batch: Borra las dependientes `ids` y sus hijas, un DELETE por tabla"""
+        using = router.db_for_write(self.dependent)
+        # _raw_delete no carga las filas ni envía señales: los triggers de la
+        # búsqueda siguen actualizando el índice y la caché se invalida al
+        # confirmar el bloque
+        for model, field in self.children:
+            model._base_manager.filter(**{f"{field}_id__in": ids})._raw_delete(using)
+        self.dependent._base_manager.filter(id__in=ids)._raw_delete(using)
+        for entity in self.entities:
+            transaction.on_commit(partial(bump_version, entity), using=using)
+
+
+CASCADES = {
+    "clients": Cascade(
+        Client, Pet, "client",
+        [(MedicalRecord, "pet"), (Pet.medicines.through, "pet"), (Pet.vets.through, "pet")],
+        ["pets"],
+    ),
+    "providers": Cascade(Provider, Product, "provider", [], ["products"]),
+}
+
+# Cuánto se guarda el progreso de un trabajo después de la última novedad
+JOB_TIMEOUT_SECONDS = 3600
+
+logger = logging.getLogger("vetsoft.deletion")
+
+# Orden de la purga: primero las filas que dependen de otras, así al purgar un
+# cliente o un proveedor ya no quedan mascotas o productos que borrar con él
+PURGE_MODELS = [Pet, Product, Client, Provider, Medicine, Vet]
+
+
+def purgeable(model, cutoff):
+    """purgeable: Filas de `model` con borrado lógico anterior a `cutoff` que se
+    pueden borrar de verdad. Un cliente o proveedor que todavía tiene mascotas o
+    productos vigentes (reasignados o restaurados después del borrado) queda: el
+    borrado en cascada se los llevaría.
+    """
+    # El índice parcial de deleted_at solo tiene las filas borradas
+    rows = model.all_objects.filter(deleted_at__lt=cutoff)
+    for cascade in CASCADES.values():
+        if cascade.model is model:
+            live = cascade.dependent.objects.filter(**{cascade.field: OuterRef("pk")})
+            rows = rows.exclude(Exists(live))
+    return rows.order_by("deleted_at")
+
+
+def count_dependents(entity, id):
+    """count_dependents: Cantidad de filas que se borran en cascada con la fila"""
+    return CASCADES[entity].dependents(id).count()
+
+
+def delete_in_batches(entity, id, batch_size=None, progress=None):
+    """delete_in_batches: Borra las filas dependientes de a `batch_size` y después
+    la fila principal. Llama a `progress(borradas, total)` después de cada bloque.
+    Retorna la cantidad de dependientes borradas.
+    """
+    cascade = CASCADES[entity]
+    batch_size = batch_size or settings.VETSOFT_DELETE_BATCH_SIZE
+    rows = cascade.dependents(id)
+    total = rows.count()
+    deleted = 0
+    while True:
+        # Los ids se leen fuera de la transacción: así cada una empieza
+        # escribiendo y no tiene que pasar de lectura a escritura
+        ids = list(rows.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            cascade.delete_batch(ids)
+        deleted += len(ids)
+        if progress:
+            # Las filas agregadas mientras tanto también se borran
+            progress(deleted, max(total, deleted))
+        # Deja pasar a las escrituras que esperan el lock entre bloques
+        time.sleep(settings.VETSOFT_DELETE_PAUSE_SECONDS)
+
+    # Ya sin dependientes el borrado normal es una sola fila (y sus señales)
+    with transaction.atomic():
+        cascade.model.all_objects.filter(id=id).delete()
+    return deleted
+
+
+def soft_delete_in_batches(entity, id, batch_size=None, progress=None):
+    """soft_delete_in_batches: Borrado lógico de las dependientes vigentes de a
+    `batch_size`, un UPDATE por bloque en su propia transacción, y de la fila
+    principal al final. Llama a `progress(marcadas, total)` después de cada
+    bloque. Retorna la cantidad de dependientes marcadas.
+    """
+    cascade = CASCADES[entity]
+    batch_size = batch_size or settings.VETSOFT_DELETE_BATCH_SIZE
+    rows = cascade.dependent.objects.filter(**{f"{cascade.field}_id": id})
+    total = rows.count()
+    deleted = 0
+    while True:
+        ids = list(rows.order_by("id").values_list("id", flat=True)[:batch_size])
+        if not ids:
+            break
+        now = timezone.now()
+        with transaction.atomic():
+            cascade.dependent.objects.filter(id__in=ids).update(deleted_at=now, updated_at=now)
+            for dependent in cascade.entities:
+                transaction.on_commit(partial(bump_version, dependent))
+        deleted += len(ids)
+        if progress:
+            progress(deleted, max(total, deleted))
+        time.sleep(settings.VETSOFT_DELETE_PAUSE_SECONDS)
+
+    # La fila principal queda para el final: si el trabajo se corta sigue en el
+    # listado y se puede volver a borrar
+    delete_rows(entity, [id])
+    return deleted
+
+
+def job_key(job_id):
+    """job_key: Clave de la caché con el progreso del trabajo"""
+    return f"deletion:{job_id}"
+
+
+def get_job(job_id):
+    """get_job: Progreso del trabajo o None si no existe (o ya expiró)"""
+    return get_cache().get(job_key(job_id))
+
+
+def _save_job(job_id, **state):
+    cache = get_cache()
+    job = cache.get(job_key(job_id)) or {}
+    job.update(state)
+    cache.set(job_key(job_id), job, JOB_TIMEOUT_SECONDS)
+
+
+def run_job(job_id, entity, id):
+    """run_job: Hace el borrado lógico por bloques guardando el progreso del trabajo"""
+    try:
+        soft_delete_in_batches(
+            entity, id,
+            progress=lambda deleted, total: _save_job(job_id, deleted=deleted, total=total),
+        )
+    except Exception:
+        logger.exception("No se pudo terminar el borrado de %s %s", entity, id)
+        _save_job(job_id, status="failed")
+    else:
+        _save_job(job_id, status="done")
+
+
+def live_dependents(entity, id):
+    """live_dependents: Cantidad de dependientes vigentes que se borran con la fila"""
+    cascade = CASCADES[entity]
+    return cascade.dependent.objects.filter(**{f"{cascade.field}_id": id}).count()
+
+
+def needs_background(entity, id):
+    """needs_background: Indica si la fila tiene más dependientes vigentes que un bloque"""
+    return live_dependents(entity, id) > settings.VETSOFT_DELETE_BATCH_SIZE
+
+
+def run_in_background(task):
+    """run_in_background: Corre `task` en un thread aparte, después de responder"""
+    threading.Thread(target=_run_in_thread, args=(task,), daemon=True).start()
+
+
+def _run_in_thread(task):
+    try:
+        task()
+    finally:
+        # El thread tiene sus propias conexiones y nadie más las va a cerrar
+        connections.close_all()
+
+
+def start_job(entity, instance):
+    """start_job: Empieza el borrado lógico por bloques en segundo plano y retorna
+    el id del trabajo. El progreso queda en la caché, así que con varios procesos
+    hace falta una caché compartida (CACHE_BACKEND file o redis).
+    """
+    job_id = uuid.uuid4().hex
+    _save_job(
+        job_id, entity=entity, name=str(instance), status="running",
+        deleted=0, total=live_dependents(entity, instance.id),
+    )
+    run_in_background(partial(run_job, job_id, entity, instance.id))
+    return job_id
+
+
+def purge_deleted(cutoff, batch_size=None, deadline=None, progress=None):
+    """purge_deleted: Borra de verdad las filas con borrado lógico anterior a
+    `cutoff`, de a `batch_size` por transacción, hasta terminar o hasta pasar
+    `deadline` (un valor de time.monotonic()). Llama a `progress(modelo, borradas)`
+    después de cada bloque. Retorna la cantidad de filas borradas por modelo.
+    """
+    batch_size = batch_size or settings.VETSOFT_DELETE_BATCH_SIZE
+    purged = {}
+    for model in PURGE_MODELS:
+        rows = purgeable(model, cutoff)
+        while deadline is None or time.monotonic() < deadline:
+            ids = list(rows.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            # delete() borra también el historial y las tablas intermedias. La
+            # condición se repite en el DELETE por si una fila ganó dependientes
+            # vigentes después de leer los ids
+            with transaction.atomic():
+                _, deleted = rows.filter(id__in=ids).delete()
+            purged[model._meta.label] = purged.get(model._meta.label, 0) + deleted.get(model._meta.label, 0)
+            if progress:
+                progress(model, purged[model._meta.label])
+            time.sleep(settings.VETSOFT_DELETE_PAUSE_SECONDS)
+    return purged
@@ -0,0 +1,209 @@
+#Importaciones de Python
+import json
+import re
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+#Importaciones de Django
+from django.conf import settings
+from django.db import connections
+from django.test.runner import DiscoverRunner
+
+# Asesor de índices: junta las consultas que hacen los tests o el benchmark
+# (una vez cada SQL distinto, con los parámetros de la primera vez), corre
+# EXPLAIN QUERY PLAN sobre la base configurada y marca las que recorren entera
+# una tabla grande descartando filas que un índice podría evitar. Solo SQLite:
+# el plan de otras bases tiene otro formato.
+
+# Recorridos del plan: "SCAN app_pet", "SCAN U0 USING INDEX pet_name_id_idx",
+# "SCAN app_pet USING COVERING INDEX ...". Las búsquedas (SEARCH) no cuentan.
+SCAN = re.compile(r"^SCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?")
+
+# Alias de las subconsultas de Django: "app_pet" U0
+TABLE_ALIAS = re.compile(r'"(\w+)" (?:AS )?"?(U\d+|T\d+)"?')
+
+# Fin de la condición de la consulta
+END_OF_WHERE = re.compile(r" (?:GROUP BY|ORDER BY|LIMIT) ")
+
+# Condición de un índice parcial en su definición
+INDEX_WHERE = re.compile(r"\) WHERE ")
+
+# Los índices de los listados son parciales (deleted_at IS NULL): esa
+# condición no hace falta en las columnas del índice
+IGNORED_COLUMNS = {"deleted_at"}
+
+EXPLAINED = ("SELECT", "UPDATE", "DELETE")
+
+
+class QueryLog:
+    """ Esta clase junta las consultas distintas que se ejecutaron
+    Contiene los siguientes atributos:
+    - queries: {sql: {"count": veces, "params": parámetros de la primera vez}}
+    Contiene los siguientes métodos:
+    - add: registra una ejecución
+    - save / load: escriben y leen el registro como JSON Lines
+    """
+
+    def __init__(self):
+        self.queries = {}
+
+    def add(self, sql, params):
+        """add: Registra una ejecución de `sql` (solo SELECT, UPDATE y DELETE)"""
+        if not sql.lstrip().upper().startswith(EXPLAINED):
+            return
+        entry = self.queries.setdefault(sql, {"count": 0, "params": _jsonable(params)})
+        entry["count"] += 1
+
+    def __call__(self, execute, sql, params, many, context):
+        """__call__: Registra la consulta; se instala con connection.execute_wrapper"""
+        if not many:
+            self.add(sql, params)
+        return execute(sql, params, many, context)
+
+    def save(self, path):
+        """save: Escribe una consulta por línea"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as file:
+            for sql, entry in self.queries.items():
+                file.write(json.dumps({"sql": sql, **entry}) + "\n")
+
+    @classmethod
+    def load(cls, path):
+        """load: Lee un registro escrito con save"""
+        log = cls()
+        with Path(path).open() as file:
+            for line in file:
+                entry = json.loads(line)
+                log.queries[entry["sql"]] = {"count": entry["count"], "params": entry["params"]}
+        return log
+
+
+def _jsonable(params):
+    return [value if isinstance(value, (int, float, str, type(None))) else str(value) for value in params or []]
+
+
+@contextmanager
+def recording(log, aliases=None):
+    """recording: Registra en `log` las consultas de las conexiones `aliases`
+    (todas por defecto) hechas desde este thread dentro del bloque
+    """
+    with ExitStack() as stack:
+        for alias in aliases or connections:
+            stack.enter_context(connections[alias].execute_wrapper(log))
+        yield log
+
+
+def query_plan(connection, sql, params):
+    """query_plan: Líneas de EXPLAIN QUERY PLAN de la consulta"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _filtered_columns(sql, table, alias):
+    # Columnas de la tabla que aparecen en el WHERE
+    where = END_OF_WHERE.split(sql.partition(" WHERE ")[2])[0]
+    columns = set()
+    for name in {table, alias}:
+        columns |= set(re.findall(rf'"?{name}"?\."(\w+)"', where))
+    return columns - IGNORED_COLUMNS
+
+
+def _index_columns(connection, index):
+    if index is None:
+        # Recorrido por rowid: solo está ordenado por id
+        return {"id"}
+    # De la definición y no de PRAGMA index_info, que no nombra las columnas
+    # de los índices de expresiones como LOWER("type")
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = %s", [index])
+        row = cursor.fetchone()
+    if row is None or row[0] is None:
+        # Índices automáticos de las restricciones UNIQUE
+        return set()
+    definition = INDEX_WHERE.split(row[0].partition("(")[2])[0]
+    return set(re.findall(r'"(\w+)"', definition))
+
+
+def unindexed_scans(connection, sql, plan):
+    """unindexed_scans: Tablas que el plan recorre enteras (o todo un índice)
+    revisando fila por fila una condición que el índice no tiene. Un recorrido
+    sin condición, como el de una exportación o un count(*), no se marca:
+    ningún índice lo evitaría.
+    """
+    aliases = {alias: table for table, alias in TABLE_ALIAS.findall(sql)}
+    tables = []
+    for detail in plan:
+        match = SCAN.match(detail.strip())
+        if not match:
+            continue
+        name, index = match.groups()
+        table = aliases.get(name, name)
+        if _filtered_columns(sql, table, name) - _index_columns(connection, index):
+            tables.append(table)
+    return tables
+
+
+class Finding:
+    """ Esta clase es una consulta que recorre una tabla grande
+    Contiene los siguientes atributos:
+    - sql: consulta, con %s en lugar de los parámetros
+    - count: veces que se ejecutó
+    - tables: {tabla recorrida: cantidad de filas}
+    - plan: líneas de EXPLAIN QUERY PLAN
+    """
+
+    def __init__(self, sql, count, tables, plan):
+        self.sql = sql
+        self.count = count
+        self.tables = tables
+        self.plan = plan
+
+
+def advise(log, connection, min_rows=None):
+    """advise: Retorna las consultas del registro que recorren enteras tablas de
+    más de `min_rows` filas en la base de `connection`, de la más repetida a la
+    menos. Las que fallan al explicarse (tablas que ya no existen) se saltean.
+    """
+    min_rows = settings.VETSOFT_EXPLAIN_MIN_ROWS if min_rows is None else min_rows
+    sizes = {}
+    findings = []
+    for sql, entry in log.queries.items():
+        try:
+            plan = query_plan(connection, sql, entry["params"])
+        except Exception:
+            continue
+        large = {}
+        for table in unindexed_scans(connection, sql, plan):
+            if table not in sizes:
+                sizes[table] = _count_rows(connection, table)
+            if sizes[table] is not None and sizes[table] >= min_rows:
+                large[table] = sizes[table]
+        if large:
+            findings.append(Finding(sql, entry["count"], large, plan))
+    return sorted(findings, key=lambda finding: -finding.count)
+
+
+def _count_rows(connection, table):
+    # Una tabla de SQLite interna o una tabla virtual no se cuentan
+    if table not in connection.introspection.table_names():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {connection.ops.quote_name(table)}")
+        return cursor.fetchone()[0]
+
+
+class QueryRecordingRunner(DiscoverRunner):
+    """ Esta clase corre los tests registrando sus consultas en
+    VETSOFT_QUERY_LOG, para explicarlas después con explain_vetsoft:
+    python manage.py test --testrunner app.explain.QueryRecordingRunner
+    """
+
+    def run_suite(self, suite, **kwargs):
+        """run_suite: Corre los tests dentro de recording y guarda el registro"""
+        log = QueryLog()
+        with recording(log):
+            result = super().run_suite(suite, **kwargs)
+        log.save(settings.VETSOFT_QUERY_LOG)
+        return result
@@ -0,0 +1,75 @@
+#Importaciones de Python
+import csv
+import json
+
+#Importaciones de Django
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from app.filters import filter_listing
+from app.models import Client, Medicine, Pet, Product, Provider, Vet
+
+# Columnas exportadas de cada entidad; "client__name" y "provider__name" se
+# resuelven con un JOIN en la misma consulta
+EXPORTS = {
+    "clients": (Client, ["id", "name", "phone", "email", "address"]),
+    "medicines": (Medicine, ["id", "name", "description", "dose"]),
+    "pets": (
+        Pet,
+        ["id", "name", "breed", "birthday", "weight", "client_id", "client__name"],
+    ),
+    "products": (
+        Product,
+        ["id", "name", "type", "price", "provider_id", "provider__name"],
+    ),
+    "providers": (Provider, ["id", "name", "email", "address"]),
+    "vets": (Vet, ["id", "name", "email", "phone"]),
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """ Esta clase imita un archivo cuyo write retorna lo escrito, para que
+    csv.writer produzca cada línea sin acumularlas en memoria.
+    """
+
+    def write(self, value):
+        """write: Retorna el valor en lugar de guardarlo"""
+        return value
+
+
+def export_rows(entity, params):
+    """export_rows: Itera las filas filtradas de a bloques, como tuplas"""
+    model, fields = EXPORTS[entity]
+    queryset = filter_listing(entity, params, model.objects.all()).order_by("id")
+    return fields, queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(fields, rows):
+    """stream_csv: Genera el CSV línea por línea"""
+    writer = csv.writer(Echo())
+    yield writer.writerow([field.replace("__", "_") for field in fields])
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_jsonl(fields, rows):
+    """stream_jsonl: Genera un objeto JSON por línea"""
+    keys = [field.replace("__", "_") for field in fields]
+    for row in rows:
+        yield json.dumps(dict(zip(keys, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def export_response(entity, params, file_format):
+    """export_response: Respuesta que transmite la exportación sin armarla en memoria"""
+    fields, rows = export_rows(entity, params)
+    if file_format == "jsonl":
+        content, content_type = stream_jsonl(fields, rows), "application/x-ndjson"
+    else:
+        file_format = "csv"
+        content, content_type = stream_csv(fields, rows), "text/csv; charset=utf-8"
+
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{entity}.{file_format}"'
+    return response
@@ -0,0 +1,32 @@
+# Filtros de los listados, compartidos por las páginas repository.html y las
+# exportaciones: cada parámetro de la URL se traduce a un lookup del ORM.
+LISTING_FILTERS = {
+    "clients": {"q": "name__icontains"},
+    "medicines": {"q": "name__icontains"},
+    "pets": {"q": "name__icontains", "breed": "breed", "client": "client_id"},
+    "products": {"q": "name__icontains", "type": "type__lexact", "provider": "provider_id"},
+    "providers": {"q": "name__icontains"},
+    "vets": {"q": "name__icontains"},
+}
+
+# Parámetros que deben ser un id numérico; con otro valor se ignoran
+ID_FILTERS = {"client", "provider"}
+
+
+def get_filters(entity, params):
+    """get_filters: Retorna los filtros de la URL que aplican a la entidad"""
+    filters = {}
+    for param, lookup in LISTING_FILTERS[entity].items():
+        value = params.get(param, "").strip()
+        if not value:
+            continue
+        if param in ID_FILTERS and not value.isdigit():
+            continue
+        filters[param] = (lookup, value)
+    return filters
+
+
+def filter_listing(entity, params, queryset):
+    """filter_listing: Aplica al queryset los filtros de la URL de la entidad"""
+    lookups = {lookup: value for lookup, value in get_filters(entity, params).values()}
+    return queryset.filter(**lookups)
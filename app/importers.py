@@ -0,0 +1,269 @@
+#Importaciones de Python
+import csv
+import json
+from itertools import islice
+
+#Importaciones de Django
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from app.caching import bump_version
+from app.models import (
+    Client,
+    Medicine,
+    Pet,
+    Product,
+    Provider,
+    Vet,
+    validate_client,
+    validate_medicine,
+    validate_pet,
+    validate_product,
+    validate_provider,
+    validate_vet,
+)
+
+
+class ForeignKeyLookup:
+    """ Esta clase resuelve una clave foránea por un campo natural (por ejemplo
+    el email del cliente) con un mapa en memoria que se completa por bloque,
+    con una sola consulta por bloque para las claves que todavía no conoce.
+    """
+
+    def __init__(self, model, lookup_field, column, target):
+        self.model = model
+        self.lookup_field = lookup_field
+        self.column = column
+        self.target = target
+        self.ids = {}
+
+    def load(self, rows):
+        """load: Trae en una consulta los ids de las claves nuevas del bloque"""
+        missing = {
+            row.get(self.column, "") for row in rows
+            if row.get(self.column, "") and row.get(self.column, "") not in self.ids
+        }
+        if not missing:
+            return
+        found = (
+            self.model.objects.filter(**{f"{self.lookup_field}__in": missing})
+            .order_by("-id")
+            .values_list(self.lookup_field, "id")
+        )
+        # con claves repetidas queda el id más chico
+        self.ids.update(found)
+        for key in missing - self.ids.keys():
+            self.ids[key] = None
+
+    def resolve(self, row):
+        """resolve: Retorna (id, error) de la fila; sin valor en la columna no hay error"""
+        key = row.get(self.column, "")
+        if not key:
+            return None, None
+        object_id = self.ids.get(key)
+        if object_id is None:
+            return None, f"No existe {self.model._meta.verbose_name} con {self.lookup_field} {key}"
+        return object_id, None
+
+
+class Importer:
+    """ Esta clase describe cómo importar una entidad
+    Contiene los siguientes atributos:
+    - model: modelo a crear
+    - validate: función validate_* de app.models
+    - fields: columnas que se copian al modelo
+    - lookup: ForeignKeyLookup opcional para la relación de la entidad
+    """
+
+    def __init__(self, model, validate, fields, lookup=None):
+        self.model = model
+        self.validate = validate
+        self.fields = fields
+        self.lookup = lookup
+
+    def build(self, row):
+        """build: Valida la fila y retorna (instancia, errores)"""
+        if INVALID_ROW in row:
+            return None, {"__all__": row[INVALID_ROW]}
+        errors = self.validate(row)
+        values = {}
+        for field in self.fields:
+            try:
+                model_field = self.model._meta.get_field(field)
+                values[field] = model_field.to_python(row.get(field, ""))
+            except ValidationError as error:
+                errors.setdefault(field, " ".join(error.messages))
+
+        if self.lookup is not None:
+            object_id, error = self.lookup.resolve(row)
+            if error:
+                errors[self.lookup.column] = error
+            values[self.lookup.target] = object_id
+
+        if errors:
+            return None, errors
+        return self.model(**values), None
+
+
+def get_importer(entity):
+    """get_importer: Retorna un Importer nuevo para la entidad pedida"""
+    importers = {
+        "clients": lambda: Importer(
+            Client, validate_client, ["name", "phone", "email", "address"],
+        ),
+        "medicines": lambda: Importer(
+            Medicine, validate_medicine, ["name", "description", "dose"],
+        ),
+        "pets": lambda: Importer(
+            Pet, validate_pet, ["name", "breed", "birthday", "weight"],
+            ForeignKeyLookup(Client, "email", "client_email", "client_id"),
+        ),
+        "products": lambda: Importer(
+            Product, validate_product, ["name", "type", "price"],
+            ForeignKeyLookup(Provider, "email", "provider_email", "provider_id"),
+        ),
+        "providers": lambda: Importer(
+            Provider, validate_provider, ["name", "email", "address"],
+        ),
+        "vets": lambda: Importer(Vet, validate_vet, ["name", "email", "phone"]),
+    }
+    return importers[entity]()
+
+
+IMPORT_ENTITIES = ["clients", "medicines", "pets", "products", "providers", "vets"]
+
+# Clave con la que read_rows marca una fila que no se pudo leer
+INVALID_ROW = "__invalid__"
+
+
+# Manejo de errores con el que se abre el archivo: los bytes que no son UTF-8
+# llegan como surrogates y read_rows rechaza solo la fila que los tiene
+DECODE_ERRORS = "surrogateescape"
+
+
+def read_rows(stream, file_format):
+    """read_rows: Lee de a una fila un CSV (con encabezado) o un JSONL.
+    Todos los valores se normalizan a texto, como llegan desde un formulario.
+    Una fila con bytes que no son UTF-8 se marca como inválida; si el archivo
+    no se puede seguir leyendo, la última fila marca dónde se cortó.
+    """
+    if file_format == "csv":
+        rows = csv.DictReader(stream)
+    elif file_format == "jsonl":
+        rows = (_parse_json_line(line) for line in stream if line.strip())
+    else:
+        raise ValueError(f"Formato no soportado: {file_format}")
+
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as error:
+            yield {INVALID_ROW: f"No se pudo leer el archivo desde esta fila: {error}"}
+            return
+        row = {
+            key.strip(): "" if value is None else str(value).strip()
+            for key, value in row.items() if key
+        }
+        if not _is_utf8(row):
+            row = {INVALID_ROW: "La fila tiene caracteres que no son UTF-8 válido"}
+        yield row
+
+
+def _is_utf8(row):
+    try:
+        for key, value in row.items():
+            key.encode("utf-8")
+            value.encode("utf-8")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def _parse_json_line(line):
+    """_parse_json_line: Convierte una línea JSONL; si es inválida la marca como error"""
+    try:
+        row = json.loads(line)
+    except ValueError as error:
+        return {INVALID_ROW: f"JSON inválido: {error}"}
+    if not isinstance(row, dict):
+        return {INVALID_ROW: "Cada línea debe ser un objeto JSON"}
+    return row
+
+
+def guess_format(filename):
+    """guess_format: Deduce el formato por la extensión del archivo"""
+    return "jsonl" if filename.lower().endswith((".jsonl", ".json")) else "csv"
+
+
+def import_file(entity, stream, file_format, chunk_size=1000):
+    """import_file: Importa un archivo de texto abierto en el formato indicado"""
+    first_line = 2 if file_format == "csv" else 1
+    return import_rows(entity, read_rows(stream, file_format), chunk_size, first_line)
+
+
+class ImportReport:
+    """ Esta clase es el resultado de una importación
+    Contiene los siguientes atributos:
+    - created: cantidad de filas creadas
+    - errors: lista de (número de fila, {campo: mensaje}) de las filas rechazadas
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    @property
+    def rejected(self):
+        """rejected: Cantidad de filas rechazadas"""
+        return len(self.errors)
+
+    def write_errors(self, stream):
+        """write_errors: Escribe el reporte de errores como CSV (fila, campo, error)"""
+        writer = csv.writer(stream)
+        writer.writerow(["row", "field", "error"])
+        for line, errors in self.errors:
+            for field, message in errors.items():
+                writer.writerow([line, field, message])
+
+
+def import_rows(entity, rows, chunk_size=1000, first_line=1):
+    """import_rows: Importa filas de a bloques de `chunk_size`.
+    Cada bloque se valida completo y se inserta con bulk_create en su propia
+    transacción; una fila inválida se informa sin abortar el resto del archivo.
+    `first_line` es el número de línea de la primera fila (2 en un CSV con encabezado).
+    """
+    importer = get_importer(entity)
+    report = ImportReport()
+    numbered = enumerate(rows, start=first_line)
+
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            break
+        if importer.lookup is not None:
+            importer.lookup.load([row for _, row in chunk])
+
+        instances = []
+        lines = []
+        for line, row in chunk:
+            instance, errors = importer.build(row)
+            if errors:
+                report.errors.append((line, errors))
+            else:
+                instances.append(instance)
+                lines.append(line)
+
+        try:
+            with transaction.atomic():
+                importer.model.objects.bulk_create(instances, batch_size=chunk_size)
+        except DatabaseError as error:
+            report.errors.extend((line, {"__all__": str(error)}) for line in lines)
+        else:
+            report.created += len(instances)
+
+    # bulk_create no envía post_save: se invalidan los listados a mano
+    if report.created:
+        bump_version(entity)
+    return report
@@ -0,0 +1,104 @@
+#Importaciones de Python
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+#Importaciones de Django
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+# Estadísticas de la request en curso (None fuera de una request instrumentada)
+_current_stats = ContextVar("vetsoft_request_stats", default=None)
+
+
+class RequestStats:
+    """ Esta clase acumula las mediciones de una request
+    Contiene los siguientes atributos:
+    - queries: lista de (sql, duración en ms) de cada consulta ejecutada
+    - db_ms: tiempo total en la base de datos
+    - template_ms: tiempo total renderizando templates
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+
+    @property
+    def query_count(self):
+        """query_count: Cantidad de consultas ejecutadas"""
+        return len(self.queries)
+
+    def slowest_queries(self, limit):
+        """slowest_queries: Las `limit` consultas más lentas, de mayor a menor"""
+        return sorted(self.queries, key=lambda query: query[1], reverse=True)[:limit]
+
+    def __call__(self, execute, sql, params, many, context):
+        """Wrapper de connection.execute_wrapper que mide cada consulta"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.db_ms += elapsed
+            self.queries.append((sql, elapsed))
+
+
+def start_request_stats():
+    """start_request_stats: Activa la medición para el contexto actual"""
+    stats = RequestStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_request_stats(token):
+    """stop_request_stats: Desactiva la medición iniciada con start_request_stats"""
+    _current_stats.reset(token)
+
+
+def wrap_queries(wrapper):
+    """wrap_queries: Instala `wrapper` en todas las conexiones del thread actual.
+    Retorna un ExitStack que lo quita al cerrarse. En una request async las
+    consultas corren en el thread de sync_to_async, así que hay que llamarla
+    (y cerrar el stack) desde ese thread.
+    """
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(wrapper))
+    return stack
+
+
+def current_request_stats():
+    """current_request_stats: Retorna las estadísticas de la request en curso o None"""
+    return _current_stats.get()
+
+
+class TimedTemplate(Template):
+    """ Esta clase es un template de Django que suma su tiempo de renderizado
+    a las estadísticas de la request en curso, si las hay.
+    """
+
+    def render(self, context=None, request=None):
+        """render: Renderiza el template y acumula el tiempo empleado"""
+        stats = _current_stats.get()
+        if stats is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_ms += (time.perf_counter() - start) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """ Esta clase es el backend de templates de Django con TimedTemplate.
+    Fuera de una request instrumentada se comporta igual que DjangoTemplates.
+    """
+
+    def from_string(self, template_code):
+        """from_string: Igual que DjangoTemplates pero con TimedTemplate"""
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        """get_template: Igual que DjangoTemplates pero con TimedTemplate"""
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
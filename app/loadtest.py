@@ -0,0 +1,155 @@
+#Importaciones de Python
+import http.client
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+#Importaciones de Django
+from django.conf import settings
+from django.urls import reverse
+
+from app.benchmarks import percentile
+
+# Páginas que recorre la prueba de carga si no se indican otras
+REPOSITORY_URLS = [
+    "clients_repo",
+    "medicines_repo",
+    "pets_repo",
+    "products_repo",
+    "providers_repo",
+    "vets_repo",
+]
+
+
+SERVING_MODES = ("runserver", "gunicorn", "uvicorn", "uvicorn-async")
+
+
+def serving_command(mode, port):
+    """serving_command: Retorna (comando, variables de entorno) para levantar la app.
+    Modos: runserver (desarrollo), gunicorn (WSGI, workers sync), uvicorn
+    (ASGI, workers de uvicorn bajo gunicorn) y uvicorn-async (lo mismo con
+    VETSOFT_ASYNC_VIEWS); los de gunicorn con gunicorn.conf.py.
+    """
+    env = {
+        **os.environ,
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "GUNICORN_ACCESS_LOG": "",
+        "VETSOFT_ASYNC_VIEWS": "true" if mode == "uvicorn-async" else "false",
+    }
+    if mode == "runserver":
+        manage = str(settings.BASE_DIR / "manage.py")
+        return [sys.executable, manage, "runserver", "--noreload", f"127.0.0.1:{port}"], env
+    config = str(settings.BASE_DIR / "gunicorn.conf.py")
+    env["GUNICORN_WORKER_CLASS"] = "sync" if mode == "gunicorn" else "uvicorn"
+    return [sys.executable, "-m", "gunicorn", "-c", config], env
+
+
+def _wait_until_ready(port, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El servidor terminó con código {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", reverse("home"))
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {timeout}s")
+
+
+@contextmanager
+def serving(mode, port, timeout=60):
+    """serving: Levanta la app en `mode` mientras dura el bloque"""
+    command, env = serving_command(mode, port)
+    process = subprocess.Popen(
+        command, env=env, cwd=settings.BASE_DIR,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_ready(port, process, timeout)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def _client(port, paths, deadline, samples, errors, lock):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    timings = []
+    failed = 0
+    for path in paths:
+        if time.monotonic() >= deadline:
+            break
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            failed += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        if response.status >= 400:
+            failed += 1
+        else:
+            timings.append((time.perf_counter() - start) * 1000)
+    connection.close()
+    with lock:
+        samples.extend(timings)
+        errors.append(failed)
+
+
+def run_load(port, paths, concurrency, seconds):
+    """run_load: Hace requests a `paths` (en ronda) con `concurrency` clientes
+    con keep-alive durante `seconds` segundos y retorna req/s y latencias.
+    """
+    samples = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+    threads = []
+    for number in range(concurrency):
+        # Cada cliente empieza por una página distinta
+        offset = number % len(paths)
+        order = itertools.cycle(paths[offset:] + paths[:offset])
+        threads.append(
+            threading.Thread(target=_client, args=(port, order, deadline, samples, errors, lock)),
+        )
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(samples),
+        "req_per_s": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(samples, 0.50), 3) if samples else None,
+        "p99_ms": round(percentile(samples, 0.99), 3) if samples else None,
+        "errors": sum(errors),
+    }
+
+
+def run_loadtest(modes, concurrency, seconds, port, paths=None):
+    """run_loadtest: Mide cada modo de servir la app con la misma carga"""
+    paths = paths or [reverse(name) for name in REPOSITORY_URLS]
+    results = {}
+    for mode in modes:
+        with serving(mode, port):
+            # Una vuelta previa para abrir conexiones y calentar cachés
+            run_load(port, paths, concurrency, min(seconds, 1))
+            results[mode] = run_load(port, paths, concurrency, seconds)
+    return results
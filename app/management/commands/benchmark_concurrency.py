@@ -0,0 +1,50 @@
+#Importaciones de Python
+import json
+from pathlib import Path
+
+#Importaciones de Django
+from django.core.management.base import BaseCommand
+
+from app.benchmarks import run_concurrency
+
+
+class Command(BaseCommand):
+    """ Esta clase compara el rendimiento de SQLite con lectores y escritores
+    concurrentes entre la configuración por defecto de Django y la de
+    DATABASES["default"] (WAL, PRAGMAs y conexiones persistentes).
+    """
+
+    help = "Mide lecturas y escrituras concurrentes en SQLite con y sin los ajustes de producción"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define procesos, duración y tamaño de la base"""
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--rows", type=int, default=10000,
+                            help="Clientes y mascotas de la base temporal")
+        parser.add_argument("--output", default=None, help="Archivo JSON con los resultados")
+
+    def handle(self, *args, **options):
+        """handle: Corre cada modo y muestra operaciones por segundo"""
+        results = run_concurrency(
+            options["readers"], options["writers"], options["seconds"], options["rows"],
+        )
+        for mode, summary in results.items():
+            for role, metrics in summary.items():
+                p95 = "-" if metrics["p95_ms"] is None else f"{metrics['p95_ms']:.3f}ms"
+                self.stdout.write(
+                    f"{mode:<8} {role:<6} {metrics['ops_per_s']:>10.1f} ops/s "
+                    f"p95={p95:>12} errores={metrics['errors']}",
+                )
+
+        default, tuned = results["default"], results["tuned"]
+        for role in ("read", "write"):
+            if default[role]["ops_per_s"]:
+                ratio = tuned[role]["ops_per_s"] / default[role]["ops_per_s"]
+                self.stdout.write(self.style.SUCCESS(f"{role}: x{ratio:.2f} con los ajustes"))
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2))
@@ -0,0 +1,90 @@
+#Importaciones de Python
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+
+#Importaciones de Django
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app.benchmarks import compare, run_benchmarks
+
+
+class Command(BaseCommand):
+    """ Esta clase mide latencia, consultas y memoria de las vistas y de los
+    métodos de guardado contra la base de datos configurada (idealmente
+    generada con seed_vetsoft) y compara el resultado con una línea base.
+    """
+
+    help = "Mide las vistas y los métodos save_*/update_* y compara contra una línea base"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define iteraciones, archivos y tolerancia"""
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--only", action="append",
+                            help="Solo mide los casos cuyo nombre contenga este texto")
+        parser.add_argument("--output", default="benchmarks/results.json")
+        parser.add_argument("--baseline", default="benchmarks/baseline.json")
+        parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Aumento relativo permitido antes de marcar regresión")
+        parser.add_argument("--save-baseline", action="store_true",
+                            help="Guarda los resultados como nueva línea base")
+
+    def handle(self, *args, **options):
+        """handle: Corre los benchmarks, guarda el JSON y verifica regresiones"""
+        results = {}
+        for name, metrics in run_benchmarks(
+            options["iterations"], options["warmup"], options["only"],
+        ):
+            results[name] = metrics
+            if "error" in metrics:
+                self.stderr.write(f"{name:<40} {metrics['error']}")
+                continue
+            self.stdout.write(
+                f"{name:<40} p50={metrics['p50_ms']:>9.3f}ms "
+                f"p95={metrics['p95_ms']:>9.3f}ms p99={metrics['p99_ms']:>9.3f}ms "
+                f"queries={metrics['queries']:>3} mem={metrics['peak_memory_kb']:>9.1f}KB",
+            )
+
+        report = {
+            "meta": {
+                "date": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "iterations": options["iterations"],
+            },
+            "results": results,
+        }
+
+        self.write_json(options["output"], report)
+        if options["save_baseline"]:
+            self.write_json(options["baseline"], report)
+            self.stdout.write(self.style.SUCCESS(f"Línea base guardada en {options['baseline']}"))
+            return
+
+        baseline_path = Path(options["baseline"])
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING("No hay línea base para comparar"))
+            return
+
+        baseline = json.loads(baseline_path.read_text())["results"]
+        regressions = compare(results, baseline, options["tolerance"])
+        for regression in regressions:
+            self.stderr.write(
+                "Regresión en {benchmark} ({metric}): {baseline} -> {current}".format(
+                    **regression,
+                ),
+            )
+        if regressions:
+            raise CommandError(f"{len(regressions)} regresiones respecto de la línea base")
+        self.stdout.write(self.style.SUCCESS("Sin regresiones respecto de la línea base"))
+
+    def write_json(self, path, data):
+        """write_json: Escribe el reporte creando la carpeta si hace falta"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2))
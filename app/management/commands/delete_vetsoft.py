@@ -0,0 +1,39 @@
+#Importaciones de Python
+import time
+
+#Importaciones de Django
+from django.core.management.base import BaseCommand, CommandError
+
+from app.deletion import CASCADES, delete_in_batches
+
+
+class Command(BaseCommand):
+    """ Esta clase borra un cliente o un proveedor con todas sus mascotas o
+    productos por bloques, mostrando el progreso, para no bloquear la base
+    mientras la app sigue en uso.
+    """
+
+    help = "Borra un cliente o proveedor y sus filas relacionadas por bloques"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define la entidad, el id y el tamaño de bloque"""
+        parser.add_argument("entity", choices=list(CASCADES))
+        parser.add_argument("id", type=int)
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        """handle: Borra la fila y muestra el avance de cada bloque"""
+        entity, id = options["entity"], options["id"]
+        if not CASCADES[entity].model.all_objects.filter(id=id).exists():
+            raise CommandError(f"No existe {entity} con id {id}")
+
+        start = time.perf_counter()
+        deleted = delete_in_batches(
+            entity, id, options["batch_size"],
+            progress=lambda deleted, total: self.stdout.write(f"{deleted}/{total} filas relacionadas borradas"),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{entity} {id} borrado con {deleted} filas relacionadas en {time.perf_counter() - start:.1f}s",
+            ),
+        )
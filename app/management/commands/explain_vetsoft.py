@@ -0,0 +1,54 @@
+#Importaciones de Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app.benchmarks import run_benchmarks
+from app.explain import QueryLog, advise, recording
+
+
+class Command(BaseCommand):
+    """ Esta clase explica las consultas del benchmark (o las registradas al
+    correr los tests con QueryRecordingRunner) contra la base configurada,
+    idealmente generada con seed_vetsoft, y marca las que recorren enteras
+    las tablas grandes.
+    """
+
+    help = "Corre EXPLAIN QUERY PLAN sobre las consultas de la app y marca los recorridos de tablas grandes"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define el origen de las consultas y el umbral de filas"""
+        parser.add_argument("--queries",
+                            help="Registro JSONL de QueryRecordingRunner en lugar de correr el benchmark")
+        parser.add_argument("--only", action="append",
+                            help="Solo corre los casos del benchmark cuyo nombre contenga este texto")
+        parser.add_argument("--min-rows", type=int, default=None,
+                            help="Filas desde las que una tabla cuenta como grande")
+        parser.add_argument("--check", action="store_true",
+                            help="Termina con error si alguna consulta recorre una tabla grande")
+
+    def handle(self, *args, **options):
+        """handle: Junta las consultas, las explica y muestra las que recorren tablas grandes"""
+        if connection.vendor != "sqlite":
+            raise CommandError("El asesor de índices solo lee planes de SQLite")
+
+        if options["queries"]:
+            log = QueryLog.load(options["queries"])
+        else:
+            log = QueryLog()
+            with recording(log):
+                for name, metrics in run_benchmarks(1, 0, options["only"]):
+                    if "error" in metrics:
+                        self.stderr.write(f"{name:<40} {metrics['error']}")
+
+        findings = advise(log, connection, options["min_rows"])
+        for finding in findings:
+            tables = ", ".join(f"{table} ({rows} filas)" for table, rows in finding.tables.items())
+            self.stdout.write(self.style.WARNING(f"Recorre {tables} - {finding.count} veces"))
+            self.stdout.write(f"  {finding.sql}")
+            for detail in finding.plan:
+                self.stdout.write(f"    {detail}")
+
+        summary = f"{len(log.queries)} consultas distintas, {len(findings)} recorren tablas grandes"
+        if findings and options["check"]:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary) if not findings else summary)
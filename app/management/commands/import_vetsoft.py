@@ -0,0 +1,51 @@
+#Importaciones de Python
+import sys
+
+#Importaciones de Django
+from django.core.management.base import BaseCommand, CommandError
+
+from app.importers import DECODE_ERRORS, IMPORT_ENTITIES, guess_format, import_file
+
+
+class Command(BaseCommand):
+    """ Esta clase importa un archivo CSV o JSONL de una entidad en bloques,
+    informando las filas rechazadas sin abortar la importación.
+    """
+
+    help = "Importa clientes, mascotas, productos, etc. desde un archivo CSV o JSONL"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define la entidad, el archivo y el reporte de errores"""
+        parser.add_argument("entity", choices=IMPORT_ENTITIES)
+        parser.add_argument("path", help="Archivo a importar ('-' para la entrada estándar)")
+        parser.add_argument("--format", choices=["csv", "jsonl"], default=None)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--errors", default=None,
+                            help="Archivo CSV donde escribir las filas rechazadas")
+
+    def handle(self, *args, **options):
+        """handle: Importa el archivo y muestra el resumen"""
+        file_format = options["format"] or guess_format(options["path"])
+        try:
+            if options["path"] == "-":
+                report = import_file(
+                    options["entity"], sys.stdin, file_format, options["chunk_size"],
+                )
+            else:
+                with open(options["path"], newline="", encoding="utf-8-sig", errors=DECODE_ERRORS) as stream:
+                    report = import_file(
+                        options["entity"], stream, file_format, options["chunk_size"],
+                    )
+        except OSError as error:
+            raise CommandError(str(error)) from error
+
+        if options["errors"]:
+            with open(options["errors"], "w", newline="", encoding="utf-8") as stream:
+                report.write_errors(stream)
+        else:
+            for line, errors in report.errors[:20]:
+                self.stderr.write(f"Fila {line}: {errors}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{report.created} filas importadas, {report.rejected} rechazadas"),
+        )
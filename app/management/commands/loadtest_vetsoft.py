@@ -0,0 +1,51 @@
+#Importaciones de Python
+import json
+from pathlib import Path
+
+#Importaciones de Django
+from django.core.management.base import BaseCommand, CommandError
+
+from app.loadtest import SERVING_MODES, run_loadtest
+
+
+class Command(BaseCommand):
+    """ Esta clase compara req/s y latencia de los listados sirviendo la app
+    con runserver, gunicorn (WSGI) y gunicorn con workers de uvicorn (ASGI),
+    con las vistas sync o con las async (VETSOFT_ASYNC_VIEWS).
+    """
+
+    help = "Prueba de carga de los listados con cada modo de servir la app"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define modos, concurrencia, duración y puerto"""
+        parser.add_argument("--mode", action="append", choices=SERVING_MODES,
+                            help="Modo a medir (se puede repetir); por defecto todos")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--path", action="append",
+                            help="URL a pedir (se puede repetir); por defecto los listados")
+        parser.add_argument("--output", default=None, help="Archivo JSON con los resultados")
+
+    def handle(self, *args, **options):
+        """handle: Levanta cada modo, lo carga y muestra la comparación"""
+        try:
+            results = run_loadtest(
+                options["mode"] or SERVING_MODES, options["concurrency"],
+                options["seconds"], options["port"], options["path"],
+            )
+        except RuntimeError as error:
+            raise CommandError(str(error)) from error
+
+        for mode, metrics in results.items():
+            p50 = "-" if metrics["p50_ms"] is None else f"{metrics['p50_ms']:.1f}ms"
+            p99 = "-" if metrics["p99_ms"] is None else f"{metrics['p99_ms']:.1f}ms"
+            self.stdout.write(
+                f"{mode:<14} {metrics['req_per_s']:>9.1f} req/s "
+                f"p50={p50:>10} p99={p99:>10} errores={metrics['errors']}",
+            )
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(results, indent=2))
@@ -0,0 +1,39 @@
+#Importaciones de Python
+import time
+from datetime import timedelta
+
+#Importaciones de Django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.deletion import purge_deleted
+
+
+class Command(BaseCommand):
+    """ Esta clase borra de verdad las filas con borrado lógico, por bloques y
+    con un tiempo máximo, para correrla programada fuera del horario de uso.
+    """
+
+    help = "Purga las filas borradas hace más de --older-than-days días"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define la antigüedad, el tamaño de bloque y el tiempo máximo"""
+        parser.add_argument("--older-than-days", type=int, default=settings.VETSOFT_PURGE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--max-seconds", type=float, default=None)
+
+    def handle(self, *args, **options):
+        """handle: Purga las filas y muestra el avance de cada bloque"""
+        cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        start = time.monotonic()
+        deadline = start + options["max_seconds"] if options["max_seconds"] else None
+        purged = purge_deleted(
+            cutoff, options["batch_size"], deadline,
+            progress=lambda model, deleted: self.stdout.write(f"{model._meta.label}: {deleted} filas purgadas"),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{sum(purged.values())} filas purgadas en {time.monotonic() - start:.1f}s",
+            ),
+        )
@@ -0,0 +1,33 @@
+#Importaciones de Python
+import time
+
+#Importaciones de Django
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from app.search import is_supported, rebuild_search_index
+
+
+class Command(BaseCommand):
+    """ Esta clase reconstruye el índice de la búsqueda global (tabla FTS5 y
+    triggers), por ejemplo después de cargar datos con el índice borrado o de
+    restaurar una copia de la base sin él.
+    """
+
+    help = "Reconstruye el índice FTS5 de la búsqueda global"
+
+    def handle(self, *args, **options):
+        """handle: Reconstruye el índice y muestra cuántas filas indexó"""
+        if not is_supported(connection):
+            self.stdout.write(
+                f"La base {connection.vendor} no usa el índice FTS5; no hay nada que reconstruir",
+            )
+            return
+        start = time.perf_counter()
+        with transaction.atomic():
+            count = rebuild_search_index(connection)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{count} filas indexadas en {time.perf_counter() - start:.1f}s",
+            ),
+        )
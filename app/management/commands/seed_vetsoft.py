@@ -0,0 +1,242 @@
+#Importaciones de Python
+import random
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+#Importaciones de Django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.caching import VERSIONED_MODELS, bump_version
+from app.models import (
+    Breed,
+    Client,
+    MedicalRecord,
+    Medicine,
+    Pet,
+    Product,
+    Provider,
+    Vet,
+)
+
+FIRST_NAMES = [
+    "Juan", "Maria", "Lucia", "Martin", "Sofia", "Mateo", "Valentina", "Santiago",
+    "Camila", "Benjamin", "Julieta", "Tomas", "Milagros", "Nuria", "Ignacio", "Leo",
+]
+LAST_NAMES = [
+    "Gonzalez", "Rodriguez", "Fernandez", "Lopez", "Martinez", "Garcia", "Perez",
+    "Romero", "Sosa", "Alvarez", "Torres", "Ruiz", "Soberon", "Robledo", "Tello",
+]
+STREETS = ["Calle 7", "Calle 12", "Avenida 44", "Diagonal 73", "Calle 50", "Avenida 1"]
+PET_NAMES = [
+    "Roma", "Toby", "Luna", "Simon", "Nina", "Rocky", "Mora", "Felix", "Lola", "Milo",
+    "Kira", "Tango", "Olivia", "Pancho", "Coco", "Frida",
+]
+MEDICINES = [
+    ("Amoxicilina", "Antibiótico de amplio espectro"),
+    ("Meloxicam", "Antiinflamatorio"),
+    ("Ivermectina", "Antiparasitario"),
+    ("Tramadol", "Analgésico"),
+    ("Prednisolona", "Corticoide"),
+    ("Metronidazol", "Antibiótico y antiprotozoario"),
+]
+PRODUCT_TYPES = ["Alimento", "Juguete", "Accesorio", "Higiene", "Medicamento"]
+
+# Fecha desde la que se calculan cumpleaños e historial: fija, para que la
+# misma semilla genere los mismos datos cualquier día que se corra
+REFERENCE_DATE = date(2026, 1, 1)
+
+# Rangos de peso plausibles (kg) por raza
+BREED_WEIGHTS = {
+    Breed.LABRADOR: (25, 36),
+    Breed.BEAGLE: (9, 12),
+    Breed.BULLDOG: (18, 25),
+    Breed.CHIHUAHUA: (1.5, 3),
+    Breed.DOGO_ARGENTINO: (35, 45),
+    Breed.PUG: (6, 9),
+    Breed.POODLE: (3, 30),
+    Breed.ROTTWEILER: (35, 60),
+    Breed.SIAMESE: (3, 5),
+    Breed.PERSIAN: (3, 6),
+    Breed.SPHYNX: (3, 5),
+    Breed.BENGAL: (4, 7),
+}
+
+
+class Command(BaseCommand):
+    """ Esta clase genera datos sintéticos reproducibles para pruebas de carga.
+    Inserta en bloques con bulk_create para poder generar millones de filas.
+    """
+
+    help = "Genera clientes, mascotas, veterinarios, medicamentos, proveedores y productos sintéticos"
+
+    def add_arguments(self, parser):
+        """add_arguments: Define las cantidades a generar y la semilla"""
+        parser.add_argument("--clients", type=int, default=1000)
+        parser.add_argument("--pets", type=int, default=None,
+                            help="Cantidad de mascotas (por defecto 2 por cliente)")
+        parser.add_argument("--vets", type=int, default=50)
+        parser.add_argument("--medicines", type=int, default=200)
+        parser.add_argument("--providers", type=int, default=100)
+        parser.add_argument("--products", type=int, default=None,
+                            help="Cantidad de productos (por defecto 20 por proveedor)")
+        parser.add_argument("--history", type=int, default=2,
+                            help="Medicamentos y veterinarios asociados a cada mascota")
+        parser.add_argument("--records", type=int, default=5,
+                            help="Registros médicos por mascota")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--reference-date", type=date.fromisoformat, default=REFERENCE_DATE,
+                            help="Fecha (YYYY-MM-DD) de la que se restan edades e historial")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        """handle: Genera todas las entidades en orden de dependencias"""
+        self.random = random.Random(options["seed"])
+        self.today = options["reference_date"]
+        self.chunk_size = options["chunk_size"]
+        pets = options["pets"] if options["pets"] is not None else options["clients"] * 2
+        products = (
+            options["products"] if options["products"] is not None
+            else options["providers"] * 20
+        )
+
+        client_ids = self.create(Client, options["clients"], self.build_client)
+        vet_ids = self.create(Vet, options["vets"], self.build_vet)
+        medicine_ids = self.create(Medicine, options["medicines"], self.build_medicine)
+        provider_ids = self.create(Provider, options["providers"], self.build_provider)
+        self.create(
+            Product, products, lambda index: self.build_product(index, provider_ids),
+        )
+        pet_ids = self.create(Pet, pets, lambda index: self.build_pet(index, client_ids))
+
+        self.link(Pet.medicines.through, "medicine_id", pet_ids, medicine_ids, options["history"])
+        self.link(Pet.vets.through, "vet_id", pet_ids, vet_ids, options["history"])
+        self.create_records(pet_ids, vet_ids, medicine_ids, options["records"])
+
+    def create(self, model, count, build):
+        """create: Inserta `count` filas en bloques y retorna sus ids"""
+        ids = []
+        for start in range(0, count, self.chunk_size):
+            rows = [build(index) for index in range(start, min(start + self.chunk_size, count))]
+            with transaction.atomic():
+                created = model.objects.bulk_create(rows, batch_size=self.chunk_size)
+            ids.extend(row.pk for row in created)
+            self.stdout.write(f"{model.__name__}: {len(ids)}/{count}", ending="\r")
+        # bulk_create no envía post_save: se invalidan los listados a mano
+        bump_version(VERSIONED_MODELS[model])
+        self.stdout.write(self.style.SUCCESS(f"{model.__name__}: {len(ids)} creados"))
+        return ids
+
+    def link(self, through, target_field, pet_ids, target_ids, per_pet):
+        """link: Crea las relaciones M2M de cada mascota sin pasar por pet.add()"""
+        if not pet_ids or not target_ids:
+            return
+        per_pet = min(per_pet, len(target_ids))
+        rows = []
+        total = 0
+        for pet_id in pet_ids:
+            for target_id in self.random.sample(target_ids, per_pet):
+                rows.append(through(pet_id=pet_id, **{target_field: target_id}))
+            if len(rows) >= self.chunk_size:
+                total += self.flush(through, rows)
+                rows = []
+        total += self.flush(through, rows)
+        self.stdout.write(self.style.SUCCESS(f"{through.__name__}: {total} creados"))
+
+    def create_records(self, pet_ids, vet_ids, medicine_ids, per_pet):
+        """create_records: Crea el historial médico de cada mascota en los 5 años
+        anteriores a la fecha de referencia
+        """
+        if not pet_ids or not vet_ids or not medicine_ids or per_pet < 1:
+            return
+        now = datetime.combine(self.today, time(), tzinfo=dt_timezone.utc)
+        rows = []
+        total = 0
+        for pet_id in pet_ids:
+            for _ in range(per_pet):
+                rows.append(
+                    MedicalRecord(
+                        pet_id=pet_id,
+                        vet_id=self.random.choice(vet_ids),
+                        medicine_id=self.random.choice(medicine_ids),
+                        dose=self.random.randint(1, 10),
+                        timestamp=now - timedelta(minutes=self.random.randint(0, 5 * 365 * 24 * 60)),
+                    ),
+                )
+            if len(rows) >= self.chunk_size:
+                total += self.flush(MedicalRecord, rows)
+                rows = []
+        total += self.flush(MedicalRecord, rows)
+        self.stdout.write(self.style.SUCCESS(f"MedicalRecord: {total} creados"))
+
+    def flush(self, model, rows):
+        """flush: Inserta un bloque de filas ya construidas"""
+        with transaction.atomic():
+            model.objects.bulk_create(rows, batch_size=self.chunk_size)
+        return len(rows)
+
+    def person_name(self):
+        """person_name: Nombre y apellido válidos para validate_client"""
+        return f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+
+    def phone(self):
+        """phone: Teléfono con el prefijo 54 de Argentina"""
+        return f"54221{self.random.randint(1000000, 9999999)}"
+
+    def build_client(self, index):
+        """build_client: Construye un cliente sin guardarlo"""
+        return Client(
+            name=self.person_name(),
+            phone=self.phone(),
+            email=f"cliente{index}@vetsoft.com",
+            address=f"{self.random.choice(STREETS)} {self.random.randint(1, 2000)}",
+        )
+
+    def build_vet(self, index):
+        """build_vet: Construye un veterinario sin guardarlo"""
+        return Vet(
+            name=self.person_name(),
+            email=f"vet{index}@vetsoft.com",
+            phone=int(self.phone()),
+        )
+
+    def build_medicine(self, index):
+        """build_medicine: Construye un medicamento sin guardarlo"""
+        name, description = self.random.choice(MEDICINES)
+        return Medicine(
+            name=f"{name} {index}",
+            description=description,
+            dose=self.random.randint(1, 10),
+        )
+
+    def build_provider(self, index):
+        """build_provider: Construye un proveedor sin guardarlo"""
+        return Provider(
+            name=f"Distribuidora {self.random.choice(LAST_NAMES)} {index}",
+            email=f"proveedor{index}@proveedores.com",
+            address=f"{self.random.choice(STREETS)} {self.random.randint(1, 2000)}",
+        )
+
+    def build_product(self, index, provider_ids):
+        """build_product: Construye un producto de un proveedor al azar"""
+        product_type = self.random.choice(PRODUCT_TYPES)
+        return Product(
+            name=f"{product_type} {index}",
+            type=product_type,
+            price=round(self.random.uniform(100, 50000), 2),
+            provider_id=self.random.choice(provider_ids) if provider_ids else None,
+        )
+
+    def build_pet(self, index, client_ids):
+        """build_pet: Construye una mascota con raza, edad y peso plausibles"""
+        breed = self.random.choice(Breed.values)
+        low, high = BREED_WEIGHTS[breed]
+        age = timedelta(days=self.random.randint(30, 18 * 365))
+        return Pet(
+            name=self.random.choice(PET_NAMES),
+            breed=breed,
+            birthday=self.today - age,
+            weight=Decimal(str(round(self.random.uniform(low, high), 3))),
+            client_id=self.random.choice(client_ids) if client_ids else None,
+        )
@@ -0,0 +1,156 @@
+#Importaciones de Python
+import os
+import resource
+import time
+
+#Importaciones de Django
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+#Importaciones de terceros
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.instrumentation import wrap_queries
+
+# Con PROMETHEUS_MULTIPROC_DIR definido, prometheus_client guarda los valores
+# de cada proceso en archivos mmap de esa carpeta y /metrics los suma, de modo
+# que una lectura devuelve el total de todos los workers de gunicorn.
+
+REQUESTS = Counter(
+    "vetsoft_requests_total",
+    "Requests atendidas",
+    ["view", "method", "status"],
+)
+ERRORS = Counter(
+    "vetsoft_request_errors_total",
+    "Requests que terminaron con un error del servidor (5xx)",
+    ["view"],
+)
+LATENCY = Histogram(
+    "vetsoft_request_duration_seconds",
+    "Duración de las requests",
+    ["view"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+QUERIES = Histogram(
+    "vetsoft_request_db_queries",
+    "Consultas a la base de datos por request",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 500),
+)
+CACHE_REQUESTS = Counter(
+    "vetsoft_cache_requests_total",
+    "Lecturas de páginas de los listados desde la caché (hit) o la base (miss)",
+    ["entity", "result"],
+)
+MEMORY = Gauge(
+    "vetsoft_process_resident_memory_bytes",
+    "Memoria residente de los procesos que atienden requests",
+    multiprocess_mode="livesum",
+)
+
+# Sin nombre de URL (404) se usa una etiqueta fija para no crear series sin límite
+UNMATCHED = "unmatched"
+
+MEMORY_REFRESH_SECONDS = 5
+_memory_updated_at = 0.0
+
+
+def resident_memory():
+    """resident_memory: Memoria residente del proceso en bytes"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Fuera de Linux se usa el pico, que getrusage informa en KB
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def refresh_memory():
+    """refresh_memory: Actualiza el gauge de memoria cada MEMORY_REFRESH_SECONDS"""
+    global _memory_updated_at
+    now = time.monotonic()
+    if now - _memory_updated_at >= MEMORY_REFRESH_SECONDS:
+        _memory_updated_at = now
+        MEMORY.set(resident_memory())
+
+
+class QueryCounter:
+    """ Esta clase cuenta las consultas ejecutadas (wrapper de execute_wrapper)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """__call__: Cuenta la consulta y la ejecuta"""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """ Esta clase registra cantidad, duración, consultas y errores de cada
+    request, etiquetados por nombre de URL (clients_repo, pets_form_history, ...).
+    Solo actualiza contadores en memoria o mmap, sin E/S por request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """__call__: Mide la request y actualiza las métricas"""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with wrap_queries(counter):
+            response = self.get_response(request)
+        return self.observe(request, response, counter, start)
+
+    async def __acall__(self, request):
+        """__acall__: Igual que __call__ para la cadena de middlewares async"""
+        counter = QueryCounter()
+        start = time.perf_counter()
+        queries = await sync_to_async(wrap_queries)(counter)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(queries.close)()
+        return self.observe(request, response, counter, start)
+
+    def observe(self, request, response, counter, start):
+        """observe: Actualiza las métricas con el resultado de la request"""
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = match.url_name if match and match.url_name else UNMATCHED
+        REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+        LATENCY.labels(view).observe(elapsed)
+        QUERIES.labels(view).observe(counter.count)
+        if response.status_code >= 500:
+            ERRORS.labels(view).inc()
+        refresh_memory()
+        return response
+
+
+def render_metrics():
+    """render_metrics: Retorna (contenido, content type) de las métricas de Prometheus"""
+    refresh_memory()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,133 @@
+#Importaciones de Python
+import logging
+import time
+
+#Importaciones de Django
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from app.instrumentation import start_request_stats, stop_request_stats, wrap_queries
+from app.routers import PIN_COOKIE, is_pinned, start_routing, stop_routing
+
+logger = logging.getLogger("vetsoft.performance")
+
+
+class ServerTimingMiddleware:
+    """ Esta clase mide cada request (consultas, tiempo en la base de datos,
+    renderizado de templates y vista) y lo publica en el header Server-Timing.
+    Las requests más lentas que VETSOFT_SLOW_REQUEST_MS se registran en el log
+    "vetsoft.performance" junto con sus consultas más lentas.
+    Debe ir al final de MIDDLEWARE para que el tiempo de vista no incluya
+    a los demás middlewares.
+    Funciona tanto con vistas sync (WSGI) como async (ASGI).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """__call__: Mide la request y agrega el header Server-Timing"""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = start_request_stats()
+        start = time.perf_counter()
+        try:
+            with wrap_queries(stats):
+                response = self.get_response(request)
+        finally:
+            stop_request_stats(token)
+        return self.finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        """__acall__: Igual que __call__ para la cadena de middlewares async"""
+        stats, token = start_request_stats()
+        start = time.perf_counter()
+        try:
+            # Las consultas corren en el thread de sync_to_async de la request
+            queries = await sync_to_async(wrap_queries)(stats)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(queries.close)()
+        finally:
+            stop_request_stats(token)
+        return self.finish(request, response, stats, start)
+
+    def finish(self, request, response, stats, start):
+        """finish: Agrega el header Server-Timing y registra la request si fue lenta"""
+        view_ms = (time.perf_counter() - start) * 1000
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={stats.db_ms:.2f};desc="{stats.query_count} consultas"',
+                f"tpl;dur={stats.template_ms:.2f}",
+                f"view;dur={view_ms:.2f}",
+            ],
+        )
+
+        if view_ms >= settings.VETSOFT_SLOW_REQUEST_MS:
+            self.log_slow_request(request, response, stats, view_ms)
+        return response
+
+    def log_slow_request(self, request, response, stats, view_ms):
+        """log_slow_request: Registra una request lenta con sus consultas más lentas"""
+        lines = [
+            f"{request.method} {request.path} {response.status_code} "
+            f"{view_ms:.1f}ms (db {stats.db_ms:.1f}ms en {stats.query_count} consultas, "
+            f"templates {stats.template_ms:.1f}ms)",
+        ]
+        for sql, elapsed in stats.slowest_queries(settings.VETSOFT_SLOW_QUERIES_LOGGED):
+            lines.append(f"  {elapsed:8.2f}ms  {sql}")
+        logger.warning("\n".join(lines))
+
+
+class ReplicaPinMiddleware:
+    """ Esta clase activa el ruteo a réplicas (app.routers) durante la request.
+    Si la request escribió en la primaria, deja una cookie para que las
+    siguientes del mismo navegador lean de la primaria durante
+    VETSOFT_REPLICA_PIN_SECONDS (read-your-writes).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """__call__: Rutea la request y fija la primaria después de escribir"""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = start_routing(pinned=is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_routing(token)
+        return self.pin(state, response)
+
+    async def __acall__(self, request):
+        """__acall__: Igual que __call__ para la cadena de middlewares async"""
+        # sync_to_async copia el contexto, así que el router ve el mismo estado
+        state, token = start_routing(pinned=is_pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_routing(token)
+        return self.pin(state, response)
+
+    def pin(self, state, response):
+        """pin: Deja la cookie de la primaria si la request escribió"""
+        if state.wrote:
+            seconds = settings.VETSOFT_REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE, f"{time.time() + seconds:.3f}",
+                max_age=seconds, httponly=True, samesite="Lax",
+            )
+        return response
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_alter_provider_address'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pet',
+            name='breed',
+            field=models.CharField(choices=[('labrador', 'Labrador'), ('beagle', 'Beagle'), ('bulldog', 'Bulldog'), ('chihuahua', 'Chihuahua'), ('dogo_argentino', 'Dogo Argentino'), ('pug', 'Pug'), ('poodle', 'Poodle'), ('rottweiler', 'Rottweiler'), ('siamese', 'Siamés'), ('persian', 'Persa'), ('sphynx', 'Sphynx'), ('bengal', 'Bengalí')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='pet',
+            name='weight',
+            field=models.DecimalField(decimal_places=3, max_digits=8),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['name', 'id'], name='client_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicine',
+            index=models.Index(fields=['name', 'id'], name='medicine_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['name', 'id'], name='pet_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name', 'id'], name='product_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='provider',
+            index=models.Index(fields=['name', 'id'], name='provider_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(fields=['name', 'id'], name='vet_name_id_idx'),
+        ),
+    ]
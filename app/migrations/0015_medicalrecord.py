@@ -0,0 +1,82 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:55
+
+from collections import defaultdict
+from itertools import zip_longest
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+BACKFILL_CHUNK = 1000
+BACKFILL_NOTE = "Migrado del historial anterior (sin fecha de atención)"
+
+
+def backfill_medical_records(apps, schema_editor):
+    """Crea un registro por cada par medicamento/veterinario de las tablas M2M.
+    Las tablas no guardan qué veterinario indicó qué medicamento, así que se
+    emparejan en el orden en que se agregaron."""
+    Pet = apps.get_model("app", "Pet")
+    MedicalRecord = apps.get_model("app", "MedicalRecord")
+    PetMedicines = Pet.medicines.through
+    PetVets = Pet.vets.through
+    db = schema_editor.connection.alias
+    now = django.utils.timezone.now()
+
+    pet_ids = list(
+        PetMedicines.objects.using(db).values_list("pet_id", flat=True)
+        .union(PetVets.objects.using(db).values_list("pet_id", flat=True)),
+    )
+    pet_ids.sort()
+
+    for start in range(0, len(pet_ids), BACKFILL_CHUNK):
+        chunk = pet_ids[start:start + BACKFILL_CHUNK]
+        medicines = defaultdict(list)
+        for pet_id, medicine_id, dose in (
+            PetMedicines.objects.using(db).filter(pet_id__in=chunk)
+            .order_by("id").values_list("pet_id", "medicine_id", "medicine__dose")
+        ):
+            medicines[pet_id].append((medicine_id, dose))
+        vets = defaultdict(list)
+        for pet_id, vet_id in (
+            PetVets.objects.using(db).filter(pet_id__in=chunk)
+            .order_by("id").values_list("pet_id", "vet_id")
+        ):
+            vets[pet_id].append(vet_id)
+
+        records = []
+        for pet_id in chunk:
+            for medicine, vet_id in zip_longest(medicines[pet_id], vets[pet_id]):
+                medicine_id, dose = medicine or (None, None)
+                records.append(
+                    MedicalRecord(
+                        pet_id=pet_id, vet_id=vet_id, medicine_id=medicine_id,
+                        dose=dose, timestamp=now, notes=BACKFILL_NOTE,
+                    ),
+                )
+        MedicalRecord.objects.using(db).bulk_create(records)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0014_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicalRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dose', models.IntegerField(blank=True, null=True)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now)),
+                ('notes', models.TextField(blank=True)),
+                ('medicine', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='app.medicine')),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='medical_records', to='app.pet')),
+                ('vet', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='app.vet')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['pet', 'timestamp', 'id'], name='record_pet_timestamp_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_medical_records, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-18 18:59
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0015_medicalrecord'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(django.db.models.functions.text.Lower('name'), models.F('id'), name='client_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.F('id'), name='client_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['phone', 'id'], name='client_phone_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='provider',
+            index=models.Index(django.db.models.functions.text.Lower('name'), models.F('id'), name='provider_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='provider',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.F('id'), name='provider_email_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.0.4 on 2026-10-18 21:10
+
+from django.db import migrations
+
+# El SQL del índice está copiado tal como era en esta migración: app.search
+# cambia después (0019, 0020) y la migración tiene que seguir creando esto
+SEARCH_TABLE = "app_search"
+
+ROWID_FACTOR = 8
+
+# (tabla, entidad, código de la entidad en el rowid, columnas del detalle)
+SEARCH_SOURCES = [
+    ("app_client", "clients", 1, ["email", "phone", "address"]),
+    ("app_medicine", "medicines", 2, ["description"]),
+    ("app_pet", "pets", 3, ["breed"]),
+    ("app_product", "products", 4, ["type"]),
+    ("app_provider", "providers", 5, ["email", "address"]),
+    ("app_vet", "vets", 6, ["email", "phone"]),
+]
+
+
+def row_sql(prefix, entity, code, detail):
+    columns = " || ' ' || ".join(f"coalesce({prefix}.{column}, '')" for column in detail)
+    return f"{prefix}.id * {ROWID_FACTOR} + {code}, '{entity}', {prefix}.id, {prefix}.name, {columns}"
+
+
+def create_search_index(apps, schema_editor):
+    """Crea la tabla FTS5 de la búsqueda global (solo en SQLite) y la llena"""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    insert = f"INSERT INTO {SEARCH_TABLE}(rowid, entity, object_id, name, detail)"
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+        "entity UNINDEXED, object_id UNINDEXED, name, detail, "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    )
+    for table, entity, code, detail in SEARCH_SOURCES:
+        trigger = f"{SEARCH_TABLE}_{entity}"
+        delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * {ROWID_FACTOR} + {code}"
+        new_row = row_sql("new", entity, code, detail)
+        schema_editor.execute(f"{insert} SELECT {row_sql(table, entity, code, detail)} FROM {table}")
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger}_insert AFTER INSERT ON {table} BEGIN "
+            f"{insert} VALUES ({new_row}); END",
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger}_update AFTER UPDATE ON {table} BEGIN "
+            f"{delete}; {insert} VALUES ({new_row}); END",
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger}_delete AFTER DELETE ON {table} BEGIN "
+            f"{delete}; END",
+        )
+    schema_editor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for _, entity, _, _ in SEARCH_SOURCES:
+        for action in ("insert", "update", "delete"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{entity}_{action}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0016_autocomplete_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
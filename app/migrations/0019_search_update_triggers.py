@@ -0,0 +1,55 @@
+# Generated by Django 5.0.4 on 2026-10-18 23:40
+
+from django.db import migrations
+
+# SQL de los triggers tal como era en esta migración (ver 0017_search_index)
+SEARCH_TABLE = "app_search"
+
+ROWID_FACTOR = 8
+
+# (tabla, entidad, código de la entidad en el rowid, columnas del detalle)
+SEARCH_SOURCES = [
+    ("app_client", "clients", 1, ["email", "phone", "address"]),
+    ("app_medicine", "medicines", 2, ["description"]),
+    ("app_pet", "pets", 3, ["breed"]),
+    ("app_product", "products", 4, ["type"]),
+    ("app_provider", "providers", 5, ["email", "address"]),
+    ("app_vet", "vets", 6, ["email", "phone"]),
+]
+
+
+def update_triggers(schema_editor, only_indexed_columns):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    insert = f"INSERT INTO {SEARCH_TABLE}(rowid, entity, object_id, name, detail)"
+    for table, entity, code, detail in SEARCH_SOURCES:
+        trigger = f"{SEARCH_TABLE}_{entity}_update"
+        delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * {ROWID_FACTOR} + {code}"
+        columns = " || ' ' || ".join(f"coalesce(new.{column}, '')" for column in detail)
+        new_row = f"new.id * {ROWID_FACTOR} + {code}, '{entity}', new.id, new.name, {columns}"
+        update_of = f" OF {', '.join(['name', *detail])}" if only_indexed_columns else ""
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger} AFTER UPDATE{update_of} ON {table} BEGIN "
+            f"{delete}; {insert} VALUES ({new_row}); END",
+        )
+
+
+def recreate_triggers(apps, schema_editor):
+    """Los triggers de UPDATE pasan a dispararse solo con las columnas indexadas"""
+    update_triggers(schema_editor, only_indexed_columns=True)
+
+
+def restore_triggers(apps, schema_editor):
+    update_triggers(schema_editor, only_indexed_columns=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0018_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(recreate_triggers, restore_triggers),
+    ]
@@ -0,0 +1,204 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:37
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# SQL de los triggers tal como era en esta migración (ver 0017_search_index)
+SEARCH_TABLE = "app_search"
+
+ROWID_FACTOR = 8
+
+# (tabla, entidad, código de la entidad en el rowid, columnas del detalle)
+SEARCH_SOURCES = [
+    ("app_client", "clients", 1, ["email", "phone", "address"]),
+    ("app_medicine", "medicines", 2, ["description"]),
+    ("app_pet", "pets", 3, ["breed"]),
+    ("app_product", "products", 4, ["type"]),
+    ("app_provider", "providers", 5, ["email", "address"]),
+    ("app_vet", "vets", 6, ["email", "phone"]),
+]
+
+
+def write_triggers(schema_editor, soft_delete):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    insert = f"INSERT INTO {SEARCH_TABLE}(rowid, entity, object_id, name, detail)"
+    for table, entity, code, detail in SEARCH_SOURCES:
+        trigger = f"{SEARCH_TABLE}_{entity}"
+        delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * {ROWID_FACTOR} + {code}"
+        values = " || ' ' || ".join(f"coalesce(new.{column}, '')" for column in detail)
+        new_row = f"new.id * {ROWID_FACTOR} + {code}, '{entity}', new.id, new.name, {values}"
+        columns = ", ".join(["name", *detail, *(["deleted_at"] if soft_delete else [])])
+        live = " WHERE new.deleted_at IS NULL" if soft_delete else ""
+        for action in ("insert", "update"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {trigger}_{action}")
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger}_insert AFTER INSERT ON {table} BEGIN "
+            f"{insert} SELECT {new_row}{live}; END",
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {trigger}_update AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"{delete}; {insert} SELECT {new_row}{live}; END",
+        )
+
+
+def recreate_triggers(apps, schema_editor):
+    """Los triggers de la búsqueda dejan afuera las filas con deleted_at"""
+    write_triggers(schema_editor, soft_delete=True)
+
+
+def restore_triggers(apps, schema_editor):
+    write_triggers(schema_editor, soft_delete=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0019_search_update_triggers'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_name_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_name_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_email_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_phone_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='medicine',
+            name='medicine_name_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='pet',
+            name='pet_name_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_name_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='provider',
+            name='provider_name_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='provider',
+            name='provider_name_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='provider',
+            name='provider_email_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='vet',
+            name='vet_name_id_idx',
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='medicine',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pet',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='provider',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='vet',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name', 'id'], name='client_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(django.db.models.functions.text.Lower('name'), models.F('id'), condition=models.Q(('deleted_at__isnull', True)), name='client_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.F('id'), condition=models.Q(('deleted_at__isnull', True)), name='client_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['phone', 'id'], name='client_phone_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='client_deleted_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicine',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name', 'id'], name='medicine_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicine',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='medicine_deleted_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name', 'id'], name='pet_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='pet_deleted_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name', 'id'], name='product_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='product_deleted_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='provider',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name', 'id'], name='provider_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='provider',
+            index=models.Index(django.db.models.functions.text.Lower('name'), models.F('id'), condition=models.Q(('deleted_at__isnull', True)), name='provider_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='provider',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.F('id'), condition=models.Q(('deleted_at__isnull', True)), name='provider_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='provider',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='provider_deleted_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['name', 'id'], name='vet_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='vet_deleted_at_idx'),
+        ),
+        migrations.RunPython(recreate_triggers, restore_triggers),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-18 19:45
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0020_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['email'], name='client_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['breed', 'name', 'id'], name='pet_breed_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['client', 'name', 'id'], name='pet_client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(django.db.models.functions.text.Lower('type'), models.F('name'), models.F('id'), condition=models.Q(('deleted_at__isnull', True)), name='product_type_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['provider', 'name', 'id'], name='product_provider_name_idx'),
+        ),
+    ]
@@ -2,10 +2,65 @@
 
 import re
 from datetime import date
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
 #Importaciones de Django
 from django.db import models
+from django.db.models import Lookup
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+
+class VetsoftQuerySet(models.QuerySet):
+    """ Esta clase agrupa las consultas que usa cada vista, de modo que cada
+    listado traiga solo las columnas y relaciones que lee su template.
+    Contiene los siguientes métodos:
+    - for_repository: consulta del listado (repository.html)
+    - for_choices: consulta de los <select> de los formularios (id y nombre)
+    """
+
+    def for_repository(self):
+        """for_repository: Consulta del listado de la entidad"""
+        return self.all()
+
+    def for_choices(self):
+        """for_choices: Solo id y nombre, para las opciones de un <select>"""
+        return self.only("id", "name").order_by("name", "id")
+
+
+# Borrado lógico: borrar una fila solo completa deleted_at y purge_vetsoft la
+# borra de verdad más tarde. `objects` excluye las filas borradas y los índices
+# de los listados son parciales (solo las filas vigentes); `all_objects` las
+# incluye a todas.
+LIVE = models.Q(deleted_at__isnull=True)
+
+DELETED = models.Q(deleted_at__isnull=False)
+
+
+@models.CharField.register_lookup
+class LowerExact(Lookup):
+    """ Esta clase es el lookup `lexact`: igualdad sin distinguir mayúsculas
+    comparando lower() de los dos lados, así puede usar un índice sobre
+    Lower(campo). iexact en SQLite es un LIKE, que no usa índices.
+    """
+
+    lookup_name = "lexact"
+
+    def as_sql(self, compiler, connection):
+        """as_sql: LOWER(campo) = LOWER(valor)"""
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"LOWER({lhs}) = LOWER({rhs})", [*lhs_params, *rhs_params]
+
+
+class LiveManager(models.Manager):
+    """ Esta clase es el manager `objects` de los modelos con borrado lógico:
+    excluye las filas borradas
+    """
+
+    def get_queryset(self):
+        """get_queryset: Solo las filas sin deleted_at"""
+        return super().get_queryset().filter(LIVE)
 
 
 ##---------clients----------   
@@ -50,6 +105,8 @@ class Client(models.Model):
     - phone: teléfono del cliente
     - email: email del cliente
     - address: dirección del cliente
+    - updated_at: fecha y hora de la última modificación
+    - deleted_at: fecha y hora del borrado lógico (None si está vigente)
     Contiene los siguientes métodos:
     - __str__: retorna el nombre del cliente
     - save_client: guarda un cliente en la base de datos
@@ -59,6 +116,25 @@ class Client(models.Model):
     phone = models.CharField(max_length=15)
     email = models.EmailField()
     address = models.CharField(max_length=100, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager.from_queryset(VetsoftQuerySet)()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Orden de la paginación por cursor de los listados
+            models.Index(fields=["name", "id"], name="client_name_id_idx", condition=LIVE),
+            # Búsqueda por prefijo del selector de clientes (app.autocomplete)
+            models.Index(Lower("name"), "id", name="client_name_lower_idx", condition=LIVE),
+            models.Index(Lower("email"), "id", name="client_email_lower_idx", condition=LIVE),
+            models.Index(fields=["phone", "id"], name="client_phone_id_idx", condition=LIVE),
+            # Dueño de las mascotas importadas por email (app.importers)
+            models.Index(fields=["email"], name="client_email_idx", condition=LIVE),
+            # Filas borradas para purge_vetsoft
+            models.Index(fields=["deleted_at"], name="client_deleted_at_idx", condition=DELETED),
+        ]
 
     def __str__(self):
         return self.name
@@ -69,16 +145,16 @@ class Client(models.Model):
         errors = validate_client(client_data)
 
         if len(errors.keys()) > 0:
-            return False, errors
+            return None, errors
 
-        Client.objects.create(
+        client = Client.objects.create(
             name=client_data.get("name"),
             phone=client_data.get("phone"),
             email=client_data.get("email"),
             address=client_data.get("address"),
         )
 
-        return True, None
+        return client, None
 
     def update_client(self, client_data):
         """"update_client: Método para actualizar un cliente en la base de datos"""
@@ -130,6 +206,8 @@ class Medicine(models.Model):
     - name: nombre del medicamento
     - description: descripción del medicamento
     - dose: dosis del medicamento
+    - updated_at: fecha y hora de la última modificación
+    - deleted_at: fecha y hora del borrado lógico (None si está vigente)
     Contiene los siguientes métodos:
     - __str__: retorna el nombre del medicamento
     - save_medicine: guarda un medicamento en la base de datos
@@ -138,6 +216,19 @@ class Medicine(models.Model):
     name = models.CharField(max_length=30)
     description = models.CharField(max_length=50)
     dose = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager.from_queryset(VetsoftQuerySet)()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Orden de la paginación por cursor de los listados
+            models.Index(fields=["name", "id"], name="medicine_name_id_idx", condition=LIVE),
+            # Filas borradas para purge_vetsoft
+            models.Index(fields=["deleted_at"], name="medicine_deleted_at_idx", condition=DELETED),
+        ]
 
     def __str__(self):
         return self.name
@@ -148,15 +239,15 @@ class Medicine(models.Model):
         errors = validate_medicine(medicine_data)
 
         if len(errors.keys()) > 0:
-            return False, errors
+            return None, errors
 
-        Medicine.objects.create(
+        medicine = Medicine.objects.create(
             name=medicine_data.get("name"),
             description=medicine_data.get("description"),
             dose=medicine_data.get("dose"),
         )
 
-        return True, None
+        return medicine, None
     def update_medicine(self, medicine_data):
         """def update_medicine: Método para actualizar un medicamento en la base de datos"""
         errors = validate_medicine(medicine_data)
@@ -172,6 +263,17 @@ class Medicine(models.Model):
     
         return True, None
 
+def validate_related(data, field, model, message):
+    """validate_related: Valida la relación opcional `field`: si viene, tiene que
+    ser el id de una fila vigente (sin borrado lógico) de `model`
+    """
+    value = str(data.get(field, "") or "")
+    if value == "":
+        return {}
+    if not value.isdigit() or not model.objects.filter(id=value).exists():
+        return {field: message}
+    return {}
+
  ##---------pets----------   
 
 ##---------pets----------   
@@ -207,7 +309,7 @@ def validate_pet(data):
             decimal_weight = Decimal(weight)
             if decimal_weight <= 0:
                 errors["weight"] = "El peso debe ser un número mayor a cero"
-        except ValueError:
+        except (ValueError, TypeError, InvalidOperation):
             errors["weight"] = "El peso debe ser un número válido"
 
     return errors
@@ -233,6 +335,23 @@ class Breed(models.TextChoices):
     SPHYNX = 'sphynx', 'Sphynx'
     BENGAL = 'bengal', 'Bengalí'
 
+class PetQuerySet(VetsoftQuerySet):
+    """ Esta clase contiene las consultas de mascotas de cada vista
+    Contiene los siguientes métodos:
+    - for_repository: mascotas con el nombre del dueño en la misma consulta
+    - for_history: mascota para el encabezado de su historial médico
+    """
+
+    def for_repository(self):
+        """for_repository: Trae el dueño con un JOIN en lugar de una consulta por fila"""
+        return self.select_related("client").only(
+            "id", "name", "breed", "birthday", "weight", "client__id", "client__name",
+        )
+
+    def for_history(self):
+        """for_history: Solo lo que muestra el encabezado del historial"""
+        return self.only("id", "name")
+
 class Pet(models.Model):
     """ Esta clase representa una mascota de la veterinaria
     Contiene los siguientes atributos:
@@ -243,9 +362,11 @@ class Pet(models.Model):
     - client: dueño de la mascota
     - medicines: medicamentos que toma la mascota
     - vets: veterinarios que atienden a la mascota
+    - updated_at: fecha y hora de la última modificación
+    - deleted_at: fecha y hora del borrado lógico (None si está vigente)
     Contiene los siguientes métodos:
     - __str__: retorna el nombre de la mascota
-    - save_pet: guarda una mascota en la base de datos
+    - save_pet: guarda una mascota y su dueño en la base de datos
     - update_pet: actualiza los datos de una mascota en la base de datos
     """
     name = models.CharField(max_length=100)
@@ -255,6 +376,22 @@ class Pet(models.Model):
     client = models.ForeignKey("Client", on_delete=models.CASCADE, null=True, blank=True)
     medicines = models.ManyToManyField(Medicine)
     vets = models.ManyToManyField("Vet", blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager.from_queryset(PetQuerySet)()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Orden de la paginación por cursor de los listados
+            models.Index(fields=["name", "id"], name="pet_name_id_idx", condition=LIVE),
+            # Filtros del listado (app.filters), en el mismo orden
+            models.Index(fields=["breed", "name", "id"], name="pet_breed_name_idx", condition=LIVE),
+            models.Index(fields=["client", "name", "id"], name="pet_client_name_idx", condition=LIVE),
+            # Filas borradas para purge_vetsoft
+            models.Index(fields=["deleted_at"], name="pet_deleted_at_idx", condition=DELETED),
+        ]
 
     def __str__(self):
         """def __str__: Método para retornar el nombre de la mascota"""
@@ -262,34 +399,40 @@ class Pet(models.Model):
     
     @classmethod
     def save_pet(cls, pet_data):
-        """def save_pet: Método para guardar una mascota en la base de datos"""
+        """def save_pet: Método para guardar una mascota (con su dueño, el campo
+        client) en la base de datos. Retorna (mascota, None) o (None, errores)
+        """
         errors = validate_pet(pet_data)
+        errors.update(validate_related(pet_data, "client", Client, "El cliente seleccionado no existe"))
 
         if len(errors.keys()) > 0:
-            return False, errors
+            return None, errors
 
-        Pet.objects.create(
+        pet = Pet.objects.create(
             name=pet_data.get("name"),
             breed=pet_data.get("breed"),
             birthday=pet_data.get("birthday"),
             weight=pet_data.get("weight"),
+            client_id=pet_data.get("client") or None,
         )
 
-        return True, None
+        return pet, None
     
     def update_pet(self, pet_data):
         """def update_pet: Método para actualizar una mascota en la base de datos"""
         # Validar los datos
         errors = validate_pet(pet_data)
+        errors.update(validate_related(pet_data, "client", Client, "El cliente seleccionado no existe"))
         
         if len(errors.keys()) > 0:
             return False, errors
         
-        # Actualizar los datos de la mascota
+        # Actualizar los datos de la mascota; sin dueño elegido se mantiene el actual
         self.name = pet_data.get("name", "") or self.name
         self.breed = pet_data.get("breed", "") or self.breed
         self.birthday = pet_data.get("birthday", "") or self.birthday
         self.weight = pet_data.get("weight", "") or self.weight
+        self.client_id = pet_data.get("client", "") or self.client_id
         self.save()
 
         return True, None
@@ -321,6 +464,18 @@ def validate_product(data):
             errors["price"] = "El precio debe ser un número válido"
     return errors
 
+class ProductQuerySet(VetsoftQuerySet):
+    """ Esta clase contiene las consultas de productos de cada vista
+    Contiene los siguientes métodos:
+    - for_repository: productos con el nombre del proveedor en la misma consulta
+    """
+
+    def for_repository(self):
+        """for_repository: Trae el proveedor con un JOIN en lugar de una consulta por fila"""
+        return self.select_related("provider").only(
+            "id", "name", "type", "price", "provider__id", "provider__name",
+        )
+
 class Product(models.Model):
     """ Esta clase representa un producto de la veterinaria
     Contiene los siguientes atributos:
@@ -328,15 +483,33 @@ class Product(models.Model):
     - type: tipo del producto
     - price: precio del producto
     - provider: proveedor del producto
+    - updated_at: fecha y hora de la última modificación
+    - deleted_at: fecha y hora del borrado lógico (None si está vigente)
     Contiene los siguientes métodos:
     - __str__: retorna el nombre del producto
-    - save_product: guarda un producto en la base de datos
+    - save_product: guarda un producto y su proveedor en la base de datos
     - update_product: actualiza los datos de un producto en la base de datos
     """
     name = models.CharField(max_length=50)
     type = models.CharField(max_length=50)
     price = models.FloatField()
     provider = models.ForeignKey("Provider", on_delete=models.CASCADE, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager.from_queryset(ProductQuerySet)()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Orden de la paginación por cursor de los listados
+            models.Index(fields=["name", "id"], name="product_name_id_idx", condition=LIVE),
+            # Filtros del listado (app.filters), en el mismo orden
+            models.Index(Lower("type"), "name", "id", name="product_type_name_idx", condition=LIVE),
+            models.Index(fields=["provider", "name", "id"], name="product_provider_name_idx", condition=LIVE),
+            # Filas borradas para purge_vetsoft
+            models.Index(fields=["deleted_at"], name="product_deleted_at_idx", condition=DELETED),
+        ]
 
     def __str__(self):
         """def __str__: Método para retornar el nombre del producto"""
@@ -344,30 +517,37 @@ class Product(models.Model):
     
     @classmethod
     def save_product(cls, product_data):
-        """def save_product: Método para guardar un producto en la base de datos"""
+        """def save_product: Método para guardar un producto (con su proveedor, el
+        campo provider) en la base de datos. Retorna (producto, None) o (None, errores)
+        """
         errors = validate_product(product_data)
+        errors.update(validate_related(product_data, "provider", Provider, "El proveedor seleccionado no existe"))
 
         if len(errors.keys()) > 0:
-            return False, errors
+            return None, errors
 
-        Product.objects.create(
+        product = Product.objects.create(
             name=product_data.get("name"),
             type=product_data.get("type"),
             price=product_data.get("price"),
+            provider_id=product_data.get("provider") or None,
         )
 
-        return True, None
+        return product, None
     
     def update_product(self, product_data):
         """def update_product: Método para actualizar un producto en la base de datos"""
         errors = validate_product(product_data)
+        errors.update(validate_related(product_data, "provider", Provider, "El proveedor seleccionado no existe"))
 
         if len(errors.keys()) > 0:
             return False, errors
         
+        # Sin proveedor elegido se mantiene el actual
         self.name = product_data.get("name", "") or self.name
         self.type = product_data.get("type", "") or self.type
         self.price = product_data.get("price", "") or self.price
+        self.provider_id = product_data.get("provider", "") or self.provider_id
         self.save()
 
         return True, None
@@ -401,6 +581,8 @@ class Provider(models.Model):
     - name: nombre del proveedor
     - email: email del proveedor
     - address: dirección del proveedor
+    - updated_at: fecha y hora de la última modificación
+    - deleted_at: fecha y hora del borrado lógico (None si está vigente)
     Contiene los siguientes métodos:
     - __str__: retorna el nombre del proveedor
     - save_provider: guarda un proveedor en la base de datos
@@ -409,6 +591,22 @@ class Provider(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField(max_length=254)
     address = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager.from_queryset(VetsoftQuerySet)()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Orden de la paginación por cursor de los listados
+            models.Index(fields=["name", "id"], name="provider_name_id_idx", condition=LIVE),
+            # Búsqueda por prefijo del selector de proveedores (app.autocomplete)
+            models.Index(Lower("name"), "id", name="provider_name_lower_idx", condition=LIVE),
+            models.Index(Lower("email"), "id", name="provider_email_lower_idx", condition=LIVE),
+            # Filas borradas para purge_vetsoft
+            models.Index(fields=["deleted_at"], name="provider_deleted_at_idx", condition=DELETED),
+        ]
 
     def __str__(self):
         return self.name
@@ -419,15 +617,15 @@ class Provider(models.Model):
         errors = validate_provider(provider_data)
 
         if len(errors.keys()) > 0:
-            return False, errors
+            return None, errors
 
-        Provider.objects.create(
+        provider = Provider.objects.create(
             name=provider_data.get("name"),
             email=provider_data.get("email"),
             address=provider_data.get("address"),
         )
 
-        return True, None
+        return provider, None
 
     def update_provider(self, provider_data):
         """update_provider: Método para actualizar un proveedor en la base de datos"""
@@ -477,6 +675,8 @@ class Vet(models.Model):
     - name: nombre del veterinario
     - email: email del veterinario
     - phone: teléfono del veterinario
+    - updated_at: fecha y hora de la última modificación
+    - deleted_at: fecha y hora del borrado lógico (None si está vigente)
     Contiene los siguientes métodos:
     - __str__: retorna el nombre del veterinario
     - save_vet: guarda un veterinario en la base de datos
@@ -485,6 +685,19 @@ class Vet(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField(max_length=254)
     phone = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveManager.from_queryset(VetsoftQuerySet)()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            # Orden de la paginación por cursor de los listados
+            models.Index(fields=["name", "id"], name="vet_name_id_idx", condition=LIVE),
+            # Filas borradas para purge_vetsoft
+            models.Index(fields=["deleted_at"], name="vet_deleted_at_idx", condition=DELETED),
+        ]
 
     def __str__(self):
         return self.name
@@ -495,15 +708,15 @@ class Vet(models.Model):
         errors = validate_vet(vet_data)
 
         if len(errors.keys()) > 0:
-            return False, errors
+            return None, errors
 
-        Vet.objects.create(
+        vet = Vet.objects.create(
             name=vet_data.get("name"),
             email=vet_data.get("email"),
             phone=vet_data.get("phone"),
         )
 
-        return True, None
+        return vet, None
 
     def update_vet(self, vet_data):
         """def update_vet: Método para actualizar un veterinario en la base"""
@@ -521,5 +734,87 @@ class Vet(models.Model):
         return True, None
 
 
+##---------medical records----------
+def validate_medical_record(data):
+    """validate_medical_record: Método para validar los datos de un registro médico"""
+    errors = {}
+
+    vet = data.get("vet", "")
+    medicine = data.get("medicines", "")
+    dose = data.get("dose", "")
+
+    if vet == "":
+        errors["vet"] = "Por favor seleccione un veterinario"
+    elif not str(vet).isdigit() or not Vet.objects.filter(pk=vet).exists():
+        errors["vet"] = "El veterinario seleccionado no existe"
+
+    if medicine == "":
+        errors["medicines"] = "Por favor seleccione un medicamento"
+    elif not str(medicine).isdigit() or not Medicine.objects.filter(pk=medicine).exists():
+        errors["medicines"] = "El medicamento seleccionado no existe"
+
+    if dose != "":
+        try:
+            int_dose = int(dose)
+            if int_dose < 1 or int_dose > 10:
+                errors["dose"] = "La dosis debe estar en un rango de 1 a 10"
+        except ValueError:
+            errors["dose"] = "La dosis debe ser un número entero válido"
+
+    return errors
+
+class MedicalRecord(models.Model):
+    """ Esta clase representa una entrada del historial médico de una mascota.
+    El historial es de solo agregado: los registros no se editan.
+    Contiene los siguientes atributos:
+    - pet: mascota atendida
+    - vet: veterinario que la atendió
+    - medicine: medicamento indicado
+    - dose: dosis indicada
+    - timestamp: fecha y hora de la atención
+    - notes: observaciones
+    Contiene los siguientes métodos:
+    - save_record: agrega un registro al historial de una mascota
+    """
+    pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name="medical_records")
+    vet = models.ForeignKey(Vet, on_delete=models.SET_NULL, null=True, blank=True)
+    medicine = models.ForeignKey(Medicine, on_delete=models.SET_NULL, null=True, blank=True)
+    dose = models.IntegerField(null=True, blank=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # Historial de una mascota, del más nuevo al más viejo
+            models.Index(fields=["pet", "timestamp", "id"], name="record_pet_timestamp_idx"),
+        ]
+
+    def __str__(self):
+        """def __str__: Método para retornar la mascota y la fecha del registro"""
+        return f"{self.pet_id} - {self.timestamp:%Y-%m-%d %H:%M}"
+
+    def save(self, *args, **kwargs):
+        """def save: Solo permite crear registros, no modificarlos"""
+        if not self._state.adding:
+            raise ValueError("Los registros médicos no se pueden modificar")
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def save_record(cls, pet, record_data):
+        """def save_record: Método para agregar un registro al historial de una mascota"""
+        errors = validate_medical_record(record_data)
+
+        if len(errors.keys()) > 0:
+            return None, errors
+
+        dose = record_data.get("dose", "")
+        record = MedicalRecord.objects.create(
+            pet=pet,
+            vet_id=record_data.get("vet"),
+            medicine_id=record_data.get("medicines"),
+            dose=int(dose) if dose != "" else None,
+            notes=record_data.get("notes", ""),
+        )
+
+        return record, None
 
-    
\ No newline at end of file
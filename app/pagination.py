@@ -0,0 +1,204 @@
+#Importaciones de Python
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+#Importaciones de Django
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def _cursor_value(value):
+    # Fechas con microsegundos completos: truncarlas saltearía filas
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} no se puede usar en un cursor")
+
+
+def encode_cursor(values):
+    """encode_cursor: Convierte los valores de la clave de orden en un cursor para la URL"""
+    raw = json.dumps(list(values), separators=(",", ":"), default=_cursor_value).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """decode_cursor: Retorna los valores del cursor o None si el cursor es inválido"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+class KeysetPage:
+    """ Esta clase representa una página obtenida con paginación por cursor
+    Contiene los siguientes atributos:
+    - object_list: filas de la página, en el orden de la clave
+    - has_next / has_previous: indican si existen páginas vecinas
+    - next_cursor / previous_cursor: cursores para navegar a las páginas vecinas
+    """
+
+    def __init__(self, object_list, ordering, has_next, has_previous):
+        self.object_list = object_list
+        self.ordering = ordering
+        self.has_next = has_next and bool(object_list)
+        self.has_previous = has_previous and bool(object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _cursor_for(self, obj):
+        return encode_cursor(getattr(obj, field.lstrip("-")) for field in self.ordering)
+
+    @property
+    def next_cursor(self):
+        """next_cursor: Cursor de la última fila de la página"""
+        if not self.has_next:
+            return None
+        return self._cursor_for(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        """previous_cursor: Cursor de la primera fila de la página"""
+        if not self.has_previous:
+            return None
+        return self._cursor_for(self.object_list[0])
+
+
+class KeysetPaginator:
+    """ Esta clase pagina un queryset por clave (keyset) en lugar de OFFSET,
+    de modo que el costo de cada página es el mismo sin importar su profundidad.
+    El orden acepta campos descendentes ("-timestamp") y debe ser único, por
+    eso siempre termina en "id" (o "-id" si el primer campo es descendente).
+    Contiene los siguientes métodos:
+    - page: retorna la página posterior a `after` o anterior a `before`
+    """
+
+    def __init__(self, queryset, ordering=("name", "id"), page_size=None):
+        ordering = tuple(ordering)
+        if ordering[-1].lstrip("-") != "id":
+            ordering = ordering + ("-id" if ordering[0].startswith("-") else "id",)
+        self.queryset = queryset
+        self.ordering = ordering
+        self.page_size = page_size or settings.VETSOFT_PAGE_SIZE
+
+    def _seek(self, values, forward):
+        # (a, b, c) > (x, y, z)  <=>  a > x  o  (a = x y b > y)  o  ...
+        # con "<" en los campos descendentes, y al revés si se retrocede
+        names = [field.lstrip("-") for field in self.ordering]
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            lookup = "lt" if field.startswith("-") == forward else "gt"
+            equal = {name: values[i] for i, name in enumerate(names[:index])}
+            condition |= Q(**equal, **{f"{names[index]}__{lookup}": values[index]})
+        return condition
+
+    def _reversed_ordering(self):
+        return [
+            field[1:] if field.startswith("-") else f"-{field}" for field in self.ordering
+        ]
+
+    def page(self, after=None, before=None):
+        """page: Retorna la página que sigue al cursor `after` o precede a `before`.
+        Un cursor que no corresponde a la clave de orden lleva a la primera página.
+        """
+        after_values = decode_cursor(after, len(self.ordering))
+        before_values = decode_cursor(before, len(self.ordering))
+        try:
+            queryset = self._page_queryset(after_values, before_values)
+            return self._build_page(list(queryset), after_values, before_values)
+        except (ValidationError, ValueError, TypeError):
+            queryset = self._page_queryset(None, None)
+            return self._build_page(list(queryset), None, None)
+
+    async def apage(self, after=None, before=None):
+        """apage: Versión asíncrona de page, para las vistas async"""
+        after_values = decode_cursor(after, len(self.ordering))
+        before_values = decode_cursor(before, len(self.ordering))
+        try:
+            queryset = self._page_queryset(after_values, before_values)
+            rows = [row async for row in queryset]
+            return self._build_page(rows, after_values, before_values)
+        except (ValidationError, ValueError, TypeError):
+            queryset = self._page_queryset(None, None)
+            rows = [row async for row in queryset]
+            return self._build_page(rows, None, None)
+
+    def _page_queryset(self, after_values, before_values):
+        # Una fila de más indica si hay otra página en esa dirección
+        limit = self.page_size + 1
+        if before_values is not None:
+            return (
+                self.queryset.filter(self._seek(before_values, forward=False))
+                .order_by(*self._reversed_ordering())[:limit]
+            )
+        queryset = self.queryset
+        if after_values is not None:
+            queryset = queryset.filter(self._seek(after_values, forward=True))
+        return queryset.order_by(*self.ordering)[:limit]
+
+    def _build_page(self, rows, after_values, before_values):
+        if before_values is not None:
+            has_previous = len(rows) > self.page_size
+            rows = rows[:self.page_size]
+            rows.reverse()
+            return KeysetPage(rows, self.ordering, True, has_previous)
+
+        has_next = len(rows) > self.page_size
+        return KeysetPage(
+            rows[:self.page_size], self.ordering, has_next, after_values is not None,
+        )
+
+
+def get_page_size(request):
+    """get_page_size: Lee `page_size` de la URL, acotado por VETSOFT_MAX_PAGE_SIZE"""
+    try:
+        size = int(request.GET.get("page_size", ""))
+    except ValueError:
+        return settings.VETSOFT_PAGE_SIZE
+    return max(1, min(size, settings.VETSOFT_MAX_PAGE_SIZE))
+
+
+def paginate(request, queryset, ordering=("name", "id")):
+    """paginate: Pagina un queryset con los cursores `after`/`before` de la URL
+    y agrega a la página las URLs de navegación para el template
+    """
+    paginator = KeysetPaginator(queryset, ordering, get_page_size(request))
+    page = paginator.page(
+        after=request.GET.get("after"), before=request.GET.get("before"),
+    )
+    return _add_page_urls(request, page)
+
+
+async def apaginate(request, queryset, ordering=("name", "id")):
+    """apaginate: Versión asíncrona de paginate, para las vistas async"""
+    paginator = KeysetPaginator(queryset, ordering, get_page_size(request))
+    page = await paginator.apage(
+        after=request.GET.get("after"), before=request.GET.get("before"),
+    )
+    return _add_page_urls(request, page)
+
+
+def _add_page_urls(request, page):
+    def page_url(key, cursor):
+        query = request.GET.copy()
+        query.pop("after", None)
+        query.pop("before", None)
+        query[key] = cursor
+        return f"?{query.urlencode()}"
+
+    page.next_url = page_url("after", page.next_cursor) if page.has_next else None
+    page.previous_url = (
+        page_url("before", page.previous_cursor) if page.has_previous else None
+    )
+    return page
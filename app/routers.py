@@ -0,0 +1,115 @@
+#Importaciones de Python
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+#Importaciones de Django
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+# Cookie con el instante (epoch) hasta el que el navegador lee de la primaria
+PIN_COOKIE = "vetsoft_primary_until"
+
+# Estado de ruteo de la request en curso (None fuera de ReplicaPinMiddleware)
+_routing = ContextVar("vetsoft_routing", default=None)
+
+
+class RoutingState:
+    """ Esta clase guarda cómo se rutean las consultas de una request
+    Contiene los siguientes atributos:
+    - pinned: la request llegó dentro de la ventana posterior a una escritura
+    - wrote: la request escribió en la primaria
+    - replica_allowed: la vista en curso acepta leer de una réplica
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.replica_allowed = False
+
+
+def start_routing(pinned):
+    """start_routing: Activa el ruteo para el contexto actual"""
+    state = RoutingState(pinned)
+    return state, _routing.set(state)
+
+
+def stop_routing(token):
+    """stop_routing: Desactiva el ruteo iniciado con start_routing"""
+    _routing.reset(token)
+
+
+def read_replica(view):
+    """read_replica: Marca una vista de solo lectura (listados, historial) cuyas
+    consultas pueden ir a una réplica. Acepta vistas sync y async. Fuera de
+    ReplicaPinMiddleware no cambia nada.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            state = _routing.get()
+            if state is None:
+                return await view(request, *args, **kwargs)
+            state.replica_allowed = True
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                state.replica_allowed = False
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        state = _routing.get()
+        if state is None:
+            return view(request, *args, **kwargs)
+        state.replica_allowed = True
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            state.replica_allowed = False
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """ Esta clase rutea las lecturas de las vistas marcadas con read_replica a
+    una de VETSOFT_READ_REPLICAS y todo lo demás a "default" (la primaria).
+    Después de escribir, la misma request y las del mismo navegador durante
+    VETSOFT_REPLICA_PIN_SECONDS leen de la primaria, para que quien acaba de
+    guardar vea su cambio aunque la réplica todavía no lo tenga.
+    """
+
+    def db_for_read(self, model, **hints):
+        """db_for_read: Una réplica si la vista lo permite y no hay escrituras recientes"""
+        state = _routing.get()
+        replicas = settings.VETSOFT_READ_REPLICAS
+        if state is None or not replicas:
+            return "default"
+        if not state.replica_allowed or state.pinned or state.wrote:
+            return "default"
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        """db_for_write: Siempre la primaria; marca la request como escritora"""
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """allow_relation: Primaria y réplicas tienen los mismos datos"""
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """allow_migrate: Las réplicas reciben el esquema por replicación"""
+        return db == "default"
+
+
+def is_pinned(request):
+    """is_pinned: Indica si la cookie de la request sigue dentro de la ventana"""
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
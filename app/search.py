@@ -0,0 +1,243 @@
+#Importaciones de Python
+import re
+
+#Importaciones de Django
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models.signals import post_migrate
+from django.urls import reverse
+
+from app.models import Client, Medicine, Pet, Product, Provider, Vet
+
+# Búsqueda global: una tabla virtual FTS5 de SQLite con una fila por cada
+# cliente, mascota, veterinario, medicamento, producto y proveedor. Triggers
+# sobre cada tabla la mantienen al día, también con bulk_create y update(),
+# y dejan afuera las filas con borrado lógico.
+SEARCH_TABLE = "app_search"
+
+# Multiplicador del rowid: rowid = id * ROWID_FACTOR + código de la entidad
+ROWID_FACTOR = 8
+
+
+class SearchSource:
+    """ Esta clase describe qué columnas de una entidad entran en la búsqueda
+    Contiene los siguientes atributos:
+    - entity: nombre de la entidad (clients, pets, ...)
+    - code: número de la entidad dentro del rowid del índice
+    - model: modelo de la entidad
+    - detail: columnas que se indexan además del nombre
+    - label: nombre de la entidad para mostrar
+    - url_name: URL de edición de un resultado
+    """
+
+    def __init__(self, entity, code, model, detail, label, url_name):
+        self.entity = entity
+        self.code = code
+        self.model = model
+        self.detail = detail
+        self.label = label
+        self.url_name = url_name
+
+    @property
+    def table(self):
+        """table: Tabla del modelo"""
+        return self.model._meta.db_table
+
+    def row_sql(self, prefix):
+        """row_sql: Valores de la fila del índice a partir de `prefix` (new, old o la tabla)"""
+        detail = " || ' ' || ".join(f"coalesce({prefix}.{column}, '')" for column in self.detail)
+        return (
+            f"{prefix}.id * {ROWID_FACTOR} + {self.code}, '{self.entity}', {prefix}.id, "
+            f"{prefix}.name, {detail}"
+        )
+
+
+SEARCH_SOURCES = {
+    source.entity: source for source in [
+        SearchSource("clients", 1, Client, ["email", "phone", "address"], "Cliente", "clients_edit"),
+        SearchSource("medicines", 2, Medicine, ["description"], "Medicamento", "medicines_edit"),
+        SearchSource("pets", 3, Pet, ["breed"], "Mascota", "pets_edit"),
+        SearchSource("products", 4, Product, ["type"], "Producto", "products_edit"),
+        SearchSource("providers", 5, Provider, ["email", "address"], "Proveedor", "providers_edit"),
+        SearchSource("vets", 6, Vet, ["email", "phone"], "Veterinario", "vets_edit"),
+    ]
+}
+
+# Peso de cada columna en el ranking (bm25): el nombre pesa más que el resto
+RANK = f"bm25({SEARCH_TABLE}, 0, 0, 10.0, 1.0)"
+
+
+def is_supported(connection=default_connection):
+    """is_supported: El índice solo existe en SQLite; en otras bases se usa icontains"""
+    return connection.vendor == "sqlite"
+
+
+def _statements(source):
+    insert = f"INSERT INTO {SEARCH_TABLE}(rowid, entity, object_id, name, detail)"
+    delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * {ROWID_FACTOR} + {source.code}"
+    trigger = f"{SEARCH_TABLE}_{source.entity}"
+    # Solo las columnas indexadas: un UPDATE masivo de precios o dueños no
+    # reescribe el índice. deleted_at también, para que el borrado lógico saque
+    # la fila de la búsqueda
+    columns = ", ".join(["name", *source.detail, "deleted_at"])
+    live = " WHERE new.deleted_at IS NULL"
+    return [
+        f"CREATE TRIGGER {trigger}_insert AFTER INSERT ON {source.table} BEGIN "
+        f"{insert} SELECT {source.row_sql('new')}{live}; END",
+        f"CREATE TRIGGER {trigger}_update AFTER UPDATE OF {columns} ON {source.table} BEGIN "
+        f"{delete}; {insert} SELECT {source.row_sql('new')}{live}; END",
+        f"CREATE TRIGGER {trigger}_delete AFTER DELETE ON {source.table} BEGIN "
+        f"{delete}; END",
+    ]
+
+
+def _drop_triggers(cursor):
+    for source in SEARCH_SOURCES.values():
+        for action in ("insert", "update", "delete"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{source.entity}_{action}")
+
+
+def drop_search_index(connection=default_connection):
+    """drop_search_index: Borra la tabla del índice y sus triggers"""
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        _drop_triggers(cursor)
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def rebuild_search_index(connection=default_connection):
+    """rebuild_search_index: Crea de cero el índice y sus triggers y lo llena con
+    una consulta por entidad. Retorna la cantidad de filas indexadas.
+    """
+    if not is_supported(connection):
+        return 0
+    drop_search_index(connection)
+    with connection.cursor() as cursor:
+        # prefix='2 3': índices de prefijos para que "jua*" no recorra el vocabulario
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            "entity UNINDEXED, object_id UNINDEXED, name, detail, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        )
+        for source in SEARCH_SOURCES.values():
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE}(rowid, entity, object_id, name, detail) "
+                f"SELECT {source.row_sql(source.table)} FROM {source.table} WHERE deleted_at IS NULL",
+            )
+            for statement in _statements(source):
+                cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """ensure_search_index: Reconstruye el índice si a la tabla le faltan triggers.
+    SQLite recrea la tabla de un modelo en muchas migraciones (agregar una
+    columna, cambiar una restricción) y al borrar la tabla vieja se pierden
+    sus triggers, así que el índice dejaría de actualizarse.
+    """
+    connection = connections[using]
+    if not is_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT type, count(*) FROM sqlite_master "
+            "WHERE (type = 'table' AND name = %s) OR (type = 'trigger' AND name LIKE %s) "
+            "GROUP BY type",
+            [SEARCH_TABLE, f"{SEARCH_TABLE}_%"],
+        )
+        found = dict(cursor.fetchall())
+    # Sin la tabla el índice no se creó todavía (o se deshizo su migración)
+    if not found.get("table") or found.get("trigger", 0) >= 3 * len(SEARCH_SOURCES):
+        return
+    # La definición actual nombra columnas como deleted_at: con la base en una
+    # migración anterior los triggers los recrea la migración que la lleva al día
+    executor = MigrationExecutor(connection)
+    if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+        return
+    rebuild_search_index(connection)
+
+
+def connect_signals():
+    """connect_signals: Revisa el índice después de cada migrate"""
+    post_migrate.connect(ensure_search_index, dispatch_uid="vetsoft_search_index")
+
+
+def build_query(term):
+    """build_query: Convierte el texto buscado en una consulta FTS5 donde cada
+    palabra es un prefijo ("juan per" -> "juan"* AND "per"*). Las comillas
+    evitan que la sintaxis de FTS5 (AND, NEAR, -, :) llegue desde la URL.
+    """
+    words = re.findall(r"\w+", term.lower())
+    return " AND ".join(f'"{word}"*' for word in words)
+
+
+class SearchResult:
+    """ Esta clase es un resultado de la búsqueda global
+    Contiene los siguientes atributos:
+    - entity / id: entidad y id de la fila encontrada
+    - name / detail: textos indexados de la fila
+    """
+
+    def __init__(self, entity, object_id, name, detail):
+        self.entity = entity
+        self.id = object_id
+        self.name = name
+        self.detail = detail
+
+    @property
+    def label(self):
+        """label: Nombre de la entidad para mostrar"""
+        return SEARCH_SOURCES[self.entity].label
+
+    @property
+    def url(self):
+        """url: URL de edición de la fila"""
+        return reverse(SEARCH_SOURCES[self.entity].url_name, kwargs={"id": self.id})
+
+    def as_dict(self):
+        """as_dict: Resultado para la respuesta JSON"""
+        return {
+            "entity": self.entity,
+            "id": self.id,
+            "name": self.name,
+            "detail": self.detail,
+            "label": self.label,
+            "url": self.url,
+        }
+
+
+def search(term, limit, connection=default_connection):
+    """search: Retorna hasta `limit` resultados ordenados por relevancia"""
+    query = build_query(term)
+    if not query:
+        return []
+    if not is_supported(connection):
+        return _search_without_index(term.strip(), limit)
+    # Se rankean solo las primeras VETSOFT_SEARCH_CANDIDATES coincidencias:
+    # un término muy común ("a", "542") coincide con casi toda la tabla y
+    # calcular bm25 para cada fila haría que el costo crezca con la tabla
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT entity, object_id, name, detail FROM ("
+            f"SELECT entity, object_id, name, detail, {RANK} AS score FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH %s LIMIT %s"
+            f") ORDER BY score LIMIT %s",
+            [query, settings.VETSOFT_SEARCH_CANDIDATES, limit],
+        )
+        return [SearchResult(*row) for row in cursor.fetchall()]
+
+
+def _search_without_index(term, limit):
+    # Sin FTS5 solo se busca por nombre, hasta `limit` filas por entidad
+    results = []
+    for entity, source in SEARCH_SOURCES.items():
+        rows = source.model.objects.filter(name__icontains=term).order_by("name", "id")
+        results += [
+            SearchResult(entity, row.id, row.name, "") for row in rows.only("id", "name")[:limit]
+        ]
+    return sorted(results, key=lambda result: result.name.lower())[:limit]
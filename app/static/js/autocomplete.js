@@ -0,0 +1,90 @@
+// Selectores con búsqueda (templates/partials/autocomplete.html): consultan el
+// endpoint JSON mientras se escribe en lugar de cargar todas las opciones.
+(function () {
+    const DELAY_MS = 200;
+
+    function setup(container) {
+        const url = container.dataset.autocomplete;
+        const input = container.querySelector("[data-autocomplete-input]");
+        const value = container.querySelector("[data-autocomplete-value]");
+        const options = container.querySelector("[data-autocomplete-options]");
+        let timer = null;
+        let controller = null;
+
+        function close() {
+            options.classList.remove("show");
+            input.setAttribute("aria-expanded", "false");
+        }
+
+        function choose(result) {
+            value.value = result.id;
+            input.value = result.text;
+            close();
+        }
+
+        function show(results) {
+            options.replaceChildren();
+            if (results.length === 0) {
+                const empty = document.createElement("li");
+                empty.className = "dropdown-item-text text-body-secondary";
+                empty.textContent = "Sin resultados";
+                options.append(empty);
+            }
+            for (const result of results) {
+                const item = document.createElement("li");
+                const button = document.createElement("button");
+                button.type = "button";
+                button.className = "dropdown-item";
+                button.setAttribute("role", "option");
+                button.textContent = result.text;
+                if (result.detail) {
+                    const detail = document.createElement("small");
+                    detail.className = "text-body-secondary ms-2";
+                    detail.textContent = result.detail;
+                    button.append(detail);
+                }
+                button.addEventListener("click", () => choose(result));
+                item.append(button);
+                options.append(item);
+            }
+            options.classList.add("show");
+            input.setAttribute("aria-expanded", "true");
+        }
+
+        async function search() {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            const query = new URLSearchParams({ q: input.value });
+            try {
+                const response = await fetch(`${url}?${query}`, { signal: controller.signal });
+                show((await response.json()).results);
+            } catch (error) {
+                if (error.name !== "AbortError") {
+                    close();
+                }
+            }
+        }
+
+        input.addEventListener("input", () => {
+            // Al editar el texto se descarta la opción elegida antes
+            value.value = "";
+            clearTimeout(timer);
+            timer = setTimeout(search, DELAY_MS);
+        });
+        input.addEventListener("focus", search);
+        input.addEventListener("keydown", (event) => {
+            if (event.key === "Escape") {
+                close();
+            }
+        });
+        document.addEventListener("click", (event) => {
+            if (!container.contains(event.target)) {
+                close();
+            }
+        });
+    }
+
+    document.querySelectorAll("[data-autocomplete]").forEach(setup);
+})();
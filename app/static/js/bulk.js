@@ -0,0 +1,20 @@
+// Acciones masivas de los listados (templates/partials/bulk_actions.html):
+// marcar todas las filas de la página y confirmar antes de borrar.
+(function () {
+    document.querySelectorAll("[data-bulk-select-all]").forEach(function (toggle) {
+        const form = toggle.dataset.bulkSelectAll;
+        toggle.addEventListener("change", function () {
+            document.querySelectorAll(`input[name="ids"][form="${form}"]`).forEach(function (box) {
+                box.checked = toggle.checked;
+            });
+        });
+    });
+
+    document.querySelectorAll("[data-bulk-confirm]").forEach(function (button) {
+        button.addEventListener("click", function (event) {
+            if (!window.confirm(button.dataset.bulkConfirm)) {
+                event.preventDefault();
+            }
+        });
+    });
+})();
@@ -1,8 +1,51 @@
+import json
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
 from django.shortcuts import reverse
-from django.test import TestCase
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test import Client as HttpClient
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from prometheus_client import REGISTRY
+
+from app import async_views
+from app.importers import import_rows
+from app.routers import PIN_COOKIE
+from app.models import Client, MedicalRecord, Medicine, Pet, Product, Provider, Vet, validate_client, validate_pet
+
 
-from app.models import Client, Pet, Provider
+class QueryBudgetMixin:
+    """Verifica que una vista use una cantidad fija de consultas sin importar las filas"""
+
+    def assertQueryBudget(self, url, budget, add_rows):
+        add_rows(1)
+        with CaptureQueriesContext(connection) as few_rows:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        add_rows(10)
+        with CaptureQueriesContext(connection) as many_rows:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.assertLessEqual(
+            len(many_rows), budget,
+            "\n".join(query["sql"] for query in many_rows.captured_queries),
+        )
+        self.assertEqual(len(few_rows), len(many_rows))
 
 
 class HomePageTest(TestCase):
@@ -10,6 +53,18 @@ class HomePageTest(TestCase):
         response = self.client.get(reverse("home"))
         self.assertTemplateUsed(response, "home.html")
 
+    def test_assets_are_self_hosted(self):
+        response = self.client.get(reverse("home"))
+        self.assertNotContains(response, "cdn.jsdelivr.net")
+        for asset in [
+            "vendor/bootstrap/css/bootstrap.min.css",
+            "vendor/bootstrap/js/bootstrap.bundle.min.js",
+            "vendor/bootstrap-icons/bootstrap-icons.min.css",
+        ]:
+            self.assertContains(response, f"/static/{asset}")
+            self.assertIsNotNone(finders.find(asset))
+        self.assertIsNotNone(finders.find("vendor/bootstrap-icons/fonts/bootstrap-icons.woff2"))
+
 class ClientsTest(TestCase):
     def test_repo_use_repo_template(self):
         response = self.client.get(reverse("clients_repo"))
@@ -320,6 +375,83 @@ class PetsTest(TestCase):
         # Verifico si no tiene raza y muestra un mensaje de error
         self.assertContains(response, "Por favor seleccione una raza")
 
+    def test_validation_rejects_missing_or_deleted_client(self):
+        deleted = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        Client.objects.filter(id=deleted.id).update(deleted_at=timezone.now())
+        data = {"name": "Roma", "breed": "labrador", "birthday": "2021-10-10", "weight": 10}
+
+        for client in ["abc", str(deleted.id), "999"]:
+            response = self.client.post(reverse("pets_form"), data={**data, "client": client})
+            self.assertContains(response, "El cliente seleccionado no existe")
+        self.assertFalse(Pet.all_objects.exists())
+
+    def test_edit_changes_client_only_when_valid(self):
+        owner = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        other = Client.objects.create(name="Ana", phone="54221555232", email="ana@vetsoft.com")
+        pet = Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=owner)
+        data = {"id": pet.id, "name": "Roma", "breed": "labrador", "birthday": "2021-10-10", "weight": 10}
+
+        response = self.client.post(reverse("pets_form"), data={**data, "client": "1x"})
+        self.assertContains(response, "El cliente seleccionado no existe")
+        self.client.post(reverse("pets_form"), data={**data, "client": other.id})
+
+        pet.refresh_from_db()
+        self.assertEqual(pet.client, other)
+
+class ConcurrentCreateTest(TransactionTestCase):
+    """Altas en paralelo desde varios threads, cada uno con su conexión"""
+
+    def create_from_threads(self, url, owners, data, per_thread=5):
+        errors = []
+
+        def post(owner):
+            client = HttpClient()
+            try:
+                for number in range(per_thread):
+                    response = client.post(url, {**data(owner), "name": f"{owner.name} {number}"})
+                    if response.status_code != 302:
+                        errors.append(response.status_code)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post, args=(owner,)) for owner in owners]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_each_pet_gets_its_client(self):
+        clients = [
+            Client.objects.create(name=f"Cliente{number}", phone="54221555232", email="c@vetsoft.com")
+            for number in range(4)
+        ]
+
+        self.create_from_threads(reverse("pets_form"), clients, lambda owner: {
+            "breed": "Labrador", "birthday": "2021-10-10", "weight": "10", "client": owner.id,
+        })
+
+        self.assertEqual(Pet.objects.count(), 20)
+        for pet in Pet.objects.select_related("client"):
+            self.assertEqual(pet.name.split()[0], pet.client.name)
+
+    def test_each_product_gets_its_provider(self):
+        providers = [
+            Provider.objects.create(name=f"Proveedor{number}", email="p@p.com", address="Calle 1")
+            for number in range(4)
+        ]
+
+        self.create_from_threads(reverse("products_form"), providers, lambda owner: {
+            "type": "Comida", "price": "10", "provider": owner.id,
+        })
+
+        self.assertEqual(Product.objects.count(), 20)
+        for product in Product.objects.select_related("provider"):
+            self.assertEqual(product.name.split()[0], product.provider.name)
+
+
 class ProductsTest(TestCase):
     def test_validation_invalid_price(self):
         # client es un objeto que proporciona Django para simular solicitudes HTTP en tus tests.
@@ -333,6 +465,18 @@ class ProductsTest(TestCase):
         )
 
         self.assertContains(response, "El precio debe ser mayor que cero")
+
+    def test_validation_rejects_deleted_provider(self):
+        provider = Provider.objects.create(name="Distribuidora", email="d@d.com", address="Calle 1")
+        product = Product.objects.create(name="Alimento", type="Comida", price=10)
+        Provider.objects.filter(id=provider.id).update(deleted_at=timezone.now())
+        data = {"name": "Alimento", "type": "Comida", "price": 10, "provider": provider.id}
+
+        response = self.client.post(reverse("products_form"), data={**data, "id": product.id})
+
+        self.assertContains(response, "El proveedor seleccionado no existe")
+        product.refresh_from_db()
+        self.assertIsNone(product.provider_id)
         
 class MedicinesTest(TestCase):
     def test_validation_invalid_dose(self):
@@ -372,3 +516,892 @@ class VetsTest(TestCase):
         )
         self.assertContains(response, "El número de teléfono debe comenzar con el prefijo 54 para Argentina")
 
+
+
+class RepositoryPaginationTest(TestCase):
+    def setUp(self):
+        for index in range(5):
+            Client.objects.create(
+                name=f"Cliente {index}",
+                phone="54221555232",
+                email=f"cliente{index}@vetsoft.com",
+            )
+
+    def test_repo_shows_only_one_page(self):
+        response = self.client.get(reverse("clients_repo"), {"page_size": 2})
+        self.assertContains(response, "Cliente 0")
+        self.assertContains(response, "Cliente 1")
+        self.assertNotContains(response, "Cliente 2")
+        self.assertTrue(response.context["page"].has_next)
+        self.assertFalse(response.context["page"].has_previous)
+
+    def test_repo_follows_next_and_previous_cursors(self):
+        first = self.client.get(reverse("clients_repo"), {"page_size": 2})
+        second = self.client.get(reverse("clients_repo") + first.context["page"].next_url)
+        self.assertEqual(
+            [client.name for client in second.context["clients"]],
+            ["Cliente 2", "Cliente 3"],
+        )
+
+        back = self.client.get(reverse("clients_repo") + second.context["page"].previous_url)
+        self.assertEqual(
+            [client.name for client in back.context["clients"]],
+            ["Cliente 0", "Cliente 1"],
+        )
+        self.assertFalse(back.context["page"].has_previous)
+
+    def test_repo_ignores_invalid_cursor(self):
+        response = self.client.get(reverse("clients_repo"), {"after": "no-es-un-cursor"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Cliente 0")
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    def add_pets(self, count):
+        for _ in range(count):
+            client = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+            Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=client)
+
+    def add_products(self, count):
+        for _ in range(count):
+            provider = Provider.objects.create(name="Proveedor", email="p@p.com", address="Calle 1")
+            Product.objects.create(name="Alimento", type="Comida", price=10, provider=provider)
+
+    # Los listados y el historial suman la consulta del ETag (app.conditional)
+    def test_pets_repository_budget(self):
+        self.assertQueryBudget(reverse("pets_repo"), 2, self.add_pets)
+
+    def test_products_repository_budget(self):
+        self.assertQueryBudget(reverse("products_repo"), 2, self.add_products)
+
+    def test_pets_form_budget(self):
+        self.assertQueryBudget(reverse("pets_form"), 0, self.add_pets)
+
+    def test_products_form_budget(self):
+        self.assertQueryBudget(reverse("products_form"), 0, self.add_products)
+
+    def test_clients_autocomplete_budget(self):
+        self.assertQueryBudget(reverse("clients_autocomplete") + "?q=ju", 3, self.add_pets)
+
+    def test_pets_history_budget(self):
+        pet = Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10)
+
+        def add_history(count):
+            for _ in range(count):
+                MedicalRecord.objects.create(
+                    pet=pet,
+                    vet=Vet.objects.create(name="Vet", email="v@vetsoft.com", phone=54221),
+                    medicine=Medicine.objects.create(name="Med", description="d", dose=1),
+                )
+
+        self.assertQueryBudget(reverse("pets_history", args=(pet.id,)), 3, add_history)
+
+
+class SeedCommandTest(TestCase):
+    def seed(self, **options):
+        call_command(
+            "seed_vetsoft", clients=20, pets=30, vets=3, medicines=4, providers=2,
+            products=10, chunk_size=7, stdout=StringIO(), **options,
+        )
+
+    def test_seed_creates_requested_rows(self):
+        self.seed()
+
+        self.assertEqual(Client.objects.count(), 20)
+        self.assertEqual(Pet.objects.count(), 30)
+        self.assertEqual(Vet.objects.count(), 3)
+        self.assertEqual(Medicine.objects.count(), 4)
+        self.assertEqual(Provider.objects.count(), 2)
+        self.assertEqual(Product.objects.count(), 10)
+        self.assertEqual(Pet.medicines.through.objects.count(), 60)
+        self.assertEqual(Pet.vets.through.objects.count(), 60)
+        self.assertEqual(MedicalRecord.objects.count(), 150)
+        self.assertFalse(Pet.objects.filter(client__isnull=True).exists())
+
+    def test_seeded_rows_pass_validation(self):
+        self.seed()
+
+        for client in Client.objects.all():
+            self.assertEqual(validate_client(client.__dict__), {})
+        for pet in Pet.objects.all():
+            data = {**pet.__dict__, "birthday": pet.birthday.isoformat()}
+            self.assertEqual(validate_pet(data), {})
+
+    def test_seed_is_reproducible(self):
+        def seeded():
+            pets = list(Pet.objects.order_by("id").values_list("name", "breed", "weight", "birthday"))
+            records = list(MedicalRecord.objects.order_by("id").values_list("dose", "timestamp"))
+            return pets, records
+
+        self.seed(seed=7)
+        first = seeded()
+        Pet.objects.all().delete()
+        self.seed(seed=7)
+
+        self.assertEqual(first, seeded())
+
+    def test_dates_come_from_the_reference_date(self):
+        self.seed(reference_date=date(2020, 6, 1))
+
+        self.assertLess(Pet.objects.latest("birthday").birthday, date(2020, 6, 1))
+        latest = MedicalRecord.objects.latest("timestamp").timestamp
+        self.assertLessEqual(latest, datetime(2020, 6, 1, tzinfo=dt_timezone.utc))
+
+
+class BenchmarkCommandTest(TestCase):
+    def setUp(self):
+        call_command(
+            "seed_vetsoft", clients=3, pets=3, vets=2, medicines=2, providers=2,
+            products=3, stdout=StringIO(),
+        )
+        self.folder = Path(tempfile.mkdtemp())
+
+    def benchmark(self, *args):
+        call_command(
+            "benchmark_vetsoft", "--iterations=2", "--warmup=0",
+            f"--output={self.folder / 'results.json'}",
+            f"--baseline={self.folder / 'baseline.json'}",
+            *args, stdout=StringIO(), stderr=StringIO(),
+        )
+        return json.loads((self.folder / "results.json").read_text())["results"]
+
+    def test_measures_urls_and_save_paths(self):
+        results = self.benchmark()
+
+        self.assertIn("GET pets_repo", results)
+        self.assertIn("POST clients_delete", results)
+        self.assertIn("Pet.update_pet", results)
+        self.assertEqual(results["GET pets_repo"]["queries"], 2)
+        # las mediciones se revierten
+        self.assertEqual(Client.objects.count(), 3)
+
+    def test_fails_on_regression(self):
+        self.benchmark("--only=pets_repo", "--save-baseline")
+        baseline_path = self.folder / "baseline.json"
+        baseline = json.loads(baseline_path.read_text())
+        baseline["results"]["GET pets_repo"]["queries"] = 0
+        baseline_path.write_text(json.dumps(baseline))
+
+        with self.assertRaises(CommandError):
+            self.benchmark("--only=pets_repo")
+
+
+@skipUnless(connection.vendor == "sqlite", "El asesor lee planes de SQLite")
+class ExplainCommandTest(TestCase):
+    def setUp(self):
+        client = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=client)
+
+    def test_explains_the_benchmark_queries(self):
+        out = StringIO()
+        call_command("explain_vetsoft", "--only", "pets_repo", "--min-rows", "1", "--check", stdout=out)
+        self.assertIn("0 recorren tablas grandes", out.getvalue())
+
+    def test_check_fails_on_scans_of_large_tables(self):
+        path = Path(tempfile.mkdtemp()) / "queries.jsonl"
+        path.write_text(json.dumps({
+            "sql": 'SELECT "app_pet"."id" FROM "app_pet" WHERE "app_pet"."weight" > %s', "count": 3, "params": [5],
+        }) + "\n")
+
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "1 recorren tablas grandes"):
+            call_command("explain_vetsoft", "--queries", str(path), "--min-rows", "1", "--check", stdout=out)
+        self.assertIn("Recorre app_pet (1 filas) - 3 veces", out.getvalue())
+
+
+class ConcurrencyBenchmarkCommandTest(TestCase):
+    def test_compares_default_and_tuned_sqlite(self):
+        out = StringIO()
+        call_command(
+            "benchmark_concurrency", readers=1, writers=1, seconds=0.2, rows=10, stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn("default  read", output)
+        self.assertIn("tuned    write", output)
+        self.assertNotIn("concurrency", connections.settings)
+
+
+@override_settings(MIDDLEWARE=[*settings.MIDDLEWARE, "app.middleware.ServerTimingMiddleware"])
+class ServerTimingMiddlewareTest(TestCase):
+    def test_response_has_server_timing_header(self):
+        Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        response = self.client.get(reverse("clients_repo"))
+
+        timing = response["Server-Timing"]
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="2 consultas"', timing)
+        self.assertIn("tpl;dur=", timing)
+        self.assertIn("view;dur=", timing)
+
+    @override_settings(VETSOFT_SLOW_REQUEST_MS=0)
+    def test_slow_request_is_logged_with_its_queries(self):
+        with self.assertLogs("vetsoft.performance", level="WARNING") as logs:
+            self.client.get(reverse("pets_repo"))
+
+        self.assertIn("GET /mascotas/", logs.output[0])
+        self.assertIn("app_pet", logs.output[0])
+
+    def test_fast_request_is_not_logged(self):
+        with self.assertNoLogs("vetsoft.performance", level="WARNING"):
+            self.client.get(reverse("home"))
+
+
+@override_settings(
+    VETSOFT_METRICS_ENABLED=True,
+    MIDDLEWARE=["app.metrics.MetricsMiddleware", *settings.MIDDLEWARE],
+)
+class MetricsTest(TestCase):
+    def test_metrics_are_labeled_by_url_name(self):
+        self.client.get(reverse("clients_repo"))
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn(
+            'vetsoft_requests_total{method="GET",status="200",view="clients_repo"}', content,
+        )
+        self.assertIn('vetsoft_request_duration_seconds_bucket{le="0.005",view="clients_repo"}', content)
+        self.assertIn('vetsoft_request_db_queries_count{view="clients_repo"}', content)
+        self.assertIn("vetsoft_process_resident_memory_bytes", content)
+
+    def test_unknown_urls_share_one_label(self):
+        self.client.get("/no-existe/")
+        content = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('view="unmatched"', content)
+
+    @override_settings(VETSOFT_METRICS_ENABLED=False)
+    def test_metrics_disabled_returns_404(self):
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 404)
+
+
+class ImportsTest(TestCase):
+    def test_form_use_form_template(self):
+        response = self.client.get(reverse("imports_form"))
+        self.assertTemplateUsed(response, "imports/form.html")
+
+    def test_upload_imports_rows_and_lists_errors(self):
+        upload = SimpleUploadedFile(
+            "proveedores.csv",
+            b"name,email,address\nDistribuidora,d@d.com,Calle 1\nSin Email,,Calle 2\n",
+        )
+        response = self.client.post(
+            reverse("imports_form"), data={"entity": "providers", "file": upload},
+        )
+
+        self.assertContains(response, "1 filas importadas, 1 rechazadas")
+        self.assertContains(response, "Por favor ingrese un email")
+        self.assertEqual(Provider.objects.count(), 1)
+
+    def test_upload_reports_invalid_utf8_rows(self):
+        upload = SimpleUploadedFile(
+            "proveedores.csv",
+            b"name,email,address\nDistribuidora,d@d.com,Calle 1\nCa\xf1ada,c@d.com,Calle 2\n"
+            b"Mayorista,m@d.com,Calle 3\n",
+        )
+        response = self.client.post(
+            reverse("imports_form"), data={"entity": "providers", "file": upload},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "2 filas importadas, 1 rechazadas")
+        self.assertEqual(response.context["report"].errors[0][0], 3)
+        self.assertEqual(Provider.objects.count(), 2)
+
+    def test_upload_requires_entity_and_file(self):
+        response = self.client.post(reverse("imports_form"), data={})
+        self.assertContains(response, "Por favor seleccione qué desea importar")
+        self.assertContains(response, "Por favor seleccione un archivo CSV o JSONL")
+
+    def test_import_command_writes_error_report(self):
+        folder = Path(tempfile.mkdtemp())
+        (folder / "vets.csv").write_text(
+            "name,email,phone\nAna,ana@vetsoft.com,54221555232\nBeto,beto@vetsoft.com,111\n",
+        )
+        call_command(
+            "import_vetsoft", "vets", str(folder / "vets.csv"),
+            f"--errors={folder / 'errores.csv'}", stdout=StringIO(),
+        )
+
+        self.assertEqual(Vet.objects.count(), 1)
+        self.assertIn("3,phone,", (folder / "errores.csv").read_text())
+
+
+class ExportsTest(TestCase):
+    def setUp(self):
+        self.juan = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=self.juan)
+        Pet.objects.create(name="Toby", breed="pug", birthday="2020-01-01", weight=8)
+
+    def test_export_pets_csv_streams_with_client_name(self):
+        response = self.client.get(reverse("pets_export"), {"format": "csv"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="pets.csv"')
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,name,breed,birthday,weight,client_id,client_name")
+        self.assertIn("Roma,labrador,2021-10-10,10.000," + str(self.juan.id) + ",Juan", lines[1])
+        self.assertEqual(len(lines), 3)
+
+    def test_export_jsonl_applies_listing_filters(self):
+        response = self.client.get(reverse("pets_export"), {"format": "jsonl", "breed": "pug"})
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["name"] for row in rows], ["Toby"])
+        self.assertIsNone(rows[0]["client_name"])
+
+    def test_every_repository_has_an_export(self):
+        for name in ["clients", "medicines", "pets", "products", "providers", "vets"]:
+            response = self.client.get(reverse(f"{name}_export"))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(b"".join(response.streaming_content).startswith(b"id,name"))
+
+    def test_repository_uses_same_filters(self):
+        response = self.client.get(reverse("pets_repo"), {"q": "rom"})
+        self.assertContains(response, "Roma")
+        self.assertNotContains(response, "Toby")
+
+
+class MedicalHistoryTest(TestCase):
+    def setUp(self):
+        self.pet = Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10)
+        self.vet = Vet.objects.create(name="Ana", email="ana@vetsoft.com", phone=54221555232)
+        self.medicine = Medicine.objects.create(name="Meloxicam", description="Antiinflamatorio", dose=3)
+
+    def test_can_add_medical_record(self):
+        response = self.client.post(
+            reverse("pets_form_history", args=(self.pet.id,)),
+            data={"vet": self.vet.id, "medicines": self.medicine.id, "dose": "2", "notes": "Control"},
+        )
+
+        self.assertRedirects(response, reverse("pets_history", args=(self.pet.id,)))
+        record = self.pet.medical_records.get()
+        self.assertEqual(record.vet, self.vet)
+        self.assertEqual(record.medicine, self.medicine)
+        self.assertEqual(record.dose, 2)
+        self.assertEqual(record.notes, "Control")
+
+    def test_validation_errors_medical_record(self):
+        response = self.client.post(
+            reverse("pets_form_history", args=(self.pet.id,)),
+            data={"vet": "", "medicines": "999", "dose": "20"},
+        )
+
+        self.assertTemplateUsed(response, "pets/form_history.html")
+        self.assertContains(response, "Por favor seleccione un veterinario")
+        self.assertContains(response, "El medicamento seleccionado no existe")
+        self.assertContains(response, "La dosis debe estar en un rango de 1 a 10")
+        self.assertFalse(MedicalRecord.objects.exists())
+
+    def test_history_is_paginated_newest_first(self):
+        now = timezone.now()
+        for days in range(5):
+            MedicalRecord.objects.create(
+                pet=self.pet, vet=self.vet, medicine=self.medicine,
+                timestamp=now - timedelta(days=days), notes=f"visita {days}",
+            )
+
+        url = reverse("pets_history", args=(self.pet.id,))
+        first = self.client.get(url, {"page_size": 2})
+        self.assertEqual(
+            [record.notes for record in first.context["records"]], ["visita 0", "visita 1"],
+        )
+        second = self.client.get(url + first.context["page"].next_url)
+        self.assertEqual(
+            [record.notes for record in second.context["records"]], ["visita 2", "visita 3"],
+        )
+
+
+class AsyncViewsTest(TestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        for name in ["Carla", "Ana", "Beto"]:
+            Client.objects.create(name=name, phone="54221555232", email=f"{name.lower()}@vetsoft.com")
+
+    async def test_async_repository_is_paginated(self):
+        request = self.factory.get(reverse("clients_repo"), {"page_size": 2})
+        response = await async_views.clients_repository(request)
+
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        self.assertIn("Ana", content)
+        self.assertIn("Beto", content)
+        self.assertNotIn("Carla", content)
+        self.assertIn("after=", content)
+
+    async def test_async_repository_supports_conditional_get(self):
+        response = await async_views.vets_repository(self.factory.get(reverse("vets_repo")))
+        request = self.factory.get(reverse("vets_repo"), headers={"if-none-match": response["ETag"]})
+
+        self.assertEqual((await async_views.vets_repository(request)).status_code, 304)
+
+    async def test_async_history_lists_records(self):
+        pet = await Pet.objects.acreate(name="Roma", breed="labrador", birthday="2021-10-10", weight=10)
+        vet = await Vet.objects.acreate(name="Ana", email="ana@vetsoft.com", phone=54221555232)
+        await MedicalRecord.objects.acreate(pet=pet, vet=vet, notes="Control anual")
+
+        response = await async_views.pets_history(self.factory.get("/"), id=pet.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Control anual", response.content.decode())
+
+    @override_settings(MIDDLEWARE=[*settings.MIDDLEWARE, "app.middleware.ServerTimingMiddleware"])
+    async def test_server_timing_counts_queries_under_asgi(self):
+        response = await self.async_client.get(reverse("clients_repo"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="2 consultas"', response["Server-Timing"])
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.owner = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        self.pet = Pet.objects.create(
+            name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=self.owner,
+        )
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_unchanged_listing_returns_304(self):
+        url = reverse("pets_repo")
+        response = self.client.get(url)
+
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+        with self.assertNumQueries(1):
+            revalidated = self.revalidate(url, response)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+
+    def test_listing_changes_when_a_shown_entity_changes(self):
+        url = reverse("pets_repo")
+        response = self.client.get(url)
+
+        self.owner.name = "Pedro"
+        self.owner.save()
+
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_listing_changes_on_delete(self):
+        url = reverse("clients_repo")
+        Client.objects.create(name="Ana", phone="54221555232", email="ana@vetsoft.com")
+        response = self.client.get(url)
+
+        Client.objects.filter(name="Ana").delete()
+
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_listing_is_revalidated_by_etag_after_a_hard_delete(self):
+        url = reverse("clients_repo")
+        Client.objects.create(name="Ana", phone="54221555232", email="ana@vetsoft.com")
+        response = self.client.get(url)
+
+        Client.all_objects.filter(name="Ana").delete()
+
+        # Sin Last-Modified, If-Modified-Since solo no alcanza para un 304
+        since = http_date(time.time() + 60)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_filters_have_their_own_etag(self):
+        first = self.client.get(reverse("pets_repo"))
+        filtered = self.client.get(reverse("pets_repo"), {"q": "rom"})
+
+        self.assertNotEqual(first["ETag"], filtered["ETag"])
+
+    def test_history_changes_with_new_records(self):
+        url = reverse("pets_history", args=(self.pet.id,))
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+
+        vet = Vet.objects.create(name="Ana", email="ana@vetsoft.com", phone=54221555232)
+        MedicalRecord.objects.create(pet=self.pet, vet=vet)
+
+        self.assertEqual(self.revalidate(url, response).status_code, 200)
+
+    def test_history_last_modified_follows_new_records(self):
+        url = reverse("pets_history", args=(self.pet.id,))
+        Pet.objects.filter(id=self.pet.id).update(updated_at=timezone.now() - timedelta(hours=1))
+        response = self.client.get(url)
+        since = response["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 304)
+
+        MedicalRecord.objects.create(pet=self.pet)
+
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+    def test_missing_pet_history_is_404(self):
+        self.assertEqual(self.client.get(reverse("pets_history", args=(999,))).status_code, 404)
+
+
+@override_settings(VETSOFT_CACHE_PAGES=True)
+class PageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+            Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=self.owner)
+
+    def cache_requests(self, entity, result):
+        return REGISTRY.get_sample_value(
+            "vetsoft_cache_requests_total", {"entity": entity, "result": result},
+        ) or 0
+
+    def test_second_request_is_served_from_cache(self):
+        hits = self.cache_requests("pets", "hit")
+        misses = self.cache_requests("pets", "miss")
+        self.client.get(reverse("pets_repo"))
+
+        # Solo la consulta del ETag
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("pets_repo"))
+
+        self.assertContains(response, "Roma")
+        self.assertEqual(self.cache_requests("pets", "miss"), misses + 1)
+        self.assertEqual(self.cache_requests("pets", "hit"), hits + 1)
+
+    def test_filters_are_cached_separately(self):
+        self.client.get(reverse("clients_repo"))
+        response = self.client.get(reverse("clients_repo"), {"q": "nadie"})
+
+        self.assertNotContains(response, "Juan")
+
+    def test_saving_invalidates_the_listing(self):
+        self.client.get(reverse("vets_repo"))
+        with self.captureOnCommitCallbacks(execute=True):
+            Vet.objects.create(name="Ana", email="ana@vetsoft.com", phone=54221555232)
+
+        self.assertContains(self.client.get(reverse("vets_repo")), "Ana")
+
+    def test_renaming_a_client_invalidates_the_pets_listing(self):
+        self.client.get(reverse("pets_repo"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.name = "Pedro"
+            self.owner.save()
+
+        self.assertContains(self.client.get(reverse("pets_repo")), "Pedro")
+
+    def test_deleting_invalidates_the_listing(self):
+        self.client.get(reverse("clients_repo"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("clients_delete"), {"client_id": self.owner.id})
+
+        self.assertNotContains(self.client.get(reverse("clients_repo")), "Juan")
+
+    def test_import_invalidates_the_listing(self):
+        self.client.get(reverse("medicines_repo"))
+        import_rows("medicines", [{"name": "Meloxicam", "description": "Antiinflamatorio", "dose": "3"}])
+
+        self.assertContains(self.client.get(reverse("medicines_repo")), "Meloxicam")
+
+
+class BulkActionsTest(TestCase):
+    def setUp(self):
+        self.juan = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        self.ana = Client.objects.create(name="Ana", phone="54221555232", email="ana@vetsoft.com")
+        self.pets = [
+            Pet.objects.create(name=name, breed="labrador", birthday="2021-10-10", weight=10, client=self.juan)
+            for name in ["Roma", "Toby", "Luna"]
+        ]
+        self.provider = Provider.objects.create(name="Distribuidora", email="d@d.com", address="Calle 1")
+        self.other = Provider.objects.create(name="Otra", email="o@o.com", address="Calle 2")
+        Product.objects.create(name="Alimento", type="Comida", price=1000, provider=self.provider)
+        Product.objects.create(name="Correa", type="Accesorio", price=19.99, provider=self.provider)
+        Product.objects.create(name="Pipeta", type="Sanidad", price=500, provider=self.other)
+
+    def test_deletes_selected_rows_in_one_request(self):
+        ids = [self.pets[0].id, self.pets[2].id]
+        response = self.client.post(reverse("pets_bulk_delete") + "?q=o", {"ids": ids})
+
+        self.assertRedirects(response, reverse("pets_repo") + "?q=o")
+        self.assertEqual(list(Pet.objects.values_list("name", flat=True)), ["Toby"])
+
+    def test_deleting_clients_cascades_to_their_pets(self):
+        self.client.post(reverse("clients_bulk_delete"), {"ids": [self.juan.id]})
+
+        self.assertEqual(list(Client.objects.values_list("name", flat=True)), ["Ana"])
+        self.assertFalse(Pet.objects.exists())
+
+    def test_bulk_delete_requires_post(self):
+        self.assertEqual(self.client.get(reverse("vets_bulk_delete")).status_code, 405)
+
+    def test_reassigns_owner_with_one_update(self):
+        ids = [pet.id for pet in self.pets[:2]]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse("pets_reassign"), {"ids": ids, "client": self.ana.id})
+
+        # Validar el cliente y un solo UPDATE, sin cargar las mascotas
+        statements = [query["sql"].split()[0] for query in queries.captured_queries]
+        self.assertEqual([sql for sql in statements if sql in ("SELECT", "UPDATE")], ["SELECT", "UPDATE"])
+
+        owners = dict(Pet.objects.values_list("name", "client__name"))
+        self.assertEqual(owners, {"Roma": "Ana", "Toby": "Ana", "Luna": "Juan"})
+
+    def test_reassign_rejects_unknown_client(self):
+        response = self.client.post(reverse("pets_reassign"), {"ids": [self.pets[0].id], "client": 9999})
+
+        self.assertContains(response, "El cliente seleccionado no existe", status_code=400)
+        self.assertEqual(Pet.objects.filter(client=self.juan).count(), 3)
+
+    def test_changes_prices_of_one_provider(self):
+        response = self.client.post(reverse("products_prices"), {"provider": self.provider.id, "percent": "10"})
+
+        self.assertRedirects(response, reverse("products_repo"))
+        prices = dict(Product.objects.values_list("name", "price"))
+        self.assertEqual(prices, {"Alimento": 1100, "Correa": 21.99, "Pipeta": 500})
+
+    def test_price_change_rejects_invalid_percent(self):
+        response = self.client.post(reverse("products_prices"), {"provider": self.provider.id, "percent": "-100"})
+
+        self.assertContains(response, "El porcentaje debe ser mayor que -100", status_code=400)
+
+    def test_price_change_rejects_infinite_or_huge_percent(self):
+        for percent in ["Infinity", "-Infinity", "NaN"]:
+            response = self.client.post(reverse("products_prices"), {"provider": self.provider.id, "percent": percent})
+            self.assertContains(response, "El porcentaje debe ser un número válido", status_code=400)
+
+        for percent in ["1e400", "1000.01"]:
+            response = self.client.post(reverse("products_prices"), {"provider": self.provider.id, "percent": percent})
+            self.assertContains(response, "El porcentaje no puede superar 1000", status_code=400)
+        self.assertEqual(Product.objects.get(name="Alimento").price, 1000)
+
+    def test_price_change_updates_the_etag(self):
+        first = self.client.get(reverse("products_repo"))
+        self.client.post(reverse("products_prices"), {"provider": self.provider.id, "percent": "5"})
+
+        response = self.client.get(reverse("products_repo"), HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(VETSOFT_CACHE_PAGES=True)
+    def test_reassign_invalidates_the_cached_listing(self):
+        cache.clear()
+        self.client.get(reverse("pets_repo"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("pets_reassign"), {"ids": [self.pets[0].id], "client": self.ana.id})
+
+        self.assertContains(self.client.get(reverse("pets_repo")), "Ana")
+
+
+@override_settings(VETSOFT_DELETE_BATCH_SIZE=2, VETSOFT_DELETE_PAUSE_SECONDS=0)
+class SoftDeleteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.provider = Provider.objects.create(name="Distribuidora", email="d@d.com", address="Calle 1")
+        # Un solo bloque: se borra en la misma request
+        for number in range(2):
+            Product.objects.create(name=f"Producto {number}", type="Comida", price=10, provider=self.provider)
+
+    def test_delete_is_one_update_per_table(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("providers_delete"), {"provider_id": self.provider.id})
+
+        # El conteo de productos vigentes y, sin DELETE, un UPDATE para el
+        # proveedor y otro para sus productos
+        statements = [query["sql"].split()[0] for query in queries.captured_queries]
+        self.assertEqual(
+            [sql for sql in statements if sql in ("SELECT", "UPDATE", "DELETE")], ["SELECT", "UPDATE", "UPDATE"],
+        )
+        self.assertRedirects(response, reverse("providers_repo"))
+        self.assertFalse(Provider.objects.exists())
+        self.assertFalse(Product.objects.exists())
+        self.assertEqual(Product.all_objects.filter(deleted_at__isnull=False).count(), 2)
+
+    def test_deleted_rows_leave_listings_and_search(self):
+        self.client.post(reverse("providers_delete"), {"provider_id": self.provider.id})
+
+        self.assertNotContains(self.client.get(reverse("products_repo")), "Producto 0")
+        self.assertNotContains(self.client.get(reverse("providers_repo")), "Distribuidora")
+        self.assertEqual(self.client.get(reverse("search_json"), {"q": "producto"}).json()["results"], [])
+
+    def test_unknown_or_deleted_row_is_not_found(self):
+        pet = Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10)
+        self.assertEqual(self.client.post(reverse("pets_delete"), {"pet_id": pet.id}).status_code, 302)
+        self.assertEqual(self.client.post(reverse("pets_delete"), {"pet_id": pet.id}).status_code, 404)
+        self.assertEqual(self.client.get(reverse("pets_edit", args=(pet.id,))).status_code, 404)
+
+    def test_purge_command_removes_old_deleted_rows(self):
+        self.client.post(reverse("providers_delete"), {"provider_id": self.provider.id})
+        month_ago = timezone.now() - timedelta(days=31)
+        Provider.all_objects.update(deleted_at=month_ago)
+        Product.all_objects.update(deleted_at=month_ago)
+        recent = Product.objects.create(name="Reciente", type="Comida", price=10)
+        self.client.post(reverse("products_delete"), {"product_id": recent.id})
+
+        out = StringIO()
+        call_command("purge_vetsoft", "--older-than-days", "30", "--batch-size", "2", stdout=out)
+
+        self.assertIn("app.Product: 2 filas purgadas", out.getvalue())
+        self.assertIn("3 filas purgadas", out.getvalue())
+        self.assertEqual(list(Product.all_objects.values_list("name", flat=True)), ["Reciente"])
+        self.assertFalse(Provider.all_objects.exists())
+
+    def test_command_reports_progress(self):
+        Product.objects.create(name="Producto 2", type="Comida", price=10, provider=self.provider)
+        out = StringIO()
+        call_command("delete_vetsoft", "providers", self.provider.id, stdout=out)
+
+        self.assertIn("2/3 filas relacionadas borradas", out.getvalue())
+        self.assertFalse(Product.all_objects.exists())
+
+
+@override_settings(VETSOFT_DELETE_BATCH_SIZE=2, VETSOFT_DELETE_PAUSE_SECONDS=0)
+class BackgroundDeleteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.provider = Provider.objects.create(name="Distribuidora", email="d@d.com", address="Calle 1")
+        for number in range(3):
+            Product.objects.create(name=f"Producto {number}", type="Comida", price=10, provider=self.provider)
+
+    @mock.patch("app.deletion.run_in_background", lambda task: task())
+    def test_large_provider_is_soft_deleted_by_a_job(self):
+        response = self.client.post(reverse("providers_delete"), {"provider_id": self.provider.id})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Provider.objects.exists())
+        self.assertFalse(Product.objects.exists())
+        self.assertEqual(Product.all_objects.filter(deleted_at__isnull=False).count(), 3)
+
+        status = self.client.get(response["Location"])
+        self.assertContains(status, "3 de 3 filas relacionadas borradas")
+        self.assertNotContains(status, 'http-equiv="refresh"')
+        job = self.client.get(response["Location"], {"format": "json"}).json()
+        self.assertEqual((job["status"], job["deleted"], job["total"]), ("done", 3, 3))
+
+    @mock.patch("app.deletion.run_in_background")
+    def test_status_page_refreshes_while_running(self, run_in_background):
+        response = self.client.post(reverse("providers_delete"), {"provider_id": self.provider.id})
+
+        run_in_background.assert_called_once()
+        self.assertContains(self.client.get(response["Location"]), 'http-equiv="refresh"')
+        # Hasta que el trabajo termine el proveedor sigue vigente
+        self.assertTrue(Provider.objects.exists())
+
+    @mock.patch("app.deletion.run_in_background", lambda task: task())
+    @mock.patch("app.deletion.delete_rows", side_effect=RuntimeError)
+    def test_failed_job_keeps_the_row_listed(self, delete_rows):
+        response = self.client.post(reverse("providers_delete"), {"provider_id": self.provider.id})
+
+        self.assertContains(self.client.get(response["Location"]), "No se pudo terminar el borrado")
+        self.assertTrue(Provider.objects.exists())
+
+    def test_unknown_job_is_not_found(self):
+        self.assertEqual(self.client.get(reverse("deletion_status", args=("nada",))).status_code, 404)
+
+
+class AutocompleteTest(TestCase):
+    def setUp(self):
+        self.juan = Client.objects.create(name="Juan Perez", phone="54221555232", email="jperez@vetsoft.com")
+        self.maria = Client.objects.create(name="Maria Lopez", phone="54111222333", email="juana@vetsoft.com")
+        self.carlos = Client.objects.create(name="Carlos Juarez", phone="54999888777", email="carlos@vetsoft.com")
+
+    def search(self, url_name, **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        return [result["text"] for result in response.json()["results"]]
+
+    def test_search_by_prefix_of_name_email_or_phone(self):
+        self.assertEqual(self.search("clients_autocomplete", q="JU"), ["Juan Perez", "Maria Lopez"])
+        self.assertEqual(self.search("clients_autocomplete", q="54111"), ["Maria Lopez"])
+
+    def test_search_by_substring_fills_remaining_results(self):
+        self.assertEqual(
+            self.search("clients_autocomplete", q="jua"), ["Juan Perez", "Maria Lopez", "Carlos Juarez"],
+        )
+
+    def test_results_are_limited(self):
+        self.assertEqual(len(self.search("clients_autocomplete", limit="1")), 1)
+        with self.settings(VETSOFT_AUTOCOMPLETE_LIMIT=2):
+            self.assertEqual(len(self.search("clients_autocomplete", limit="50")), 2)
+
+    def test_search_providers(self):
+        provider = Provider.objects.create(name="Distribuidora Sur", email="ventas@sur.com", address="Calle 1")
+        Provider.objects.create(name="Alimentos Norte", email="norte@vetsoft.com", address="Calle 2")
+
+        response = self.client.get(reverse("providers_autocomplete"), {"q": "ventas"})
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": provider.id, "text": "Distribuidora Sur", "detail": "ventas@sur.com"}],
+        )
+
+    def test_pet_form_does_not_list_clients(self):
+        response = self.client.get(reverse("pets_form"))
+        self.assertNotContains(response, "Juan Perez")
+        self.assertContains(response, reverse("clients_autocomplete"))
+
+    def test_pet_edit_shows_selected_client(self):
+        pet = Pet.objects.create(
+            name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=self.maria,
+        )
+        response = self.client.get(reverse("pets_edit", args=(pet.id,)))
+        self.assertContains(response, 'value="Maria Lopez"')
+        self.assertContains(response, f'name="client" value="{self.maria.id}"')
+        self.assertNotContains(response, "Juan Perez")
+
+
+@skipUnless(connection.vendor == "sqlite", "El índice FTS5 de la búsqueda es solo de SQLite")
+class SearchTest(TestCase):
+    def setUp(self):
+        self.client_row = Client.objects.create(name="Juan Perez", phone="54221555232", email="jperez@vetsoft.com")
+        self.pet = Pet.objects.create(name="Juancito", breed="labrador", birthday="2021-10-10", weight=10)
+
+    def test_search_page_links_to_results(self):
+        response = self.client.get(reverse("search"), {"q": "juan"})
+        self.assertTemplateUsed(response, "search/results.html")
+        self.assertContains(response, reverse("clients_edit", args=(self.client_row.id,)))
+        self.assertContains(response, reverse("pets_edit", args=(self.pet.id,)))
+
+    def test_search_json(self):
+        response = self.client.get(reverse("search_json"), {"q": "jperez"})
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "entity": "clients",
+                    "id": self.client_row.id,
+                    "name": "Juan Perez",
+                    "detail": "jperez@vetsoft.com 54221555232 ",
+                    "label": "Cliente",
+                    "url": reverse("clients_edit", args=(self.client_row.id,)),
+                },
+            ],
+        )
+
+    def test_search_is_limited(self):
+        with self.settings(VETSOFT_SEARCH_LIMIT=1):
+            response = self.client.get(reverse("search_json"), {"q": "juan"})
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_navbar_has_search_box(self):
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, f'action="{reverse("search")}"')
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("2 filas indexadas", out.getvalue())
+
+
+@override_settings(
+    MIDDLEWARE=[*settings.MIDDLEWARE, "app.middleware.ReplicaPinMiddleware"],
+    DATABASE_ROUTERS=["app.routers.ReplicaRouter"],
+    VETSOFT_READ_REPLICAS=[],
+    VETSOFT_REPLICA_PIN_SECONDS=5,
+)
+class ReplicaPinTest(TestCase):
+    def test_write_pins_browser_to_primary(self):
+        response = self.client.post(
+            reverse("clients_form"),
+            data={"name": "Juan Sebastian Veron", "phone": "54221555232",
+                  "email": "brujita75@vetsoft.com", "address": "13 y 44"},
+        )
+
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], 5)
+        self.assertGreater(float(cookie.value), time.time())
+
+    def test_reads_do_not_pin(self):
+        response = self.client.get(reverse("clients_repo"))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
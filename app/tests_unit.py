@@ -1,9 +1,38 @@
-from datetime import date
+import csv
+import runpy
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
 from decimal import Decimal
-
-from django.test import TestCase
-
-from app.models import Breed, Client, Pet, Provider, Vet, validate_medicine, validate_pet, validate_product, validate_client, validate_vet
+from importlib import import_module
+from io import BytesIO, StringIO, TextIOWrapper
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, models
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.benchmarks import compare, percentile
+from app.caching import bump_version, cached_page, get_versions, page_key, version_key
+from app.checks import check_page_cache
+from app.database import apply_sqlite_pragmas
+from app.explain import QueryLog, advise, query_plan, recording, unindexed_scans
+from app.bulk import delete_rows
+from app.deletion import CASCADES, delete_in_batches, purge_deleted, soft_delete_in_batches
+from app.loadtest import serving_command
+from app.importers import import_file
+from app.models import Breed, Client, MedicalRecord, Medicine, Pet, Product, Provider, Vet, validate_medicine, validate_pet, validate_product, validate_client, validate_vet
+from app.pagination import KeysetPaginator, decode_cursor, encode_cursor
+from app.routers import ReplicaRouter, read_replica, start_routing, stop_routing
+from app.search import build_query, ensure_search_index, rebuild_search_index, search
 
 class ClientModelTest(TestCase):
     def test_can_create_and_get_client(self):
@@ -32,7 +61,7 @@ class ClientModelTest(TestCase):
                 "address": "13 y 44",
             },
         )
-        client = Client.objects.get(pk=1)
+        client = Client.objects.get()
 
         self.assertEqual(client.phone, "54221555232")
 
@@ -45,7 +74,7 @@ class ClientModelTest(TestCase):
         })
 
 
-        client_updated = Client.objects.get(pk=1)
+        client_updated = Client.objects.get(pk=client.id)
 
         self.assertEqual(client_updated.phone, "54221555233")
 
@@ -58,13 +87,13 @@ class ClientModelTest(TestCase):
                 "email": "brujita75@vetsoft.com",
             },
         )
-        client = Client.objects.get(pk=1)
+        client = Client.objects.get()
 
         self.assertEqual(client.phone, "54221555232")
 
         client.update_client({"phone": ""})
 
-        client_updated = Client.objects.get(pk=1)
+        client_updated = Client.objects.get(pk=client.id)
 
         self.assertEqual(client_updated.phone, "54221555232")
     
@@ -314,6 +343,30 @@ class PetModelTest(TestCase):
          # Verificar que no se haya creado la mascota en la base de datos
         self.assertEqual(Pet.objects.count(), 0)
 
+     # el dueño se guarda en el mismo INSERT que la mascota
+     def test_save_pet_with_client_in_one_insert(self):
+        client = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        pet_data = {
+            "name": "Charly",
+            "breed": "Pug",
+            "birthday": "2020-06-18",
+            "weight": "13.000",
+            "client": str(client.id),
+        }
+
+        # El chequeo de que la relación existe y el INSERT con la relación incluida
+        with self.assertNumQueries(2):
+            pet, errors = Pet.save_pet(pet_data)
+
+        self.assertIsNone(errors)
+        self.assertEqual(Pet.objects.get(id=pet.id).client_id, client.id)
+
+     def test_save_pet_with_errors_returns_none(self):
+        pet, errors = Pet.save_pet({"name": "Charly", "breed": "", "birthday": "2020-06-18", "weight": "13"})
+
+        self.assertIsNone(pet)
+        self.assertIn("breed", errors)
+
 
 
 class MedicineModelTest(TestCase):
@@ -378,6 +431,17 @@ class ProductModelTest(TestCase):
         self.assertIn("price", errors)
         self.assertEqual(errors["price"], "El precio debe ser mayor que cero")
 
+    def test_save_product_with_provider_in_one_insert(self):
+        provider = Provider.objects.create(name="Distribuidora", email="d@d.com", address="Calle 1")
+        product_data = {"name": "Alimento", "type": "Comida", "price": "1500", "provider": str(provider.id)}
+
+        # El chequeo de que la relación existe y el INSERT con la relación incluida
+        with self.assertNumQueries(2):
+            product, errors = Product.save_product(product_data)
+
+        self.assertIsNone(errors)
+        self.assertEqual(Product.objects.get(id=product.id).provider_id, provider.id)
+
 class VetModelTest(TestCase):
     def test_can_create_and_get_vet(self):
         Vet.save_vet(
@@ -403,13 +467,13 @@ class VetModelTest(TestCase):
                 "email": "brujita75@vetsoft.com",
             }
         )
-        vet = Vet.objects.get(pk=1)
+        vet = Vet.objects.get()
 
         self.assertEqual(vet.phone, 54221555232)
 
         vet.update_vet({"phone": "54221555233"})
 
-        vet_updated = Vet.objects.get(pk=1)
+        vet_updated = Vet.objects.get(pk=vet.id)
 
         self.assertEqual(vet_updated.phone, 54221555232)
     
@@ -422,13 +486,13 @@ class VetModelTest(TestCase):
                 "email": "brujita75@vetsoft.com",
             }
         )
-        vet = Vet.objects.get(pk=1)
+        vet = Vet.objects.get()
 
         self.assertEqual(vet.phone, 54221555232)
 
         vet.update_vet({"phone": ""})
 
-        vet_updated = Vet.objects.get(pk=1)
+        vet_updated = Vet.objects.get(pk=vet.id)
 
         self.assertEqual(vet_updated.phone, 54221555232)
     
@@ -455,5 +519,605 @@ class VetModelTest(TestCase):
         self.assertIn("phone", errors)
         self.assertEqual(errors["phone"], "El número de teléfono debe comenzar con el prefijo 54 para Argentina")
 
-        
 
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        # nombres repetidos para verificar el desempate por id
+        for name in ["Beto", "Ana", "Beto", "Carla", "Ana"]:
+            Vet.objects.create(name=name, email="vet@vetsoft.com", phone=54221555232)
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(["Ana", 3])
+        self.assertEqual(decode_cursor(cursor, 2), ["Ana", 3])
+        self.assertIsNone(decode_cursor(cursor, 3))
+        self.assertIsNone(decode_cursor("%%%", 2))
+
+    def test_pages_cover_all_rows_in_order(self):
+        paginator = KeysetPaginator(Vet.objects.all(), page_size=2)
+        expected = list(Vet.objects.order_by("name", "id"))
+
+        seen = []
+        page = paginator.page()
+        while True:
+            seen.extend(page.object_list)
+            if not page.has_next:
+                break
+            page = paginator.page(after=page.next_cursor)
+
+        self.assertEqual(seen, expected)
+
+    def test_previous_page_from_last_page(self):
+        paginator = KeysetPaginator(Vet.objects.all(), page_size=2)
+        second = paginator.page(after=paginator.page().next_cursor)
+        first = paginator.page(before=second.previous_cursor)
+
+        self.assertEqual(first.object_list, list(Vet.objects.order_by("name", "id")[:2]))
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+    async def test_async_pages_match_sync_pages(self):
+        paginator = KeysetPaginator(Vet.objects.all(), page_size=2)
+        first = await paginator.apage()
+        second = await paginator.apage(after=first.next_cursor)
+        previous = await paginator.apage(before=second.previous_cursor)
+
+        expected = [vet async for vet in Vet.objects.order_by("name", "id")]
+        self.assertEqual(first.object_list, expected[:2])
+        self.assertEqual(second.object_list, expected[2:4])
+        self.assertEqual(previous.object_list, first.object_list)
+
+
+class BenchmarkCompareTest(TestCase):
+    def test_percentile_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.50), 50)
+        self.assertEqual(percentile(samples, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_compare_allows_tolerance(self):
+        baseline = {"GET pets_repo": {"p95_ms": 10, "queries": 1, "peak_memory_kb": 100}}
+        results = {"GET pets_repo": {"p95_ms": 11.5, "queries": 1, "peak_memory_kb": 110}}
+        self.assertEqual(compare(results, baseline, 0.2), [])
+
+    def test_compare_reports_regressions(self):
+        baseline = {"GET pets_repo": {"p95_ms": 10, "queries": 1, "peak_memory_kb": 100}}
+        results = {"GET pets_repo": {"p95_ms": 13, "queries": 2, "peak_memory_kb": 100}}
+        regressions = compare(results, baseline, 0.2)
+        self.assertEqual({r["metric"] for r in regressions}, {"p95_ms", "queries"})
+
+
+class ImportTest(TestCase):
+    def test_import_clients_csv_reports_invalid_rows(self):
+        data = StringIO(
+            "name,phone,email,address\n"
+            "Juan Perez,54221555232,juan@vetsoft.com,13 y 44\n"
+            "Juan123,54221555232,juan2@vetsoft.com,\n"
+            "Ana Gomez,54221555233,ana@vetsoft.com,\n",
+        )
+        report = import_file("clients", data, "csv", chunk_size=2)
+
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.rejected, 1)
+        self.assertEqual(report.errors[0][0], 3)
+        self.assertIn("name", report.errors[0][1])
+        self.assertEqual(Client.objects.count(), 2)
+
+    def test_import_pets_resolves_client_by_email(self):
+        client = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        data = StringIO(
+            '{"name": "Roma", "breed": "labrador", "birthday": "2021-10-10", "weight": 10.5, "client_email": "juan@vetsoft.com"}\n'
+            '{"name": "Toby", "breed": "pug", "birthday": "2021-10-10", "weight": 8, "client_email": "nadie@vetsoft.com"}\n'
+            '{"name": "Luna", "breed": "pug", "birthday": "2021-10-10", "weight": "mucho"}\n'
+            'no es json\n',
+        )
+        report = import_file("pets", data, "jsonl")
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual(Pet.objects.get().client, client)
+        self.assertEqual([line for line, _ in report.errors], [2, 3, 4])
+        self.assertIn("client_email", report.errors[0][1])
+        self.assertIn("weight", report.errors[1][1])
+        self.assertIn("__all__", report.errors[2][1])
+
+    def test_import_stops_at_an_unreadable_row(self):
+        data = StringIO(
+            "name,email,phone\n"
+            "Ana,ana@vetsoft.com,54221555232\n"
+            f"Beto,beto@vetsoft.com,{'1' * (csv.field_size_limit() + 1)}\n",
+        )
+        report = import_file("vets", data, "csv")
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.errors[0][0], 3)
+        self.assertIn("No se pudo leer", report.errors[0][1]["__all__"])
+
+    def test_import_reports_decode_errors_of_a_strict_stream(self):
+        rows = "".join(f"Vet {n},vet{n}@vetsoft.com,54221555232\n" for n in range(400))
+        data = TextIOWrapper(BytesIO(f"name,email,phone\n{rows}".encode() + b"Pe\xf1a,x@x.com,1\n"), encoding="utf-8")
+        report = import_file("vets", data, "csv")
+
+        self.assertGreater(report.created, 0)
+        self.assertIn("No se pudo leer", report.errors[-1][1]["__all__"])
+
+    def test_import_products_with_provider(self):
+        provider = Provider.objects.create(name="Distribuidora", email="d@d.com", address="Calle 1")
+        data = StringIO("name,type,price,provider_email\nAlimento,Comida,1500,d@d.com\n")
+        report = import_file("products", data, "csv")
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual(provider.product_set.count(), 1)
+
+
+class MedicalRecordModelTest(TestCase):
+    def setUp(self):
+        self.pet = Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10)
+        self.vet = Vet.objects.create(name="Ana", email="ana@vetsoft.com", phone=54221555232)
+        self.medicine = Medicine.objects.create(name="Meloxicam", description="Antiinflamatorio", dose=3)
+
+    def test_records_cannot_be_modified(self):
+        MedicalRecord.save_record(self.pet, {"vet": self.vet.id, "medicines": self.medicine.id})
+        record = MedicalRecord.objects.get()
+        record.notes = "otra cosa"
+
+        with self.assertRaises(ValueError):
+            record.save()
+
+    def test_backfill_pairs_medicines_and_vets(self):
+        MedicalRecord.objects.all().delete()
+        other = Medicine.objects.create(name="Tramadol", description="Analgésico", dose=2)
+        self.pet.medicines.add(self.medicine, other)
+        self.pet.vets.add(self.vet)
+
+        migration = import_module("app.migrations.0015_medicalrecord")
+        migration.backfill_medical_records(apps, connection.schema_editor())
+
+        records = list(self.pet.medical_records.order_by("id"))
+        self.assertEqual(len(records), 2)
+        self.assertEqual((records[0].medicine, records[0].vet, records[0].dose), (self.medicine, self.vet, 3))
+        self.assertEqual((records[1].medicine, records[1].vet), (other, None))
+
+
+class DeleteInBatchesTest(TestCase):
+    def setUp(self):
+        self.owner = Client.objects.create(name="Juan", phone="54221555232", email="juan@vetsoft.com")
+        self.other = Client.objects.create(name="Ana", phone="54221555232", email="ana@vetsoft.com")
+        vet = Vet.objects.create(name="Vet", email="v@vetsoft.com", phone=54221)
+        medicine = Medicine.objects.create(name="Med", description="d", dose=1)
+        for number in range(5):
+            pet = Pet.objects.create(
+                name=f"Pet {number}", breed="labrador", birthday="2021-10-10", weight=10, client=self.owner,
+            )
+            pet.vets.add(vet)
+            pet.medicines.add(medicine)
+            MedicalRecord.objects.create(pet=pet, vet=vet, medicine=medicine)
+        Pet.objects.create(name="Roma", breed="labrador", birthday="2021-10-10", weight=10, client=self.other)
+
+    def test_cascades_list_every_table_that_references_the_dependents(self):
+        for cascade in CASCADES.values():
+            expected = {
+                (relation.related_model, relation.field.name)
+                for relation in cascade.dependent._meta.related_objects
+                if not relation.many_to_many and relation.on_delete is models.CASCADE
+            } | {
+                (field.remote_field.through, field.m2m_field_name())
+                for field in cascade.dependent._meta.many_to_many
+            }
+            self.assertEqual(set(cascade.children), expected)
+
+    def test_deletes_dependents_in_batches_then_the_row(self):
+        progress = []
+        with self.captureOnCommitCallbacks() as callbacks:
+            deleted = delete_in_batches("clients", self.owner.id, batch_size=2, progress=lambda *state: progress.append(state))
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(progress, [(2, 5), (4, 5), (5, 5)])
+        self.assertEqual(list(Client.objects.values_list("name", flat=True)), ["Ana"])
+        self.assertEqual(list(Pet.objects.values_list("name", flat=True)), ["Roma"])
+        self.assertFalse(MedicalRecord.objects.exists())
+        self.assertFalse(Pet.vets.through.objects.exists())
+        self.assertFalse(Pet.medicines.through.objects.exists())
+        # Un bloque no envía señales: la caché se invalida al confirmarlo
+        self.assertGreaterEqual(len(callbacks), 3)
+
+    def test_batch_is_one_delete_per_table(self):
+        ids = list(self.owner.pet_set.values_list("id", flat=True))
+        with CaptureQueriesContext(connection) as queries:
+            CASCADES["clients"].delete_batch(ids)
+
+        tables = [query["sql"].split()[2] for query in queries.captured_queries]
+        self.assertEqual(
+            tables, ['"app_medicalrecord"', '"app_pet_medicines"', '"app_pet_vets"', '"app_pet"'],
+        )
+
+    def test_delete_rows_marks_the_row_and_its_dependents(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(delete_rows("clients", [self.owner.id]), 1)
+
+        self.assertEqual(list(Client.objects.values_list("name", flat=True)), ["Ana"])
+        self.assertEqual(list(Pet.objects.values_list("name", flat=True)), ["Roma"])
+        self.assertEqual(Pet.all_objects.filter(deleted_at__isnull=False).count(), 5)
+        self.assertEqual(MedicalRecord.objects.count(), 5)
+        self.assertEqual(len(callbacks), 2)
+
+    def test_soft_deletes_live_dependents_in_batches_then_the_row(self):
+        Pet.objects.filter(name="Pet 4").update(deleted_at=timezone.now())
+        progress = []
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = soft_delete_in_batches("clients", self.owner.id, batch_size=2, progress=lambda *state: progress.append(state))
+
+        self.assertEqual(deleted, 4)
+        self.assertEqual(progress, [(2, 4), (4, 4)])
+        self.assertEqual(list(Client.objects.values_list("name", flat=True)), ["Ana"])
+        self.assertEqual(list(Pet.objects.values_list("name", flat=True)), ["Roma"])
+        self.assertEqual(MedicalRecord.objects.count(), 5)
+        self.assertEqual(purge_deleted(timezone.now()), {"app.Pet": 5, "app.Client": 1})
+
+    def test_purge_removes_old_deleted_rows_in_batches(self):
+        delete_rows("clients", [self.owner.id])
+        progress = []
+
+        purged = purge_deleted(timezone.now(), batch_size=2, progress=lambda model, deleted: progress.append((model, deleted)))
+
+        self.assertEqual(purged, {"app.Pet": 5, "app.Client": 1})
+        self.assertEqual(progress, [(Pet, 2), (Pet, 4), (Pet, 5), (Client, 1)])
+        self.assertEqual(list(Pet.all_objects.values_list("name", flat=True)), ["Roma"])
+        self.assertFalse(MedicalRecord.objects.exists())
+        self.assertFalse(Pet.vets.through.objects.exists())
+
+    def test_purge_keeps_deleted_clients_with_live_pets(self):
+        delete_rows("clients", [self.owner.id])
+        # Una mascota vigente que sigue apuntando al cliente borrado
+        Pet.all_objects.filter(client=self.owner, name="Pet 0").update(deleted_at=None)
+
+        purged = purge_deleted(timezone.now())
+
+        self.assertEqual(purged, {"app.Pet": 4})
+        self.assertTrue(Client.all_objects.filter(id=self.owner.id).exists())
+        self.assertEqual(Pet.objects.filter(client=self.owner).count(), 1)
+
+    def test_purge_keeps_recent_rows_and_stops_at_the_deadline(self):
+        delete_rows("clients", [self.owner.id])
+
+        self.assertEqual(purge_deleted(timezone.now() - timedelta(days=1)), {})
+        self.assertEqual(purge_deleted(timezone.now(), deadline=time.monotonic()), {})
+        self.assertEqual(Pet.all_objects.count(), 6)
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN es de SQLite")
+    def test_listing_and_purge_use_the_partial_indexes(self):
+        def plan(queryset):
+            with connection.cursor() as cursor:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                return " ".join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn("pet_name_id_idx", plan(Pet.objects.order_by("name", "id")[:20]))
+        self.assertIn("pet_deleted_at_idx", plan(Pet.all_objects.filter(deleted_at__lt=timezone.now()).order_by("deleted_at")))
+
+
+@skipUnless(connection.vendor == "sqlite", "El índice FTS5 de la búsqueda es solo de SQLite")
+class SearchIndexTest(TestCase):
+    def names(self, term):
+        return [(result.entity, result.name) for result in search(term, 10)]
+
+    def test_build_query_quotes_each_word_as_prefix(self):
+        self.assertEqual(build_query('Juan "Pérez" OR -x'), '"juan"* AND "pérez"* AND "or"* AND "x"*')
+        self.assertEqual(build_query("  ¿? "), "")
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        client = Client.objects.create(name="Juan Sebastian Veron", phone="54221555232", email="brujita75@vetsoft.com")
+        Vet.objects.bulk_create([Vet(name="Juana Perez", email="juana@vetsoft.com", phone="54221000000")])
+        self.assertCountEqual(self.names("jua"), [("clients", "Juan Sebastian Veron"), ("vets", "Juana Perez")])
+        self.assertEqual(self.names("brujita75"), [("clients", "Juan Sebastian Veron")])
+
+        Client.objects.filter(id=client.id).update(name="Sebastian Veron")
+        self.assertEqual(self.names("juan"), [("vets", "Juana Perez")])
+
+        Vet.objects.all().delete()
+        self.assertEqual(self.names("juan"), [])
+
+    def test_ranks_name_matches_first(self):
+        Client.objects.create(name="Ana Gomez", phone="54221555232", email="perez@vetsoft.com")
+        Client.objects.create(name="Luis Perez", phone="54221555232", email="luis@vetsoft.com")
+        self.assertEqual([name for _, name in self.names("perez")], ["Luis Perez", "Ana Gomez"])
+
+    def test_ignores_accents(self):
+        Pet.objects.create(name="Ñandú", breed="labrador", birthday="2021-10-10", weight=10)
+        self.assertEqual(self.names("nandu"), [("pets", "Ñandú")])
+
+    def test_rebuild_indexes_existing_rows(self):
+        Medicine.objects.create(name="Meloxicam", description="Antiinflamatorio", dose=3)
+        self.assertEqual(rebuild_search_index(connection), 1)
+        self.assertEqual(self.names("antiinfl"), [("medicines", "Meloxicam")])
+
+    def test_updating_other_columns_keeps_the_index_row(self):
+        product = Product.objects.create(name="Alimento", type="Comida", price=10)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT rowid FROM app_search WHERE entity = 'products'")
+            before = cursor.fetchall()
+            Product.objects.filter(id=product.id).update(price=20)
+            cursor.execute("SELECT rowid FROM app_search WHERE entity = 'products'")
+            self.assertEqual(cursor.fetchall(), before)
+
+        Product.objects.filter(id=product.id).update(type="Alimento balanceado")
+        self.assertEqual(self.names("balanceado"), [("products", "Alimento")])
+
+    def test_soft_deleted_rows_leave_the_index(self):
+        vet = Vet.objects.create(name="Juana Perez", email="juana@vetsoft.com", phone="54221000000")
+        Vet.objects.filter(id=vet.id).update(deleted_at=timezone.now())
+        self.assertEqual(self.names("juana"), [])
+
+        rebuild_search_index(connection)
+        self.assertEqual(self.names("juana"), [])
+
+    def test_migrate_restores_triggers_dropped_with_a_table(self):
+        # Lo que pasa cuando SQLite recrea la tabla en una migración
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER app_search_vets_insert")
+        ensure_search_index(sender=None, using=connection.alias)
+
+        Vet.objects.create(name="Juana Perez", email="juana@vetsoft.com", phone="54221000000")
+        self.assertEqual(self.names("juana"), [("vets", "Juana Perez")])
+
+
+@skipUnless(connection.vendor == "sqlite", "El asesor lee planes de SQLite")
+class IndexAdvisorTest(TestCase):
+    def setUp(self):
+        Product.objects.create(name="Alimento", type="Comida", price=10)
+        Product.objects.create(name="Correa", type="Accesorio", price=20)
+
+    def scans(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return unindexed_scans(connection, sql, query_plan(connection, sql, params))
+
+    def test_flags_scans_that_check_columns_outside_the_index(self):
+        listing = Pet.objects.order_by("name", "id")
+        self.assertEqual(self.scans(listing.filter(weight=10)[:20]), ["app_pet"])
+        self.assertEqual(self.scans(listing.filter(breed="pug")[:20]), [])
+        self.assertEqual(self.scans(listing.filter(client_id=1)[:20]), [])
+        # Sin condición ningún índice evita recorrer la tabla
+        self.assertEqual(self.scans(Pet.objects.all()), [])
+
+    def test_type_filter_uses_the_lower_index(self):
+        products = Product.objects.filter(type__lexact="COMIDA")
+        self.assertEqual(list(products.values_list("name", flat=True)), ["Alimento"])
+        self.assertEqual(self.scans(products.order_by("name", "id")[:20]), [])
+
+    def test_records_each_query_once_and_explains_large_tables(self):
+        log = QueryLog()
+        with recording(log):
+            for _ in range(2):
+                list(Product.objects.filter(price__gt=15))
+
+        [entry] = log.queries.values()
+        self.assertEqual(entry["count"], 2)
+        [finding] = advise(log, connection, min_rows=2)
+        self.assertEqual(finding.tables, {"app_product": 2})
+        self.assertEqual(advise(log, connection, min_rows=3), [])
+
+    def test_log_round_trip(self):
+        log = QueryLog()
+        log.add("SELECT 1 WHERE %s", [date(2020, 1, 1)])
+        log.add("PRAGMA foreign_keys", [])
+        path = Path(tempfile.mkdtemp()) / "queries.jsonl"
+        log.save(path)
+
+        self.assertEqual(QueryLog.load(path).queries, {"SELECT 1 WHERE %s": {"count": 1, "params": ["2020-01-01"]}})
+
+
+@skipUnless(connection.vendor == "sqlite", "Los PRAGMAs solo se aplican a SQLite")
+class SqlitePragmasTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_connection_uses_configured_pragmas(self):
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("temp_store"), 2)
+
+    def test_rejects_unknown_pragmas(self):
+        with self.assertRaises(ValueError):
+            apply_sqlite_pragmas(
+                None,
+                connection=SimpleNamespace(vendor="sqlite", settings_dict={"PRAGMAS": {"writable_schema": "on"}}),
+            )
+
+
+@override_settings(VETSOFT_READ_REPLICAS=["replica1"])
+class ReplicaRouterTest(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def route_in_view(self, pinned=False, write_first=False):
+        state, token = start_routing(pinned)
+        try:
+            @read_replica
+            def view(request):
+                if write_first:
+                    self.router.db_for_write(Client)
+                return self.router.db_for_read(Client)
+            return view(None)
+        finally:
+            stop_routing(token)
+
+    def test_replica_views_read_from_replica(self):
+        self.assertEqual(self.route_in_view(), "replica1")
+
+    def test_other_views_read_from_primary(self):
+        state, token = start_routing(pinned=False)
+        try:
+            self.assertEqual(self.router.db_for_read(Client), "default")
+        finally:
+            stop_routing(token)
+
+    def test_reads_after_a_write_use_primary(self):
+        self.assertEqual(self.route_in_view(write_first=True), "default")
+        self.assertEqual(self.route_in_view(pinned=True), "default")
+
+    async def test_async_replica_views_read_from_replica(self):
+        @read_replica
+        async def view(request):
+            return self.router.db_for_read(Client)
+
+        state, token = start_routing(pinned=False)
+        try:
+            self.assertEqual(await view(None), "replica1")
+            self.assertFalse(state.replica_allowed)
+        finally:
+            stop_routing(token)
+
+    def test_outside_requests_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Client), "default")
+        self.assertEqual(self.router.db_for_write(Client), "default")
+        self.assertFalse(self.router.allow_migrate("replica1", "app"))
+
+
+class PageCacheCheckTest(TestCase):
+    locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    file = {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": "/tmp/vetsoft"}}
+
+    def test_rejects_page_cache_on_locmem(self):
+        with override_settings(CACHES=self.locmem, VETSOFT_CACHE_PAGES=True, VETSOFT_CACHE_REVALIDATE=[]):
+            self.assertEqual([error.id for error in check_page_cache(None)], ["vetsoft.E001"])
+        with override_settings(CACHES=self.locmem, VETSOFT_CACHE_PAGES=True, VETSOFT_CACHE_REVALIDATE=["pets"]):
+            self.assertEqual([error.id for error in check_page_cache(None)], ["vetsoft.E001", "vetsoft.E002"])
+
+    def test_accepts_a_shared_cache_or_no_page_cache(self):
+        with override_settings(CACHES=self.file, VETSOFT_CACHE_PAGES=True):
+            self.assertEqual(check_page_cache(None), [])
+        with override_settings(CACHES=self.locmem, VETSOFT_CACHE_PAGES=False):
+            self.assertEqual(check_page_cache(None), [])
+
+
+class CacheVersionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_changes_only_that_entity(self):
+        before = get_versions(["clients", "pets"])
+        bump_version("clients")
+        after = get_versions(["clients", "pets"])
+
+        self.assertEqual(after[0], before[0] + 1)
+        self.assertEqual(after[1], before[1])
+
+    def test_evicted_version_does_not_repeat(self):
+        [before] = get_versions(["vets"])
+        cache.delete(version_key("vets"))
+        bump_version("vets")
+
+        [after] = get_versions(["vets"])
+        self.assertNotEqual(after, before)
+
+
+@override_settings(VETSOFT_CACHE_PAGES=True, VETSOFT_CACHE_REVALIDATE=["pets"])
+class CachedPageTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/mascotas/")
+        self.key = page_key("pets", self.request, get_versions(["pets", "clients"]))
+        self.builds = []
+
+    def build(self):
+        self.builds.append(len(self.builds) + 1)
+        return f"página {len(self.builds)}"
+
+    @override_settings(VETSOFT_CACHE_TIMEOUT=0)
+    def test_expired_page_is_served_stale_and_rebuilt_once(self):
+        self.assertEqual(cached_page("pets", self.request, self.build), "página 1")
+
+        with mock.patch("app.caching.start_refresh") as start_refresh:
+            self.assertEqual(cached_page("pets", self.request, self.build), "página 1")
+            self.assertEqual(cached_page("pets", self.request, self.build), "página 1")
+        self.assertEqual(start_refresh.call_count, 1)
+
+        # La tarea rearma la página y libera el lock
+        start_refresh.call_args.args[0]()
+        self.assertEqual(self.builds, [1, 2])
+        with mock.patch("app.caching.start_refresh") as start_refresh:
+            self.assertEqual(cached_page("pets", self.request, self.build), "página 2")
+        self.assertEqual(start_refresh.call_count, 1)
+
+    def test_miss_waits_for_the_request_that_is_building_it(self):
+        cache.add(f"lock:{self.key}", 1)
+        builder = threading.Timer(0.1, cache.set, args=(self.key, (time.time() + 60, "de otra request")))
+        builder.start()
+
+        self.assertEqual(cached_page("pets", self.request, self.build), "de otra request")
+        builder.join()
+        self.assertEqual(self.builds, [])
+
+    @override_settings(VETSOFT_CACHE_WAIT_SECONDS=0.1)
+    def test_miss_builds_when_the_other_request_takes_too_long(self):
+        cache.add(f"lock:{self.key}", 1)
+
+        self.assertEqual(cached_page("pets", self.request, self.build), "página 1")
+
+    def test_failed_build_releases_the_lock(self):
+        def failing_build():
+            raise RuntimeError("sin base")
+
+        with self.assertRaises(RuntimeError):
+            cached_page("pets", self.request, failing_build)
+
+        self.assertIsNone(cache.get(f"lock:{self.key}"))
+        self.assertEqual(cached_page("pets", self.request, self.build), "página 1")
+
+
+@override_settings(VETSOFT_CACHE_PAGES=True, VETSOFT_CACHE_REVALIDATE=["pets"])
+class SingleFlightAcrossWorkersTest(TestCase):
+    def builds_by_two_workers(self, worker_caches):
+        # Cada worker con su propio cliente de caché, como dos procesos de gunicorn
+        worker = threading.local()
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.3)
+            return "página"
+
+        def request(worker_cache):
+            worker.cache = worker_cache
+            self.assertEqual(cached_page("pets", RequestFactory().get("/mascotas/"), build), "página")
+
+        with mock.patch("app.caching.get_cache", lambda: worker.cache):
+            threads = [threading.Thread(target=request, args=(worker_cache,)) for worker_cache in worker_caches]
+            for thread in threads:
+                thread.start()
+                time.sleep(0.05)
+            for thread in threads:
+                thread.join()
+        return len(builds)
+
+    def test_shared_cache_builds_the_page_once(self):
+        location = tempfile.mkdtemp()
+        self.assertEqual(self.builds_by_two_workers([FileBasedCache(location, {}), FileBasedCache(location, {})]), 1)
+
+    def test_locmem_builds_it_in_every_worker(self):
+        # Por esto vetsoft.E002 rechaza VETSOFT_CACHE_REVALIDATE con locmem
+        self.assertEqual(self.builds_by_two_workers([LocMemCache("worker1", {}), LocMemCache("worker2", {})]), 2)
+
+
+class ServingCommandTest(TestCase):
+    def test_runserver_mode(self):
+        command, _ = serving_command("runserver", 9000)
+        self.assertEqual(command[2:], ["runserver", "--noreload", "127.0.0.1:9000"])
+
+    def test_uvicorn_mode_uses_gunicorn_config(self):
+        command, env = serving_command("uvicorn", 9000)
+        self.assertEqual(command[1:4], ["-m", "gunicorn", "-c"])
+        self.assertEqual(env["GUNICORN_WORKER_CLASS"], "uvicorn")
+        self.assertEqual(env["GUNICORN_BIND"], "127.0.0.1:9000")
+
+        with mock.patch.dict("os.environ", env):
+            config = runpy.run_path(command[4])
+        self.assertEqual(config["worker_class"], "uvicorn.workers.UvicornWorker")
+        self.assertEqual(config["wsgi_app"], "vetsoft.asgi:application")
+        self.assertTrue(config["preload_app"])
+
+    def test_uvicorn_async_mode_enables_async_views(self):
+        _, env = serving_command("uvicorn-async", 9000)
+        self.assertEqual(env["GUNICORN_WORKER_CLASS"], "uvicorn")
+        self.assertEqual(env["VETSOFT_ASYNC_VIEWS"], "true")
+        self.assertEqual(serving_command("uvicorn", 9000)[1]["VETSOFT_ASYNC_VIEWS"], "false")
@@ -1,26 +1,41 @@
+from django.conf import settings
 from django.urls import path
 
-from app import views
+from app import async_views, views
+
+# Listados e historial: versiones async con VETSOFT_ASYNC_VIEWS (servidas por ASGI)
+reads = async_views if settings.VETSOFT_ASYNC_VIEWS else views
 
 urlpatterns = [
     path("", view=views.home, name="home"),
-    path("clientes/", view=views.clients_repository, name="clients_repo"),
+    path("metrics", view=views.metrics, name="metrics"),
+    path("buscar/", view=views.search, name="search"),
+    path("buscar/json/", view=views.search_json, name="search_json"),
+    path("clientes/", view=reads.clients_repository, name="clients_repo"),
     path("clientes/nuevo/", view=views.clients_form, name="clients_form"),
     path("clientes/editar/<int:id>/", view=views.clients_form, name="clients_edit"),
     path("clientes/eliminar/", view=views.clients_delete, name="clients_delete"),
+    path("clientes/eliminar-seleccionados/", views.bulk_delete, {"entity": "clients"}, name="clients_bulk_delete"),
+    path("clientes/exportar/", views.export, {"entity": "clients"}, name="clients_export"),
+    path("clientes/buscar/", views.autocomplete, {"entity": "clients"}, name="clients_autocomplete"),
 
-    path("medicamentos/", view=views.medicines_repository, name="medicines_repo"),
+    path("medicamentos/", view=reads.medicines_repository, name="medicines_repo"),
     path("medicamentos/nuevo/", view=views.medicines_form, name="medicines_form"),
     path("medicamentos/editar/<int:id>/", view=views.medicines_form, name="medicines_edit"),
     path("medicamentos/eliminar/", view=views.medicines_delete, name="medicines_delete"),
+    path("medicamentos/eliminar-seleccionados/", views.bulk_delete, {"entity": "medicines"}, name="medicines_bulk_delete"),
+    path("medicamentos/exportar/", views.export, {"entity": "medicines"}, name="medicines_export"),
 
     ##pet
-    path("mascotas/", view=views.pets_repository, name="pets_repo"),
+    path("mascotas/", view=reads.pets_repository, name="pets_repo"),
     path("mascotas/nuevo/", view=views.pets_form, name="pets_form"),
     path("mascotas/editar/<int:id>/", view=views.pets_form, name="pets_edit"),
     path("mascotas/eliminar/", view=views.pets_delete, name="pets_delete"),
+    path("mascotas/eliminar-seleccionados/", views.bulk_delete, {"entity": "pets"}, name="pets_bulk_delete"),
+    path("mascotas/reasignar/", view=views.pets_reassign, name="pets_reassign"),
+    path("mascotas/exportar/", views.export, {"entity": "pets"}, name="pets_export"),
     ##pets history
-    path("mascotas/historial/<int:id>", view=views.pets_history, name="pets_history"),
+    path("mascotas/historial/<int:id>", view=reads.pets_history, name="pets_history"),
     path("mascotas/historial/<int:id>/nuevo", view=views.pets_form_history, name="pets_form_history"),
     path("mascotas/historial/<int:id>/editar", view=views.pets_form_history, name="pets_edit_history"),
     path("mascotas/historial/<int:id>/eliminar/", view=views.pets_delete, name="pets_delete_history"),
@@ -29,21 +44,35 @@ urlpatterns = [
 
 
     ##products
-    path("productos/", view=views.products_repository, name="products_repo"),
+    path("productos/", view=reads.products_repository, name="products_repo"),
     path("productos/nuevo/", view=views.products_form, name="products_form"),
     path ("productos/editar/<int:id>/", view=views.products_form, name="products_edit"),
     path("productos/eliminar/", view=views.products_delete, name="products_delete"),
+    path("productos/eliminar-seleccionados/", views.bulk_delete, {"entity": "products"}, name="products_bulk_delete"),
+    path("productos/precios/", view=views.products_prices, name="products_prices"),
+    path("productos/exportar/", views.export, {"entity": "products"}, name="products_export"),
 
     ##providers
-    path("proveedores/", view=views.providers_repository, name="providers_repo"),
+    path("proveedores/", view=reads.providers_repository, name="providers_repo"),
     path("proveedores/nuevo/", view=views.providers_form, name="providers_form"),
     path("proveedores/editar/<int:id>/", view=views.providers_form, name="providers_edit"),
     path("proveedores/eliminar/", view=views.providers_delete, name="providers_delete"),
+    path("proveedores/eliminar-seleccionados/", views.bulk_delete, {"entity": "providers"}, name="providers_bulk_delete"),
+    path("proveedores/exportar/", views.export, {"entity": "providers"}, name="providers_export"),
+    path("proveedores/buscar/", views.autocomplete, {"entity": "providers"}, name="providers_autocomplete"),
 
     ##vets
-    path("veterinarios/", view=views.vets_repository, name="vets_repo"),
+    path("veterinarios/", view=reads.vets_repository, name="vets_repo"),
     path("veterinarios/nuevo/", view=views.vets_form, name="vets_form"),
     path("veterinarios/editar/<int:id>/", view=views.vets_form, name="vets_edit"),
     path("veterinarios/eliminar/", view=views.vets_delete, name="vets_delete"),
+    path("veterinarios/eliminar-seleccionados/", views.bulk_delete, {"entity": "vets"}, name="vets_bulk_delete"),
+    path("veterinarios/exportar/", views.export, {"entity": "vets"}, name="vets_export"),
+
+    ##deletions
+    path("eliminaciones/<str:job_id>/", view=views.deletion_status, name="deletion_status"),
+
+    ##imports
+    path("importar/", view=views.imports_form, name="imports_form"),
 
 ]
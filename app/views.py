@@ -1,15 +1,90 @@
-from django.shortcuts import get_object_or_404, redirect, render, reverse
+import io
 
-from app.models import Breed, Client, Medicine, Pet, Product, Provider, Vet
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render, reverse
+from django.views.decorators.http import require_POST
+
+from app.autocomplete import get_selected, search_results
+from app.bulk import (
+    change_prices,
+    delete_rows,
+    reassign_pets,
+    selected_ids,
+    validate_price_change,
+    validate_reassign,
+)
+from app.caching import cached_page
+from app.conditional import conditional_page, history_state, listing_state
+from app.deletion import get_job, needs_background, start_job
+from app.exports import export_response
+from app.filters import filter_listing
+from app.importers import DECODE_ERRORS, guess_format, import_file
+from app.metrics import render_metrics
+from app.models import (
+    Breed,
+    Client,
+    MedicalRecord,
+    Medicine,
+    Pet,
+    Product,
+    Provider,
+    Vet,
+)
+from app.pagination import paginate
+from app.routers import read_replica
+from app.search import search as global_search
 
 
 def home(request):
     return render(request, "home.html")
 
 
+def export(request, entity):
+    return export_response(entity, request.GET, request.GET.get("format", "csv"))
+
+
+def autocomplete(request, entity):
+    return JsonResponse(search_results(entity, request.GET))
+
+
+def search(request):
+    query = request.GET.get("q", "").strip()
+    results = global_search(query, settings.VETSOFT_SEARCH_LIMIT)
+    return render(request, "search/results.html", {"query": query, "results": results})
+
+
+def search_json(request):
+    results = global_search(request.GET.get("q", ""), settings.VETSOFT_SEARCH_LIMIT)
+    return JsonResponse({"results": [result.as_dict() for result in results]})
+
+
+def metrics(request):
+    if not settings.VETSOFT_METRICS_ENABLED:
+        raise Http404
+    content, content_type = render_metrics()
+    return HttpResponse(content, content_type=content_type)
+
+
+def back_to_listing(request, entity):
+    # Vuelve al listado con los mismos filtros y página
+    url = reverse(f"{entity}_repo")
+    query = request.GET.urlencode()
+    return redirect(f"{url}?{query}" if query else url)
+
+
+@require_POST
+def bulk_delete(request, entity):
+    delete_rows(entity, selected_ids(request.POST))
+    return back_to_listing(request, entity)
+
+
+@read_replica
+@conditional_page(listing_state("clients"))
 def clients_repository(request):
-    clients = Client.objects.all()
-    return render(request, "clients/repository.html", {"clients": clients})
+    clients = filter_listing("clients", request.GET, Client.objects.for_repository())
+    page = cached_page("clients", request, lambda: paginate(request, clients))
+    return render(request, "clients/repository.html", {"clients": page, "page": page})
 
 
 def clients_form(request, id=None):
@@ -39,17 +114,24 @@ def clients_form(request, id=None):
 
 
 def clients_delete(request):
-    client_id = request.POST.get("client_id")
-    client = get_object_or_404(Client, pk=int(client_id))
-    client.delete()
+    client_id = int(request.POST.get("client_id"))
+    # Con muchos mascotas el borrado se hace por bloques en segundo plano
+    if needs_background("clients", client_id):
+        client = get_object_or_404(Client, pk=client_id)
+        return redirect(reverse("deletion_status", args=(start_job("clients", client),)))
+    if not delete_rows("clients", [client_id]):
+        raise Http404
 
     return redirect(reverse("clients_repo"))
 
 ##Medicines
 
+@read_replica
+@conditional_page(listing_state("medicines"))
 def medicines_repository(request):
-    medicines = Medicine.objects.all()
-    return render(request, "medicines/repository.html", {"medicines": medicines})
+    medicines = filter_listing("medicines", request.GET, Medicine.objects.for_repository())
+    page = cached_page("medicines", request, lambda: paginate(request, medicines))
+    return render(request, "medicines/repository.html", {"medicines": page, "page": page})
 
 def medicines_form(request, id=None):
     if request.method == "POST":
@@ -77,23 +159,35 @@ def medicines_form(request, id=None):
 
 def medicines_delete(request):
     medicine_id = request.POST.get("medicine_id")
-    medicine = get_object_or_404(Medicine, pk=int(medicine_id))
-    medicine.delete()
+    if not delete_rows("medicines", [int(medicine_id)]):
+        raise Http404
 
     return redirect(reverse("medicines_repo"))
 
 
 
 ##Pets
+@read_replica
+@conditional_page(listing_state("pets"))
 def pets_repository(request):
-    pets = Pet.objects.all()
-    return render(request, "pets/repository.html", {"pets": pets})
+    pets = filter_listing("pets", request.GET, Pet.objects.for_repository())
+    page = cached_page("pets", request, lambda: paginate(request, pets))
+    return render(request, "pets/repository.html", {"pets": page, "page": page})
 
+@read_replica
+@conditional_page(history_state)
 def pets_history(request, id):
-    pet = get_object_or_404(Pet.objects.prefetch_related("medicines", "vets"), id=id)  # Usa "Vets" en mayúscula
+    pet = get_object_or_404(Pet.objects.for_history(), id=id)
+    records = (
+        pet.medical_records.select_related("vet", "medicine")
+        .only("id", "pet", "timestamp", "dose", "notes", "vet__name", "medicine__name")
+    )
+    page = paginate(request, records, ordering=("-timestamp", "-id"))
 
     context = {
         "pet": pet,
+        "records": page,
+        "page": page,
     }
     return render(request, "pets/history.html", context)
 
@@ -182,90 +276,58 @@ def pets_history(request, id):
 
 
 def pets_form(request, id=None):
-    clients = Client.objects.all()
     if request.method == "POST":
         pet_id = request.POST.get("id", "")
         errors = {}
         saved = True
 
         if pet_id == "":
+            # El dueño seleccionado se guarda en el mismo INSERT
             saved, errors = Pet.save_pet(request.POST)
-            # Si el objeto Pet se ha creado correctamente
-            if saved:
-                # Obtener el ID del cliente seleccionado del formulario
-                client_id = request.POST.get("client", "")
-                # Asociar el cliente seleccionado con el animal creado
-                if client_id:
-                    pet = Pet.objects.latest('id')  # Obtener el último animal creado
-                    pet.client_id = client_id
-                    pet.save()
         else:
             pet = get_object_or_404(Pet, pk=pet_id)
+            # El dueño seleccionado se valida y se guarda con el resto de los datos
             saved, errors = pet.update_pet(request.POST)
-            if saved:
-            # Obtener el ID del cliente seleccionado del formulario
-                client_id = request.POST.get("client", "")
-            # Asociar el cliente seleccionado con el animal actualizado
-                if client_id:
-                    pet.client_id = client_id
-                    pet.save()
 
         if saved:
             return redirect(reverse("pets_repo"))
 
         return render(
-            request, "pets/form.html", {"errors": errors, "pet": request.POST, "clients": clients, "Breed": Breed, } ,
+            request, "pets/form.html", {
+                "errors": errors,
+                "pet": request.POST,
+                "client": get_selected("clients", request.POST.get("client")),
+                "Breed": Breed,
+            },
         )
 
     pet = None
     if id is not None:
         pet = get_object_or_404(Pet, pk=id)
 
-    return render(request, "pets/form.html", {"pet": pet, "clients": clients, "Breed": Breed,})
+    client = get_selected("clients", pet.client_id) if pet else None
+    return render(request, "pets/form.html", {"pet": pet, "client": client, "Breed": Breed})
 
 
 def pets_form_history(request, id):
-    vets = Vet.objects.all()
-    medicines = Medicine.objects.all()
-    pet = get_object_or_404(Pet, id=id)
+    vets = Vet.objects.for_choices()
+    medicines = Medicine.objects.for_choices()
+    pet = get_object_or_404(Pet.objects.for_history(), id=id)
 
     if request.method == 'POST':
-        pet_id = request.POST.get("id", "")
-        errors = {}
-        saved = True
-        
-        if pet_id == "":
-            saved, errors = Pet.save_pet(request.POST)
-            medicine_id = request.POST.get("medicines", "")
-            vet_id = request.POST.get("vet", "")
-            
-            if medicine_id and vet_id:
-                pet.medicines.add(medicine_id)
-                pet.vets.add(vet_id)
-                pet.save()
-        else:
-            pet = get_object_or_404(Pet, pk=pet_id)
-            pet.update_pet(request.POST)
-            
-            medicine_id = request.POST.get("medicines", "")
-            vet_id = request.POST.get("vet", "")
-            
-            if medicine_id and vet_id:
-                pet.medicines.add(medicine_id)
-                pet.vets.add(vet_id)
-                pet.save()
-        
+        saved, errors = MedicalRecord.save_record(pet, request.POST)
+
         if saved:
             return redirect(reverse("pets_history", args=(id,)))
 
-        # Si no se guarda correctamente, debe retornar algo
-        return render(request, 'pets/history.html', {
+        return render(request, 'pets/form_history.html', {
             'pet': pet,
             'vets': vets,
             'medicines': medicines,
-            'errors': errors,  # Muestra errores si hay
+            'record': request.POST,
+            'errors': errors,
         })
-    
+
     # Manejo para solicitudes GET
     return render(request, 'pets/form_history.html', {
         'pet': pet,
@@ -277,67 +339,83 @@ def pets_form_history(request, id):
 
 def pets_delete(request):
     pet_id = request.POST.get("pet_id")
-    pet = get_object_or_404(Pet, pk=int(pet_id))
-    pet.delete()
+    if not delete_rows("pets", [int(pet_id)]):
+        raise Http404
 
     return redirect(reverse("pets_repo"))
 
+@require_POST
+def pets_reassign(request):
+    errors = validate_reassign(request.POST)
+    if errors:
+        return HttpResponseBadRequest(" ".join(errors.values()))
+
+    reassign_pets(selected_ids(request.POST), request.POST["client"])
+    return back_to_listing(request, "pets")
+
 ##Products
+@read_replica
+@conditional_page(listing_state("products"))
 def products_repository(request):
-    products = Product.objects.all()
-    return render(request, "products/repository.html", {"products": products})
+    products = filter_listing("products", request.GET, Product.objects.for_repository())
+    page = cached_page("products", request, lambda: paginate(request, products))
+    return render(request, "products/repository.html", {"products": page, "page": page})
 
 def products_form(request, id=None):
-    providers = Provider.objects.all()
     if request.method == "POST":
         product_id = request.POST.get("id", "")
         errors = {}
         saved = True
 
         if product_id == "":
+            # El proveedor seleccionado se guarda en el mismo INSERT
             saved, errors = Product.save_product(request.POST)
-            # Obtener el ID del proveedor seleccionado del formulario
-            provider_id = request.POST.get("provider", "")
-            # Asociar el proveedor seleccionado con el producto creado
-            if provider_id:
-                product = Product.objects.latest('id')  # Obtener el último producto creado
-                product.provider_id = provider_id
-                product.save()
         else:
             product = get_object_or_404(Product, pk=product_id)
+            # El proveedor seleccionado se valida y se guarda con el resto de los datos
             saved, errors = product.update_product(request.POST)
-            if saved:
-                # Obtener el ID del proveedor seleccionado del formulario
-                provider_id = request.POST.get("provider", "")
-            # Asociar el proveedor seleccionado con el producto actualizado
-                if provider_id:
-                    product.provider_id = provider_id
-                    product.save()
         
         if saved:
             return redirect(reverse("products_repo"))
         
         return render(
-            request, "products/form.html", {"errors": errors, "product": request.POST, "providers": providers},
+            request, "products/form.html", {
+                "errors": errors,
+                "product": request.POST,
+                "provider": get_selected("providers", request.POST.get("provider")),
+            },
         )
 
     product = None
     if id is not None:
         product = get_object_or_404(Product, pk=id)
 
-    return render(request, "products/form.html", {"product": product, "providers": providers})
+    provider = get_selected("providers", product.provider_id) if product else None
+    return render(request, "products/form.html", {"product": product, "provider": provider})
 
 def products_delete(request):
     product_id = request.POST.get("product_id")
-    product = get_object_or_404(Product, pk=int(product_id))
-    product.delete()
+    if not delete_rows("products", [int(product_id)]):
+        raise Http404
 
     return redirect(reverse("products_repo"))
     
+@require_POST
+def products_prices(request):
+    errors = validate_price_change(request.POST)
+    if errors:
+        return HttpResponseBadRequest(" ".join(errors.values()))
+
+    change_prices(request.POST["provider"], request.POST["percent"])
+    return back_to_listing(request, "products")
+
 ##Provider
+@read_replica
+@conditional_page(listing_state("providers"))
 def providers_repository(request):
-    providers = Provider.objects.all()
-    return render(request, "providers/repository.html", {"providers": providers})
+    providers = filter_listing("providers", request.GET, Provider.objects.for_repository())
+    page = cached_page("providers", request, lambda: paginate(request, providers))
+    return render(request, "providers/repository.html", {"providers": page, "page": page})
 
 
 def providers_form(request, id=None):
@@ -367,17 +445,24 @@ def providers_form(request, id=None):
 
 
 def providers_delete(request):
-    provider_id = request.POST.get("provider_id")
-    provider = get_object_or_404(Provider, pk=int(provider_id))
-    provider.delete()
+    provider_id = int(request.POST.get("provider_id"))
+    # Con muchos productos el borrado se hace por bloques en segundo plano
+    if needs_background("providers", provider_id):
+        provider = get_object_or_404(Provider, pk=provider_id)
+        return redirect(reverse("deletion_status", args=(start_job("providers", provider),)))
+    if not delete_rows("providers", [provider_id]):
+        raise Http404
 
     return redirect(reverse("providers_repo"))
 
 
 ##Vets
+@read_replica
+@conditional_page(listing_state("vets"))
 def vets_repository(request):
-    vets = Vet.objects.all()
-    return render(request, "vets/repository.html", {"vets": vets})
+    vets = filter_listing("vets", request.GET, Vet.objects.for_repository())
+    page = cached_page("vets", request, lambda: paginate(request, vets))
+    return render(request, "vets/repository.html", {"vets": page, "page": page})
 
 def vets_form(request, id=None):
     if request.method == "POST":
@@ -406,7 +491,50 @@ def vets_form(request, id=None):
 
 def vets_delete(request):
     vet_id = request.POST.get("vet_id")
-    vet = get_object_or_404(Vet, pk=int(vet_id))
-    vet.delete()
+    if not delete_rows("vets", [int(vet_id)]):
+        raise Http404
+
+    return redirect(reverse("vets_repo"))
+
+
+##Deletions
+def deletion_status(request, job_id):
+    job = get_job(job_id)
+    if job is None:
+        raise Http404
+    if request.GET.get("format") == "json":
+        return JsonResponse(job)
+    return render(request, "deletions/status.html", {"job": job, "back_url": reverse(f"{job['entity']}_repo")})
+
+
+##Imports
+IMPORT_CHOICES = [
+    ("clients", "Clientes"),
+    ("medicines", "Medicamentos"),
+    ("pets", "Mascotas"),
+    ("products", "Productos"),
+    ("providers", "Proveedores"),
+    ("vets", "Veterinarios"),
+]
+
+def imports_form(request):
+    context = {"entities": IMPORT_CHOICES}
+    if request.method == "POST":
+        entity = request.POST.get("entity", "")
+        upload = request.FILES.get("file")
+        errors = {}
+
+        if entity not in dict(IMPORT_CHOICES):
+            errors["entity"] = "Por favor seleccione qué desea importar"
+        if upload is None:
+            errors["file"] = "Por favor seleccione un archivo CSV o JSONL"
+        if errors:
+            return render(request, "imports/form.html", {**context, "errors": errors})
+
+        # El archivo se lee de a bloques, sin cargarlo entero en memoria
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", errors=DECODE_ERRORS, newline="")
+        report = import_file(entity, stream, guess_format(upload.name))
+        context.update({"entity": entity, "report": report, "report_errors": report.errors[:100]})
+
+    return render(request, "imports/form.html", context)
 
-    return redirect(reverse("vets_repo"))
\ No newline at end of file
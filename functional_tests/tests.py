@@ -159,7 +159,7 @@ class ClientsRepoTestCase(PlaywrightTestCase):
 
         # verificamos que el envio del formulario fue exitoso
         with self.page.expect_response(is_delete_response) as response_info:
-            self.page.get_by_role("button", name="Eliminar").click()
+            self.page.get_by_role("button", name="Eliminar", exact=True).click()
 
         response = response_info.value
         self.assertTrue(response.status < 400)
@@ -628,7 +628,7 @@ class ProvidersRepoTestCase(PlaywrightTestCase):
 
         # Verificar que el envío del formulario fue exitoso
         with self.page.expect_response(is_delete_response) as response_info:
-            self.page.get_by_role("button", name="Eliminar").click()
+            self.page.get_by_role("button", name="Eliminar", exact=True).click()
 
         response = response_info.value
         self.assertTrue(response.status < 400)
@@ -0,0 +1,67 @@
+# Configuración de gunicorn
+# https://docs.gunicorn.org/en/stable/settings.html
+#
+# `gunicorn -c gunicorn.conf.py` sirve la app por WSGI con workers sync. Con
+# GUNICORN_WORKER_CLASS=uvicorn la sirve por ASGI (vetsoft/asgi.py) con
+# workers de uvicorn, que atienden varias conexiones lentas por proceso.
+
+import multiprocessing
+import os
+import shutil
+
+WORKER_CLASSES = {
+    "sync": ("sync", "vetsoft.wsgi:application"),
+    "gthread": ("gthread", "vetsoft.wsgi:application"),
+    "uvicorn": ("uvicorn.workers.UvicornWorker", "vetsoft.asgi:application"),
+}
+
+_mode = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+worker_class, wsgi_app = WORKER_CLASSES[_mode]
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# (2 x núcleos) + 1: mientras un worker espera a la base otro usa la CPU
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4 if _mode == "gthread" else 1))
+
+# Carga Django una vez en el master y los workers lo heredan al hacer fork:
+# arrancan más rápido y comparten la memoria del código
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Reciclar cada worker después de una cantidad de requests (con un desvío al
+# azar para que no se reinicien todos juntos) acota el crecimiento de memoria
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Vacío desactiva el log de accesos (por ejemplo en las pruebas de carga)
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+
+
+def on_starting(server):
+    """on_starting: Vacía la carpeta de métricas de Prometheus de corridas anteriores"""
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+
+
+def post_fork(server, worker):
+    """post_fork: Descarta las conexiones a la base heredadas del master (preload_app)"""
+    from django.db import connections
+
+    # Cerrarlas afectaría al master; basta con que el worker abra las suyas
+    for connection in connections.all(initialized_only=True):
+        connection.connection = None
+
+
+def child_exit(server, worker):
+    """child_exit: Descarta los gauges del worker que terminó"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -10,11 +10,16 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import sys
+import tempfile
 from pathlib import Path, os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# `manage.py test`: algunas optimizaciones se desactivan (ver más abajo)
+TESTING = sys.argv[1:2] == ["test"]
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
@@ -26,7 +31,6 @@ if DEBUG:
     ALLOWED_HOSTS = ['*']
 else:
     SECRET_KEY = os.environ.get('SECRET_KEY')
-    STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
     ALLOWED_HOSTS = ",".split(os.environ.get('ALLOWED_HOSTS'))
     ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '').split(",")
     
@@ -35,6 +39,8 @@ CSRF_TRUSTED_ORIGINS = ['https://vetsoft-g10.onrender.com']
 # Application definition
 
 INSTALLED_APPS = [
+    # runserver sirve los estáticos igual que en producción (WhiteNoise)
+    "whitenoise.runserver_nostatic",
     "app.apps.AppConfig",
     "django.contrib.admin",
     "django.contrib.auth",
@@ -46,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -54,11 +61,32 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Medición por request (consultas, base de datos, templates y vista) publicada
+# en el header Server-Timing. Las requests más lentas que VETSOFT_SLOW_REQUEST_MS
+# se registran junto con sus VETSOFT_SLOW_QUERIES_LOGGED consultas más lentas.
+
+VETSOFT_TIMING_ENABLED = os.environ.get("VETSOFT_TIMING", "false").lower() == "true"
+
+VETSOFT_SLOW_REQUEST_MS = float(os.environ.get("VETSOFT_SLOW_REQUEST_MS", 500))
+
+VETSOFT_SLOW_QUERIES_LOGGED = int(os.environ.get("VETSOFT_SLOW_QUERIES_LOGGED", 5))
+
+if VETSOFT_TIMING_ENABLED:
+    MIDDLEWARE.append("app.middleware.ServerTimingMiddleware")
+
+# Métricas de Prometheus en /metrics. Con varios workers de gunicorn hay que
+# definir PROMETHEUS_MULTIPROC_DIR (ver gunicorn.conf.py) para sumar todos.
+
+VETSOFT_METRICS_ENABLED = os.environ.get("VETSOFT_METRICS", "false").lower() == "true"
+
+if VETSOFT_METRICS_ENABLED:
+    MIDDLEWARE.insert(0, "app.metrics.MetricsMiddleware")
+
 ROOT_URLCONF = "vetsoft.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "app.instrumentation.TimedDjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -79,11 +107,166 @@ WSGI_APPLICATION = "vetsoft.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
+# PRAGMAs que se aplican a cada conexión SQLite (app.database). WAL permite
+# leer mientras otro proceso escribe; busy_timeout hace que un escritor espere
+# el lock en lugar de fallar con "database is locked".
+
+VETSOFT_SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("VETSOFT_SQLITE_JOURNAL_MODE", "wal"),
+    "synchronous": os.environ.get("VETSOFT_SQLITE_SYNCHRONOUS", "normal"),
+    "busy_timeout": int(os.environ.get("VETSOFT_SQLITE_BUSY_TIMEOUT_MS", 5000)),
+    "cache_size": int(os.environ.get("VETSOFT_SQLITE_CACHE_SIZE", -20000)),
+    "mmap_size": int(os.environ.get("VETSOFT_SQLITE_MMAP_SIZE", 268435456)),
+    "temp_store": os.environ.get("VETSOFT_SQLITE_TEMP_STORE", "memory"),
+}
+
+# La base se elige con DB_ENGINE ("sqlite3", "postgresql" o el módulo completo
+# del backend). Con PostgreSQL las conexiones se reutilizan entre requests
+# (CONN_MAX_AGE) y se verifican antes de usarlas (CONN_HEALTH_CHECKS); para
+# compartirlas entre workers y procesos se puede poner PgBouncer delante
+# (ver docker-compose.yml) con DB_DISABLE_SERVER_SIDE_CURSORS=true.
+
+DB_ENGINE = os.environ.get("DB_ENGINE", "django.db.backends.sqlite3")
+if "." not in DB_ENGINE:
+    DB_ENGINE = f"django.db.backends.{DB_ENGINE}"
+
+if DB_ENGINE == "django.db.backends.sqlite3":
+    DATABASES = {
+        "default": {
+
+            'ENGINE': DB_ENGINE,
+            'NAME': os.environ.get("DB_NAME", "db.sqlite3"),
+            # Conexiones persistentes: evita abrir la base y aplicar los PRAGMAs en cada request
+            'CONN_MAX_AGE': int(os.environ.get("VETSOFT_CONN_MAX_AGE", 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'PRAGMAS': VETSOFT_SQLITE_PRAGMAS,
+            # Los tests usan un archivo y no la base en memoria: esa es de caché
+            # compartida, donde una conexión que encuentra el lock tomado falla
+            # en lugar de esperar busy_timeout, y hay tests con varios threads
+            'TEST': {'NAME': os.path.join(tempfile.gettempdir(), "vetsoft_test.sqlite3")},
+        },
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": DB_ENGINE,
+            "NAME": os.environ.get("DB_NAME", "vetsoft"),
+            "USER": os.environ.get("DB_USER", ""),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", ""),
+            "PORT": os.environ.get("DB_PORT", ""),
+            "CONN_MAX_AGE": int(os.environ.get("VETSOFT_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+            # PgBouncer en modo transacción no admite cursores del lado del servidor
+            "DISABLE_SERVER_SIDE_CURSORS": (
+                os.environ.get("DB_DISABLE_SERVER_SIDE_CURSORS", "false").lower() == "true"
+            ),
+            "OPTIONS": {
+                "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", 5)),
+            },
+        },
+    }
+
+
+# Réplicas de lectura: DB_REPLICAS es una lista separada por comas de hosts
+# (o de archivos, con SQLite) con la misma configuración que "default". Los
+# listados y el historial leen de ellas (app.routers.read_replica); después de
+# escribir, el navegador lee de la primaria durante VETSOFT_REPLICA_PIN_SECONDS.
+
+VETSOFT_REPLICA_PIN_SECONDS = int(os.environ.get("VETSOFT_REPLICA_PIN_SECONDS", 5))
+
+VETSOFT_READ_REPLICAS = []
+for number, replica in enumerate(filter(None, os.environ.get("DB_REPLICAS", "").split(",")), 1):
+    alias = f"replica{number}"
+    location = "NAME" if DB_ENGINE == "django.db.backends.sqlite3" else "HOST"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        location: replica.strip(),
+        # En los tests las réplicas usan la misma base que "default"
+        "TEST": {"MIRROR": "default"},
+    }
+    VETSOFT_READ_REPLICAS.append(alias)
+
+if VETSOFT_READ_REPLICAS:
+    DATABASE_ROUTERS = ["app.routers.ReplicaRouter"]
+    MIDDLEWARE.append("app.middleware.ReplicaPinMiddleware")
+
+
+# Vistas async (app/async_views.py) para los listados y el historial. Solo
+# sirven de algo con ASGI (GUNICORN_WORKER_CLASS=uvicorn): bajo WSGI Django las
+# corre en un event loop por request y son más lentas que las sync.
+
+VETSOFT_ASYNC_VIEWS = os.environ.get("VETSOFT_ASYNC_VIEWS", "false").lower() == "true"
+
+
+# Caché
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+#
+# CACHE_BACKEND elige dónde se guarda: "locmem" (memoria de cada proceso),
+# "file" (carpeta compartida por los workers de una máquina) o "redis" (un
+# servidor compatible con Redis compartido por todas las máquinas).
+
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "vetsoft"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/0"),
+}
+
+CACHE_BACKEND_NAME = os.environ.get("CACHE_BACKEND", "locmem")
+
+CACHE_BACKEND, CACHE_DEFAULT_LOCATION = CACHE_BACKENDS[CACHE_BACKEND_NAME]
+
+# Con locmem cada worker de gunicorn tiene su propia caché y el incremento de
+# versión de un guardado solo llega al worker que lo atendió
+SHARED_CACHE = CACHE_BACKEND_NAME != "locmem"
+
+CACHES = {
     "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get("CACHE_LOCATION") or CACHE_DEFAULT_LOCATION,
+        "KEY_PREFIX": "vetsoft",
+    },
+}
+
+# Páginas de los listados cacheadas hasta que cambia alguna de las entidades
+# que muestran (app.caching). Solo por defecto con una caché compartida (file o
+# redis): con locmem los demás workers seguirían mostrando la página vieja, y
+# el chequeo vetsoft.E001 rechaza activarla así. Los tests las desactivan
+# porque la caché no se deshace con la transacción de cada test; los de la
+# caché la activan.
+
+VETSOFT_CACHE_ALIAS = "default"
+VETSOFT_CACHE_PAGES = (
+    os.environ.get("VETSOFT_CACHE_PAGES", str(SHARED_CACHE)).lower() == "true" and not TESTING
+)
+VETSOFT_CACHE_TIMEOUT = int(os.environ.get("VETSOFT_CACHE_TIMEOUT", 300))
+
+# Listados caros en los que una sola request rearma cada página: vencida, se
+# sigue sirviendo hasta VETSOFT_CACHE_STALE_SECONDS más mientras se rearma en
+# segundo plano; si no existe, las demás requests esperan hasta
+# VETSOFT_CACHE_WAIT_SECONDS a que esté lista en lugar de ir todas a la base.
+
+VETSOFT_CACHE_REVALIDATE = [
+    entity.strip()
+    for entity in os.environ.get("VETSOFT_CACHE_REVALIDATE", "pets,products").split(",")
+    if entity.strip()
+]
+VETSOFT_CACHE_STALE_SECONDS = int(os.environ.get("VETSOFT_CACHE_STALE_SECONDS", 600))
+VETSOFT_CACHE_LOCK_SECONDS = int(os.environ.get("VETSOFT_CACHE_LOCK_SECONDS", 30))
+VETSOFT_CACHE_WAIT_SECONDS = float(os.environ.get("VETSOFT_CACHE_WAIT_SECONDS", 3))
+
 
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': 'db.sqlite3',
+# Logging
+# https://docs.djangoproject.com/en/5.0/topics/logging/
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "vetsoft": {"handlers": ["console"], "level": "INFO", "propagate": False},
     },
 }
 
@@ -121,9 +304,68 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
+# Bootstrap y bootstrap-icons están en app/static/vendor (sin CDN). collectstatic
+# los copia a STATIC_ROOT con el hash del contenido en el nombre y genera las
+# versiones .gz y .br; WhiteNoise los sirve desde la app con caché de un año
+# (immutable), y el navegador pide el nuevo nombre cuando el archivo cambia.
+# Los tests no corren collectstatic y usan los archivos sin hash.
+
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage" if TESTING
+            else "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Paginación por cursor de los listados
+# Cantidad de filas por página y máximo aceptado en el parámetro ?page_size=
+
+VETSOFT_PAGE_SIZE = int(os.environ.get("VETSOFT_PAGE_SIZE", 50))
+
+VETSOFT_MAX_PAGE_SIZE = int(os.environ.get("VETSOFT_MAX_PAGE_SIZE", 500))
+
+# Cantidad máxima de opciones que devuelven los selectores con búsqueda
+# (clientes y proveedores); también es la cantidad por defecto
+
+VETSOFT_AUTOCOMPLETE_LIMIT = int(os.environ.get("VETSOFT_AUTOCOMPLETE_LIMIT", 10))
+
+# Búsqueda global (app.search): cantidad de resultados y de coincidencias
+# que se ordenan por relevancia antes de elegirlos
+
+VETSOFT_SEARCH_LIMIT = int(os.environ.get("VETSOFT_SEARCH_LIMIT", 20))
+
+VETSOFT_SEARCH_CANDIDATES = int(os.environ.get("VETSOFT_SEARCH_CANDIDATES", 1000))
+
+# Borrado por bloques (app.deletion, delete_vetsoft y purge_vetsoft): filas
+# por transacción y pausa entre bloques para que otras escrituras tomen el lock
+# de SQLite. Con más dependientes que un bloque el borrado desde la app corre en
+# segundo plano y muestra el progreso.
+
+VETSOFT_DELETE_BATCH_SIZE = int(os.environ.get("VETSOFT_DELETE_BATCH_SIZE", 500))
+
+VETSOFT_DELETE_PAUSE_SECONDS = float(os.environ.get("VETSOFT_DELETE_PAUSE_SECONDS", 0.01))
+
+# Días que purge_vetsoft conserva las filas con borrado lógico
+
+VETSOFT_PURGE_AFTER_DAYS = int(os.environ.get("VETSOFT_PURGE_AFTER_DAYS", 30))
+
+# Asesor de índices (app.explain, explain_vetsoft): filas desde las que una
+# tabla recorrida sin índice se marca, y archivo donde QueryRecordingRunner
+# guarda las consultas de los tests
+
+VETSOFT_EXPLAIN_MIN_ROWS = int(os.environ.get("VETSOFT_EXPLAIN_MIN_ROWS", 1000))
+
+VETSOFT_QUERY_LOG = os.environ.get("VETSOFT_QUERY_LOG", "benchmarks/queries.jsonl")